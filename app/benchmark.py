@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+# The benchmark doesn't need a display, so the offscreen platform is used unless another one is requested
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication
+
+from main.classifier_view import ClassifierView
+from main.main_window_aux_items.classifier import ClassifierLayout, compute_classifier_layout
+from main.lct_handler import LCTHandler
+from main.main_window import (
+    manage_file, SD_VALUES, SG_VALUES, DEFAULT_TEXT_SD_SG, DEFAULT_DESCRIPTOR_VALUE, ALLOWED_DESCRIPTOR_VALUES
+)
+from synthetic_text import generate_words, generate_clause_starts, generate_text, generate_analysis
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_CLAUSE_DENSITY = 0.1
+DEFAULT_SUPER_CLAUSE_SIZE = 5
+DEFAULT_PARAGRAPH_SIZE = 80
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 0
+VIEW_WIDTH = 500
+VIEW_HEIGHT = 500
+VIEW_PADDING = 10
+
+# The text shown before the synthetic text is set, as the application shows an example text
+SEED_TEXT = "This is the text shown before the synthetic text is set.\nIt has two paragraphs."
+
+def measure(operation: Callable[[int], Any], repeat: int) -> list[float]:
+    """
+    Execute an operation several times and measure its duration.
+    :param operation: The operation. It receives the number of the current repetition.
+    :param repeat: The number of repetitions.
+    :return: The duration of each repetition in seconds.
+    """
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation(i)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def create_view(conf: dict, batched_rects: bool) -> ClassifierView:
+    """
+    Create a ClassifierView with the seed text and the default configuration.
+    :param conf: The default configuration of the application.
+    :param batched_rects: If True, all the rounded rects are painted by a single QGraphicsItem.
+    :return: The view.
+    """
+    view = ClassifierView(None)
+    view.setup(
+        VIEW_PADDING,
+        VIEW_PADDING,
+        VIEW_WIDTH,
+        VIEW_HEIGHT,
+        SEED_TEXT,
+        conf["textSize"],
+        DEFAULT_TEXT_SD_SG,
+        DEFAULT_DESCRIPTOR_VALUE,
+        ALLOWED_DESCRIPTOR_VALUES,
+        list(conf["rectsColors"]["together"].values()),
+        conf["separatorColors"]["regularSeparator"],
+        conf["separatorColors"]["superSeparator"],
+        batched_rects
+    )
+    return view
+
+
+def run_size(word_count: int, args: argparse.Namespace, xsd: str, conf: dict) -> list[dict]:
+    """
+    Run all the operations with a synthetic text of the given size.
+    :param word_count: The number of words of the text.
+    :param args: The command line arguments.
+    :param xsd: The XSD schema of the .lct files.
+    :param conf: The default configuration of the application.
+    :return: A result per operation.
+    """
+    rng = random.Random(args.seed + word_count)
+    words = generate_words(word_count, rng)
+    clause_starts = generate_clause_starts(word_count, args.clause_density, rng)
+    text, clauses = generate_text(words, clause_starts, args.paragraph_size)
+    analysis = generate_analysis(clauses, args.super_clause_size, rng)
+
+    lct_handler = LCTHandler("Semantics", [SD_VALUES, SG_VALUES], DEFAULT_DESCRIPTOR_VALUE, xsd)
+    lct_string = ""
+
+    def to_lct(_: int) -> None:
+        nonlocal lct_string
+        lct_handler.upload_from_data(analysis)
+        lct_string = lct_handler.to_string()
+
+    results = {"lct_to_string": measure(to_lct, args.repeat)}
+
+    if args.lct_dir is not None:
+        os.makedirs(args.lct_dir, exist_ok=True)
+        file = os.path.join(args.lct_dir, "synthetic_" + str(word_count) + ".lct")
+        with open(file, "w", encoding="utf-8") as f:
+            f.write(lct_string)
+
+    results["lct_upload"] = measure(lambda _: lct_handler.upload_from_xml_string(lct_string, True), args.repeat)
+
+    view = create_view(conf, False)
+    classifier = view.classifier
+    text_width = VIEW_WIDTH - 2 * VIEW_PADDING
+    colors = list(conf["rectsColors"]["together"].values())
+
+    def set_text_analyzed(target: ClassifierView) -> None:
+        target.classifier.set_text_analyzed(
+            lct_handler.get_clause_texts(),
+            lct_handler.get_super_clause_texts(),
+            DEFAULT_TEXT_SD_SG,
+            colors,
+            lct_handler.get_raw_labels(),
+            lct_handler.get_clause_tags()
+        )
+
+    results["set_text"] = measure(lambda _: classifier.set_text(text), args.repeat)
+    results["set_text_analyzed"] = measure(lambda _: set_text_analyzed(view), args.repeat)
+
+    # Repaint of the visible area, with an item per rounded rect and with all of them painted by a single item
+    results["render"] = measure(lambda _: view.viewport().grab(), args.repeat)
+    batched_view = create_view(conf, True)
+    results["set_text_analyzed_batched"] = measure(lambda _: set_text_analyzed(batched_view), args.repeat)
+    results["render_batched"] = measure(lambda _: batched_view.viewport().grab(), args.repeat)
+    batched_view.deleteLater()
+
+    results["get_text_analyzed"] = measure(lambda _: classifier.get_text_analyzed(), args.repeat)
+
+    # Alternate the values, so every repetition changes the layout
+    results["set_width"] = measure(lambda i: classifier.set_width(text_width * (1.5 if i % 2 == 0 else 1)), args.repeat)
+    results["set_text_size"] = measure(
+        lambda i: classifier.set_text_size(conf["textSize"] + (2 if i % 2 == 0 else 0)), args.repeat
+    )
+
+    # The relayout path of the view: the geometry is computed in a worker thread and only applied in the GUI thread
+    def compute_layout(i: int) -> ClassifierLayout:
+        return compute_classifier_layout(classifier.get_layout_snapshot(text_width * (1.5 if i % 2 == 0 else 1), None))
+
+    layouts = [compute_layout(i) for i in range(args.repeat)]
+    results["compute_layout"] = measure(compute_layout, args.repeat)
+    results["apply_layout"] = measure(lambda i: classifier.apply_layout(layouts[i]), args.repeat)
+
+    view.deleteLater()
+
+    return [
+        {
+            "words": word_count,
+            "clauses": len(clauses),
+            "clause_density": args.clause_density,
+            "operation": operation,
+            "times": times,
+            "min": min(times),
+            "median": statistics.median(times),
+            "max": max(times)
+        }
+        for operation, times in results.items()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the main operations of the classifier with synthetic texts and analyses."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Number of words of each text.")
+    parser.add_argument("--clause-density", type=float, default=DEFAULT_CLAUSE_DENSITY,
+                        help="Expected number of clauses per word, between 0 and 1.")
+    parser.add_argument("--super-clause-size", type=int, default=DEFAULT_SUPER_CLAUSE_SIZE,
+                        help="Number of clauses of each super clause.")
+    parser.add_argument("--paragraph-size", type=int, default=DEFAULT_PARAGRAPH_SIZE,
+                        help="Number of words of each paragraph.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Repetitions of each operation.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic data.")
+    parser.add_argument("--lct-dir", default=None, help="Directory where the generated .lct files are saved.")
+    parser.add_argument("--output", default=None, help="JSON file for the results. Standard output if omitted.")
+    args = parser.parse_args()
+
+    if not 0 <= args.clause_density <= 1:
+        parser.error("--clause-density should be between 0 and 1")
+
+    app = QApplication(sys.argv)
+
+    xsd = manage_file(":/main/xml_schema/xsd_v1_0", "r")
+    conf = json.loads(manage_file(":/main/conf/defconf", "r"))
+
+    results = []
+    for word_count in args.sizes:
+        results += run_size(word_count, args, xsd, conf)
+        app.processEvents()
+
+    report = json.dumps(
+        {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": os.environ["QT_QPA_PLATFORM"],
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results
+        },
+        indent=2
+    )
+
+    if args.output is None:
+        print(report)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == '__main__':
+    main()
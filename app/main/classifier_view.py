@@ -4,6 +4,10 @@ from PyQt5.QtGui import QPainter, QCursor
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsLineItem, QWidget, QMenu, QAction, QApplication
 
 from .main_window_aux_items.classifier import Classifier
+from .main_window_aux_items.relayout_worker import RelayoutWorker
+
+# Height of the area kept in the scene above and below the viewport in virtualized mode, in viewport heights
+VIRTUALIZATION_MARGIN = 1.0
 
 
 class ClassifierView(QGraphicsView):
@@ -28,13 +32,19 @@ class ClassifierView(QGraphicsView):
         self._scene = None
         self._items_parent = None
         self._context_menu_pos = None
+        self._context_menu_coords = None
+        self._context_menu_hit = None
         self._global_pos_y_offset = None
         self._semaphore = QSemaphore()
+        self._relayout_worker = None
+        self._target_width = None
+        self._target_text_size = None
+        self._virtualized = False
 
     def setup(self, x_padding: float | int, y_padding: float | int, min_width: float | int, min_height: float | int,
               text: str, text_size: float | int, default_descriptor: str, default_descriptor_value: str,
               allowed_descriptor_values: list[str], colors: list[str], regular_sep_color: str,
-              super_sep_color: str) -> None:
+              super_sep_color: str, batched_rects: bool = False) -> None:
         """
         Set up the object.
         :param x_padding: Pixels of horizontal padding for the text.
@@ -53,6 +63,7 @@ class ClassifierView(QGraphicsView):
                        values of its Descriptors. Should be valid HTML colors.
         :param regular_sep_color: A valid HTML color that will have the regular separators.
         :param super_sep_color: A valid HTML color that will have the super separators.
+        :param batched_rects: If True, all the rounded rects are painted by a single QGraphicsItem.
         """
         self._scene = QGraphicsScene(0, 0, min_width, min_height)
 
@@ -77,7 +88,8 @@ class ClassifierView(QGraphicsView):
             colors,
             regular_sep_color,
             super_sep_color,
-            self._items_parent
+            self._items_parent,
+            batched_rects
         )
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -104,16 +116,17 @@ class ClassifierView(QGraphicsView):
         """
 
         self._context_menu_pos = pos
-
-        there_is_a_separator = self.classifier.there_is_a_separator(
+        self._context_menu_coords = (
             pos.x() - self._items_parent.pos().x(),
             pos.y() - self._items_parent.pos().y() + self._global_pos_y_offset + self.verticalScrollBar().value()
-            )
+        )
 
-        is_super_separator = self.classifier.is_super_separator(
-            pos.x() - self._items_parent.pos().x(),
-            pos.y() - self._items_parent.pos().y() + self._global_pos_y_offset + self.verticalScrollBar().value()
-            )
+        # The nearest point is searched once and the result is reused by the chosen action
+        self._context_menu_hit = self.classifier.hit_test(*self._context_menu_coords)
+        there_is_a_separator = self.classifier.there_is_a_separator(
+            *self._context_menu_coords, self._context_menu_hit
+        )
+        is_super_separator = self.classifier.is_super_separator(*self._context_menu_coords, self._context_menu_hit)
 
         self._join_action.setEnabled(there_is_a_separator)
 
@@ -128,6 +141,41 @@ class ClassifierView(QGraphicsView):
         context.addAction(self._demote_separator_action)
         context.exec(self.mapToGlobal(pos))
 
+    def set_virtualized(self, virtualized: bool) -> None:
+        """
+        Enable or disable the virtualized mode. In this mode, only the separators, rects and descriptors of the lines
+        that are in the visible area of the view (plus a margin) are kept in the scene, so long texts don't fill the
+        scene with items. The area is updated when the view is scrolled or resized. Should be called after setup().
+        Disabled by default: the items created by a split are only culled in the next full update, and the Descriptors
+        that are detached while a separator is moved across them can keep an outdated text.
+        :param virtualized: True to enable the virtualized mode, False to disable it.
+        """
+        if virtualized == self._virtualized:
+            return
+
+        self._virtualized = virtualized
+        if virtualized:
+            self.verticalScrollBar().valueChanged.connect(self._update_visible_area)
+            self._update_visible_area()
+        else:
+            self.verticalScrollBar().valueChanged.disconnect(self._update_visible_area)
+            self.classifier.set_visible_area(None, None)
+
+    def _update_visible_area(self) -> None:
+        """
+        Set the area of the classifier that should be in the scene according to the current visible area of the view.
+        Only relevant in virtualized mode.
+        """
+        if not self._virtualized:
+            return
+
+        visible_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        margin = visible_rect.height() * VIRTUALIZATION_MARGIN
+        self.classifier.set_visible_area(
+            visible_rect.top() - self._items_parent.pos().y() - margin,
+            visible_rect.bottom() - self._items_parent.pos().y() + margin
+        )
+
     def get_text(self) -> str:
         """
         Obtain the plain text that is being analyzed.
@@ -137,9 +185,12 @@ class ClassifierView(QGraphicsView):
 
     def get_text_size(self) -> int | float:
         """
-        Return the text size.
+        Return the text size. If there is a text size change that has not been applied yet, the new text size is
+        returned.
         :return: The text size as a number.
         """
+        if self._target_text_size is not None:
+            return self._target_text_size
         return self.classifier.get_text_size()
 
     def _split(self) -> None:
@@ -147,43 +198,40 @@ class ClassifierView(QGraphicsView):
         Splits the nearest rectangle to the self._context_menu_pos in two, placing a separator where
         the split has been made.
         """
-        self.classifier.split(
-            self._context_menu_pos.x() - self._items_parent.pos().x(),
-            self._context_menu_pos.y() - self._items_parent.pos().y() +
-            self._global_pos_y_offset + self.verticalScrollBar().value()
-        )
+        self.classifier.split(*self._context_menu_coords, self._context_menu_hit)
 
     def _join(self) -> None:
         """
         Remove a separator and join the two remaining rectangles.
         """
-        self.classifier.join(
-            self._context_menu_pos.x() - self._items_parent.pos().x(),
-            self._context_menu_pos.y() - self._items_parent.pos().y() +
-            self._global_pos_y_offset + self.verticalScrollBar().value()
-        )
+        self.classifier.join(*self._context_menu_coords, self._context_menu_hit)
 
     def _promote_separator(self) -> None:
         """
         Promote the Separator in the self._context_menu_pos position to a super Separator. If there is no Separator in
         this position, this function will do nothing.
         """
-        self.classifier.promote_separator(
-            self._context_menu_pos.x() - self._items_parent.pos().x(),
-            self._context_menu_pos.y() - self._items_parent.pos().y() +
-            self._global_pos_y_offset + self.verticalScrollBar().value()
-        )
+        self.classifier.promote_separator(*self._context_menu_coords, self._context_menu_hit)
 
     def _demote_separator(self) -> None:
         """
         Demote a super Separator in the self._context_menu_pos position to a regular Separator. If there is no Separator
         in this position, this function will do nothing.
         """
-        self.classifier.demote_separator(
-            self._context_menu_pos.x() - self._items_parent.pos().x(),
-            self._context_menu_pos.y() - self._items_parent.pos().y() +
-            self._global_pos_y_offset + self.verticalScrollBar().value()
-        )
+        self.classifier.demote_separator(*self._context_menu_coords, self._context_menu_hit)
+
+    def split_at_boundaries(self, pattern: str) -> int:
+        """
+        Split the text after every word that matches the given pattern. All the separators are added at once.
+        :param pattern: A regular expression that is searched in each word.
+        :return: The number of added separators.
+        """
+        app = QApplication.instance()
+
+        app.setOverrideCursor(QCursor(Qt.WaitCursor))
+        added = self.classifier.split_at_boundaries(pattern)
+        app.restoreOverrideCursor()
+        return added
 
     def set_text(self, text: str) -> None:
         """
@@ -216,26 +264,12 @@ class ClassifierView(QGraphicsView):
     def set_text_size(self, text_size: float | int) -> None:
         """
         Set the text size. Also, the height of the separators and the rects and the text size of the descriptors is
-        changed to maintain the proportion.
+        changed to maintain the proportion. The new positions are calculated in a RelayoutWorker, so the change is
+        applied asynchronously.
         :param text_size: The text size as a number.
         """
-
-        app = QApplication.instance()
-
-        app.setOverrideCursor(QCursor(Qt.WaitCursor))
-
-        self._global_pos_y_offset = -text_size
-
-        self.classifier.set_text_size(text_size)
-
-        self._scene.setSceneRect(
-            0,
-            0,
-            self.size().width(),
-            self._items_parent.pos().y() + self.classifier.get_text_item_height()
-        )
-
-        app.restoreOverrideCursor()
+        self._target_text_size = text_size
+        self._start_relayout()
 
     def set_text_analyzed(self, sep_text_list: list[str], super_sep_text_list: list[str], default_descriptor: [str],
                           colors: list[str], labels: list[str], values: list[list[str]]):
@@ -333,6 +367,7 @@ class ClassifierView(QGraphicsView):
         :param event: The QResizeEvent object.
         """
         super().resizeEvent(event)
+        self._update_visible_area()
         if event.size().width() != event.oldSize().width():
             self._real_width = event.size().width() - 2 * self._items_parent.pos().x()
             if self._timerId:
@@ -340,7 +375,10 @@ class ClassifierView(QGraphicsView):
                 self._timerId = 0
 
             if self._time == 0:
+                # A relayout in progress would be applied over this width, so it is cancelled first
+                self._cancel_relayout()
                 self.classifier.set_width(self._real_width)
+                self._target_width = None
                 if self._semaphore.available() == 0:
                     self._semaphore.release()
             else:
@@ -348,19 +386,101 @@ class ClassifierView(QGraphicsView):
 
     def timerEvent(self, a0: 'QTimerEvent') -> None:
         """
-        This function is triggered 0.5 seconds after the resizing of the window and set the reposition for the
-        QGraphicsScene and all the QGraphicsItem of the classifier object.
+        This function is triggered 0.5 seconds after the resizing of the window and starts the calculation of the
+        reposition for the QGraphicsScene and all the QGraphicsItem of the classifier object.
         :param a0: The QTimerEvent object. Non-relevant.
         """
         self.killTimer(self._timerId)
         self._timerId = 0
 
-        app = QApplication.instance()
+        self._target_width = self._real_width
+        self._start_relayout()
 
-        app.setOverrideCursor(QCursor(Qt.WaitCursor))
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        """
+        Stop the pending resize and the RelayoutWorker in progress, if any, before the view is closed, so its thread is
+        never destroyed while it is running.
+        :param event: The QCloseEvent object.
+        """
+        if self._timerId:
+            self.killTimer(self._timerId)
+            self._timerId = 0
 
-        # Set text width
-        self.classifier.set_width(self._real_width)
+        if self._stop_relayout_worker():
+            self._target_width = None
+            self._target_text_size = None
+            QApplication.instance().restoreOverrideCursor()
+        super().closeEvent(event)
+
+    def _start_relayout(self) -> None:
+        """
+        Start the calculation of the position of all the classifier items with the pending width and text size in a
+        RelayoutWorker. If there is a previous calculation that has not finished, it is cancelled, so only the last
+        one is applied.
+        """
+        if not self._stop_relayout_worker():
+            QApplication.instance().setOverrideCursor(QCursor(Qt.BusyCursor))
+
+        self._relayout_worker = RelayoutWorker(
+            self.classifier.get_layout_snapshot(self._target_width, self._target_text_size)
+        )
+        self._relayout_worker.finished.connect(self._relayout_finished)
+        # The worker is also stopped if the view is destroyed without being closed
+        self.destroyed.connect(self._relayout_worker.stop)
+        self._relayout_worker.start()
+
+    def _stop_relayout_worker(self) -> bool:
+        """
+        Stop the RelayoutWorker in progress, if any, before releasing it.
+        :return: True if there was a RelayoutWorker, False otherwise.
+        """
+        if self._relayout_worker is None:
+            return False
+
+        self._relayout_worker.stop()
+        self._relayout_worker = None
+        return True
+
+    def _cancel_relayout(self) -> None:
+        """
+        Cancel the calculation of the RelayoutWorker in progress, if any, so its layout is never applied. Its pending
+        text size is applied synchronously, so it isn't lost.
+        """
+        if not self._stop_relayout_worker():
+            return
+
+        self._target_width = None
+
+        if self._target_text_size is not None:
+            self._global_pos_y_offset = -self._target_text_size
+            self.classifier.set_text_size(self._target_text_size)
+            self._target_text_size = None
+
+        QApplication.instance().restoreOverrideCursor()
+
+    def _relayout_finished(self) -> None:
+        """
+        Called in the GUI thread when a RelayoutWorker has finished. Apply the new positions to the classifier items
+        and resize the QGraphicsScene. If the layout is outdated because the text has changed, the calculation is
+        started again. The workers that have been stopped are ignored.
+        """
+        worker = self._relayout_worker
+        if worker is None or self.sender() is not worker:
+            return
+
+        # The finished signal is emitted just before the thread ends
+        worker.wait()
+        layout = worker.get_layout()
+        if layout is not None and not self.classifier.apply_layout(layout):
+            self._start_relayout()
+            return
+
+        if layout is not None and layout.snapshot.text_size is not None:
+            self._global_pos_y_offset = -layout.snapshot.text_size
+
+        self._relayout_worker = None
+        self._target_width = None
+        self._target_text_size = None
 
         self._scene.setSceneRect(
             0,
@@ -369,4 +489,4 @@ class ClassifierView(QGraphicsView):
             self._items_parent.pos().y() + self.classifier.get_text_item_height()
         )
 
-        app.restoreOverrideCursor()
+        QApplication.instance().restoreOverrideCursor()
@@ -1,4 +1,5 @@
-from typing import Any
+import re
+from typing import Any, Callable
 
 import numpy as np
 from PyQt5.QtCore import QPointF, QObject, pyqtSignal
@@ -6,12 +7,19 @@ from PyQt5.QtCore import QPointF, QObject, pyqtSignal
 from PyQt5.QtWidgets import QGraphicsItem
 
 from .descriptor.descriptor_handler import DescriptorHandler
-from .main_text import MainText
-from .separator.separator_handler import SeparatorHandler
+from .main_text import MainText, TextLayout, TextLayoutSnapshot, compute_text_layout
+from .point_model import PointModel
+from .segment_model import SegmentModel
+from .separator.separator_handler import SeparatorHandler, SeparatorHit
 from .rounded_rect.rounded_rect_handler import RoundedRectHandler
 
 from collections import Counter
 
+# Patterns for split_at_boundaries(). Each one matches the words after which a new clause should start
+SENTENCE_BOUNDARY = r"[.!?][\"')\]]*$"
+PUNCTUATION_BOUNDARY = r"[.!?,;:][\"')\]]*$"
+LINE_BREAK_BOUNDARY = r"\n"
+
 
 def most_common(lst: list[str]) -> str:
     """
@@ -57,106 +65,92 @@ def create_colors_dict(default_text: str, color_list: list[str], default_descrip
     return colors
 
 
-def obtain_limit_points(points: list[tuple[float, list[list[float | str | bool]]]]
-                        ) -> list[tuple[float, tuple[float, float]]]:
+def get_repos_sep_points_with_super_sep(sep_text_list: list[str], super_sep_text_list: list[str],
+                                        complete_points: PointModel) -> list[tuple[QPointF, bool]]:
     """
-    Obtain the limit x-values with its y-values from each lines from the structure that returns the MainText object.
-    :param points: The points obtained from MainText object.
-    :return: The limit points.
+    Find the position of the separators that make those text lists. Also, indicates if a Separator is a super Separator
+    based on super_sep_text_list.
+    :param sep_text_list: The list with the groups of words made by the separators.
+    :param super_sep_text_list: The list with the groups of words made by the super separators.
+    :param complete_points: The model of all available points with its associated word.
+    :return: The list of new positions for the Separators with a boolean per element that indicates if the Separator is
+    a super Separator.
     """
-    return [(i[0], (i[1][0][0], i[1][-1][0])) for i in points]
+    word_indexes = complete_points.get_word_indexes_of_texts(sep_text_list)
+    super_word_indexes = set(complete_points.get_word_indexes_of_texts(super_sep_text_list))
+    return [
+        (QPointF(x, y), word_index in super_word_indexes)
+        for (x, y), word_index in zip(complete_points.get_word_points(word_indexes), word_indexes)
+    ]
 
 
-def obtain_separator_points(complete_points: list[tuple[float, list[list[float | str | bool]]]]
-                            ) -> list[tuple[float, list[tuple[float, bool]]]]:
+class ClassifierLayoutSnapshot:
     """
-    Extract from the complex structure that returns MainText object, the list of points with this structure:
-    [(y_0, [(x_0, Ignored), (x_1, Ignored), ...]), (y_1, [(x_0, Ignored), (x_1, Ignored), ...]), ...]
-    :return: The list with the points
+    This class stores a copy of the data of a Classifier needed to calculate, with compute_classifier_layout(), the new
+    position of its elements after a change of width or text size, so it can be done outside the GUI thread.
     """
-    return [(i[0], [(e[0], e[2]) for e in i[1]]) for i in complete_points]
+
+    def __init__(self, text_snapshot: TextLayoutSnapshot, text_size: float | int | None,
+                 anchor_word_indexes: list[int]) -> None:
+        """
+        Create ClassifierLayoutSnapshot object.
+        :param text_snapshot: The snapshot of the MainText element.
+        :param text_size: The new point text size or None if the text size doesn't change.
+        :param anchor_word_indexes: The index of the word each separator is anchored to, limit separators included.
+        """
+        self.text_snapshot = text_snapshot
+        self.text_size = text_size
+        self.anchor_word_indexes = anchor_word_indexes
 
 
-def get_repos_sep_points(text_list: list[str],
-                         complete_point_list: list[tuple[float, list[list[float | str | bool]]]]) -> list[QPointF]:
+class ClassifierLayout:
     """
-    Reposition the separators to fit the new text format. The positions that the separators will occupy will be
-    such that the groups of words that form these separators will be the same.
-    :param text_list: A list with the groups of words made by the separators.
-    :param complete_point_list: The list of all available points with its associated word.
-    :return: The list of new positions for the Separators.
+    This class stores the result of compute_classifier_layout(): the layout of the text and the target positions of the
+    separators, rectangles and descriptors.
     """
-    text_list_index = 0
-    separator_points = [QPointF(complete_point_list[0][1][0][0], complete_point_list[0][0])]
-    aux_text = ""
-
-    for y_index in range(len(complete_point_list)):
-        for x_index in range(len(complete_point_list[y_index][1])):
-            if complete_point_list[y_index][1][x_index][1] != '':
-                if complete_point_list[y_index][1][x_index][2]:
-                    aux_text += complete_point_list[y_index][1][x_index][1]
-                else:
-                    aux_text += (" " + complete_point_list[y_index][1][x_index][1])
-
-                # Do the comparison without the first space character
-                if aux_text[1:] not in text_list[text_list_index]:
-                    text_list_index += 1
-                    aux_text = " " + complete_point_list[y_index][1][x_index][1]
-                    separator_points.append(
-                        QPointF(complete_point_list[y_index][1][x_index][0], complete_point_list[y_index][0])
-                    )
-    # Add last element
-    separator_points.append(
-        QPointF(complete_point_list[-1][1][-1][0], complete_point_list[-1][0])
-    )
-    return separator_points
 
+    def __init__(self, snapshot: ClassifierLayoutSnapshot, text_layout: TextLayout,
+                 separator_points: list[tuple[float, float]],
+                 limit_points: list[tuple[float, tuple[float, float]]], segments: SegmentModel) -> None:
+        """
+        Create ClassifierLayout object.
+        :param snapshot: The snapshot used to calculate the layout.
+        :param text_layout: The layout of the MainText element.
+        :param separator_points: The position of each separator of the snapshot, limit separators included.
+        :param limit_points: The limit points of each line, as returned by PointModel.get_limit_points().
+        :param segments: The segments of the rectangles and descriptors for the separators of the snapshot.
+        """
+        self.snapshot = snapshot
+        self.text_layout = text_layout
+        self.separator_points = separator_points
+        self.limit_points = limit_points
+        self.segments = segments
 
-def get_repos_sep_points_with_super_sep(sep_text_list: list[str], super_sep_text_list: list[str],
-                                        complete_point_list: list[tuple[float, list[list[float | str | bool]]]]
-                                        ) -> list[tuple[QPointF, bool]]:
+
+def compute_classifier_layout(snapshot: ClassifierLayoutSnapshot,
+                              is_cancelled: Callable[[], bool] | None = None) -> ClassifierLayout | None:
     """
-    Find the position of the separators that make those text lists. Also, indicates if a Separator is a super Separator
-    based on super_sep_text_list.
-    :param sep_text_list: The list with the groups of words made by the separators.
-    :param super_sep_text_list: The list with the groups of words made by the super separators.
-    :param complete_point_list: The list of all available points with its associated word.
-    :return: The list of new positions for the Separators with a boolean per element that indicates if the Separator is
-    a super Separator.
+    Calculate the layout of the text and the target positions of the separators, rectangles and descriptors of a
+    snapshot. Only pure geometry is calculated, so it can be called from any thread. The result is applied with
+    Classifier.apply_layout().
+    :param snapshot: The snapshot obtained with Classifier.get_layout_snapshot().
+    :param is_cancelled: Optional function that is checked during the calculation. If it returns True, the calculation
+                         stops.
+    :return: The layout or None if the calculation has been cancelled.
     """
-    sep_text_list_index = 0
-    super_sep_text_list_index = 0
-    separator_points = []
-    sep_aux_text = ""
-    super_sep_aux_text = ""
-
-    for y_index in range(len(complete_point_list)):
-        for x_index in range(len(complete_point_list[y_index][1])):
-            if complete_point_list[y_index][1][x_index][1] != '':
-                if complete_point_list[y_index][1][x_index][2]:
-                    sep_aux_text += complete_point_list[y_index][1][x_index][1]
-                else:
-                    sep_aux_text += (" " + complete_point_list[y_index][1][x_index][1])
-
-                # Do the comparison without the first space character
-                if sep_aux_text[1:] not in sep_text_list[sep_text_list_index]:
-                    sep_text_list_index += 1
-                    super_sep_aux_text += sep_aux_text[:-len(complete_point_list[y_index][1][x_index][1]) - 1]
-                    sep_aux_text = " " + complete_point_list[y_index][1][x_index][1]
-
-                    if (super_sep_aux_text[1:] + sep_aux_text) not in super_sep_text_list[super_sep_text_list_index]:
-                        super_sep_aux_text = ""
-                        super_sep_text_list_index += 1
-                        separator_points.append(
-                            (QPointF(complete_point_list[y_index][1][x_index][0], complete_point_list[y_index][0]),
-                             True)
-                        )
-                    else:
-                        separator_points.append(
-                            (QPointF(complete_point_list[y_index][1][x_index][0], complete_point_list[y_index][0]),
-                             False)
-                        )
-    return separator_points
+    text_layout = compute_text_layout(snapshot.text_snapshot, is_cancelled)
+    if text_layout is None or (is_cancelled is not None and is_cancelled()):
+        return None
+
+    separator_points = text_layout.points.get_word_points(snapshot.anchor_word_indexes)
+    limit_points = text_layout.points.get_limit_points()
+    return ClassifierLayout(
+        snapshot,
+        text_layout,
+        separator_points,
+        limit_points,
+        SegmentModel(limit_points, [QPointF(x, y) for x, y in separator_points[1:-1]])
+    )
 
 
 class ClassifierEmitter(QObject):
@@ -172,7 +166,8 @@ class Classifier:
 
     def __init__(self, text: str, text_width: float, text_size: float, default_descriptor_string: str,
                  default_descriptor_value: str, allowed_descriptor_values: list[str], rect_colors: list[str],
-                 regular_sep_color: str, super_sep_color: str, parent: QGraphicsItem) -> None:
+                 regular_sep_color: str, super_sep_color: str, parent: QGraphicsItem,
+                 batched_rects: bool = False) -> None:
         """
         Create Classifier object. Only one object form this class should be created
         :param text: The text to be analyzed.
@@ -186,6 +181,7 @@ class Classifier:
         :param regular_sep_color: A valid HTML color that will have the regular separators.
         :param super_sep_color: A valid HTML color that will have the super separators.
         :param parent: The QGraphicsItem parent of this element. Can't be None
+        :param batched_rects: If True, all the rounded rects are painted by a single QGraphicsItem.
         """
         self._default_descriptor_value = default_descriptor_value
         self._allowed_descriptor_values = allowed_descriptor_values
@@ -193,16 +189,11 @@ class Classifier:
         self._text = MainText(text, text_size, text_width, 300, parent)
 
         complete_points = self._text.get_complete_points()
-        sep_points = obtain_separator_points(complete_points)
+        self._complete_points = complete_points
 
         # Set separators
-        self._sep_handler = SeparatorHandler(text_size * 2, sep_points, regular_sep_color, super_sep_color, parent)
-        self._sep_handler.add_limit_separators(
-            sep_points[0][1][0][0],
-            sep_points[0][0],
-            sep_points[-1][1][-1][0],
-            sep_points[-1][0],
-        )
+        self._sep_handler = SeparatorHandler(text_size * 2, complete_points, regular_sep_color, super_sep_color, parent)
+        self._sep_handler.add_limit_separators(*complete_points.first_point(), *complete_points.last_point())
 
         # Set separator width according to text size
         self._sep_handler.set_separator_width(max(1.0, text_size / 2.5))
@@ -210,11 +201,12 @@ class Classifier:
         self._rects_handler = RoundedRectHandler(
             text_size * 2,
             text_size / 2,
-            obtain_limit_points(complete_points),
+            complete_points.get_limit_points(),
             create_colors_dict(
                 default_descriptor_string, rect_colors, self._default_descriptor_value, self._allowed_descriptor_values
             ),
-            parent
+            parent,
+            batched_rects
         )
         self._rects_handler.add_separator_listeners(
             self._sep_handler.emitter.created,
@@ -229,7 +221,7 @@ class Classifier:
             default_descriptor_value,
             allowed_descriptor_values,
             text_size * 2 / 3,
-            obtain_limit_points(complete_points),
+            complete_points.get_limit_points(),
             parent
         )
         self._descriptors_handler.add_separator_listeners(
@@ -296,82 +288,139 @@ class Classifier:
         """
         return self._text.font().pointSize()
 
-    def split(self, x: float, y: float) -> bool:
+    def hit_test(self, x: float, y: float) -> SeparatorHit:
+        """
+        Find the nearest point to the given coordinates and the separator that occupies it. The result can be passed to
+        the functions that receive coordinates, so a context menu only searches the point once.
+        :param x: The x coordinate
+        :param y: The y coordinate
+        :return: The result of the search.
+        """
+        return self._sep_handler.hit_test(x, y)
+
+    def split(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Splits the nearest rectangle to the given coordinates in two, placing a separator where the split has been made.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be a mistake if the coordinates are out of bounds or if
         there is no more space to place a separator
         """
-        if self._sep_handler.add_separator(x, y, False):
+        if self._sep_handler.add_separator(x, y, False, hit):
             self._rects_handler.update_last_created_rects_group()
             self._descriptors_handler.update_last_created_descriptor_group()
             self.emitter.classifier_has_changed.emit()
             return True
         return False
 
-    def join(self, x: float, y: float) -> bool:
+    def split_at_boundaries(self, pattern: str) -> int:
+        """
+        Split the text after every word that matches the given pattern, placing a regular separator before the next
+        word. All the separators are added at once, so the rects and the descriptors are placed only once and the
+        change is notified only once. The words that already have a separator and the words that are part of a word
+        with BREAK_LINE_CHARACTERS are skipped.
+        :param pattern: A regular expression that is searched in each word, like SENTENCE_BOUNDARY,
+                        PUNCTUATION_BOUNDARY or LINE_BREAK_BOUNDARY.
+        :return: The number of added separators.
+        """
+        regex = re.compile(pattern)
+        complete_points = self._complete_points
+        word_count = complete_points.word_count()
+        words = complete_points.words[complete_points.word_points[:-1]].tolist()
+        ignored = complete_points.ignored[complete_points.word_points].tolist()
+        anchored = set(self._sep_handler.get_anchor_word_indexes())
+
+        word_indexes = [
+            i + 1 for i, word in enumerate(words)
+            if i + 1 < word_count and not ignored[i + 1] and i + 1 not in anchored and regex.search(word)
+        ]
+        if len(word_indexes) == 0:
+            return 0
+
+        separators = self._sep_handler.add_separators_at_words(word_indexes)
+        # The segments are computed once for both handlers
+        segments = SegmentModel(complete_points.get_limit_points(), self._sep_handler.get_separator_points())
+        self._rects_handler.add_separators(segments, separators)
+        self._descriptors_handler.add_separators(segments, separators)
+        self._update_visible_items()
+
+        self.emitter.classifier_has_changed.emit()
+        return len(word_indexes)
+
+    def join(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Remove a separator and join the two remaining rectangles.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be a mistake if the coordinates are out of bounds or if in
         the given coordinates there is no separator
         """
-        if self._sep_handler.delete_separator(x, y):
+        if self._sep_handler.delete_separator(x, y, hit):
             self.emitter.classifier_has_changed.emit()
             return True
         return False
 
-    def promote_separator(self, x: float, y: float) -> bool:
+    def promote_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Promote the Separator in the given position to a super Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be a mistake if the coordinates are out of bounds, if the
         separator is already a super Separator or if in the given coordinates there is no separator.
         """
-        if self._sep_handler.promote_separator(x, y):
+        if self._sep_handler.promote_separator(x, y, hit):
             self.emitter.classifier_has_changed.emit()
             return True
         return False
 
-    def demote_separator(self, x: float, y: float) -> bool:
+    def demote_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Demote the super Separator in the given position to a Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be a mistake if the coordinates are out of bounds, if the
         separator is already a normal Separator or if in the given coordinates there is no separator.
         """
-        if self._sep_handler.demote_separator(x, y):
+        if self._sep_handler.demote_separator(x, y, hit):
             self.emitter.classifier_has_changed.emit()
             return True
         return False
 
-    def is_super_separator(self, x: float, y: float) -> bool:
+    def is_super_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Checks if the Separator in the given position is a super Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if is a super Separator, False otherwise. There can be a mistake if the coordinates
                  are out of bounds or if in the given coordinates there is no separator
         """
-        return self._sep_handler.is_super_separator(x, y)
+        return self._sep_handler.is_super_separator(x, y, hit)
 
-    def there_is_a_separator(self, x: float, y: float) -> bool:
+    def there_is_a_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Check if the given point is occupied by existing separator. Should be called when no Separator is moved. Should
         be called when exist at least one Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if the point is occupied by a separator, False if not.
         """
-        is_occupied, index = self._sep_handler.point_is_occupied(x, y)
-        if is_occupied and (index != 0 and index != len(self._sep_handler.separators) - 1):
-            return True
-        return False
+        if hit is None:
+            hit = self._sep_handler.hit_test(x, y)
+        return hit.is_occupied and hit.index != -1 and not hit.is_limit
+
+    def get_drag_statistics(self) -> dict[str, int]:
+        """
+        Obtain the statistics of the position changes of the separators while they are dragged. Used to tune the drag
+        pipeline.
+        :return: A dictionary with the number of "received", "emitted" and "coalesced" position changes.
+        """
+        return self._sep_handler.get_drag_statistics()
 
     def get_text_item_height(self) -> float:
         """
@@ -385,33 +434,7 @@ class Classifier:
         Gets the subgroups of words that form the separators within the text.
         :return: A list with a group of words per element.
         """
-        text = ""
-        result = []
-        sep_points = self._sep_handler.get_separator_points()
-
-        # This ind will be used to access all the positions in separator_points
-        sep_ind = 0
-
-        complete_point_list = self._text.get_complete_points()
-
-        for y_index in range(len(complete_point_list)):
-            for x_index in range(len(complete_point_list[y_index][1])):
-                if sep_ind < len(sep_points) and \
-                        sep_points[sep_ind].x() == complete_point_list[y_index][1][x_index][0] and \
-                        sep_points[sep_ind].y() == complete_point_list[y_index][0]:
-                    result.append(text[1:])
-                    sep_ind += 1
-                    text = ""
-
-                if complete_point_list[y_index][1][x_index][1] != '':
-                    if complete_point_list[y_index][1][x_index][2] and text != "":
-                        text += complete_point_list[y_index][1][x_index][1]
-                    else:
-                        text += (" " + complete_point_list[y_index][1][x_index][1])
-
-        result.append(text[1:])
-
-        return result
+        return self._complete_points.get_texts(self._sep_handler.get_separator_word_indexes())
 
     def get_text_analyzed(self) -> list[tuple[list[tuple[str, str]], str]]:
         """
@@ -421,60 +444,30 @@ class Classifier:
         clauses between two super Separators analyzed and the second element of the tuple is the descriptor value of
         this super clause.
         """
-        text = ""
         result = []
         group = []
-        sep_points = self._sep_handler.get_separator_points()
-        super_sep_points = self._sep_handler.get_super_separator_points()
+        sep_word_indexes = self._sep_handler.get_separator_word_indexes()
+        super_sep_word_indexes = set(self._sep_handler.get_super_separator_word_indexes())
         descriptors_list = self._descriptors_handler.get_descriptor_values()
 
-        # This ind will be used to access all the positions in separator_points
-        sep_ind = 0
-        super_sep_ind = 0
-
-        complete_point_list = self._text.get_complete_points()
-
-        for y_index in range(len(complete_point_list)):
-            for x_index in range(len(complete_point_list[y_index][1])):
-                if sep_ind < len(sep_points) and \
-                        sep_points[sep_ind].x() == complete_point_list[y_index][1][x_index][0] and \
-                        sep_points[sep_ind].y() == complete_point_list[y_index][0]:
-                    group.append((text[1:], descriptors_list[sep_ind]))
-                    sep_ind += 1
-                    text = ""
-                if super_sep_ind < len(super_sep_points) and \
-                        super_sep_points[super_sep_ind].x() == complete_point_list[y_index][1][x_index][0] and \
-                        super_sep_points[super_sep_ind].y() == complete_point_list[y_index][0]:
-                    super_sep_ind += 1
-                    result.append(
-                        (
-                            group,
-                            ";".join(
-                                [most_common(i) for i in (
-                                    np.transpose([i[1].split(";") for i in group])
-                                )]
-                            )
+        texts = self._complete_points.get_texts(sep_word_indexes)
+
+        for sep_ind in range(len(texts)):
+            group.append((texts[sep_ind], descriptors_list[sep_ind]))
+
+            # The group ends with the last text or with a super Separator
+            if sep_ind == len(sep_word_indexes) or sep_word_indexes[sep_ind] in super_sep_word_indexes:
+                result.append(
+                    (
+                        group,
+                        ";".join(
+                            [most_common(i) for i in (
+                                np.transpose([i[1].split(";") for i in group])
+                            )]
                         )
                     )
-                    group = []
-
-                if complete_point_list[y_index][1][x_index][1] != '':
-                    if complete_point_list[y_index][1][x_index][2] and text != "":
-                        text += complete_point_list[y_index][1][x_index][1]
-                    else:
-                        text += (" " + complete_point_list[y_index][1][x_index][1])
-
-        group.append((text[1:], descriptors_list[sep_ind]))
-        result.append(
-            (
-                group,
-                ";".join(
-                    [most_common(i) for i in (
-                        np.transpose([i[1].split(";") for i in group])
-                    )]
                 )
-            )
-        )
+                group = []
 
         return result
 
@@ -487,21 +480,16 @@ class Classifier:
 
         self._text.set_text(text)
         complete_points = self._text.get_complete_points()
-        sep_points = obtain_separator_points(complete_points)
+        self._complete_points = complete_points
 
         self._sep_handler.delete_all_separators()
-        self._sep_handler.set_fixed_points(sep_points)
-        self._sep_handler.add_limit_separators(
-            sep_points[0][1][0][0],
-            sep_points[0][0],
-            sep_points[-1][1][-1][0],
-            sep_points[-1][0],
-        )
-
-        limit_points = obtain_limit_points(complete_points)
+        self._sep_handler.set_fixed_points(complete_points)
+        self._sep_handler.add_limit_separators(*complete_points.first_point(), *complete_points.last_point())
 
-        self._rects_handler.set_points(limit_points, [], True)
-        self._descriptors_handler.set_points(limit_points, [], True)
+        segments = SegmentModel(complete_points.get_limit_points(), [])
+        self._rects_handler.set_points(segments, True)
+        self._descriptors_handler.set_points(segments, True)
+        self._update_visible_items()
 
     def set_text_size(self, text_size: float | int) -> None:
         """
@@ -511,31 +499,68 @@ class Classifier:
         """
         self.emitter.classifier_has_changed.emit()
 
-        # Save text_list from the original text_size to reposition all the separators
-        text_list_previous_size = self.get_text_classified()
-
         # Set text size
         self._text.set_text_size(text_size)
+        self._set_items_size(text_size)
+
+        # Reposition separators to the new text size
+        self._reposition_items(self._text.get_complete_points())
 
-        # Change rects, separators and descriptors_handler height
+    def _set_items_size(self, text_size: float | int) -> None:
+        """
+        Change the height of the separators and the rects and the text size of the descriptors to maintain the
+        proportion with the given text size.
+        :param text_size: The text size as a number.
+        """
         self._sep_handler.set_separator_width(max(1.0, text_size / 2.5))
         self._sep_handler.set_separator_height(text_size * 2)
 
         self._rects_handler.set_height_and_radius(text_size * 2, text_size / 2)
         self._descriptors_handler.set_y_offset_and_text_size(text_size * 2.4, text_size * 2 / 3)
 
-        # Reposition separators to the new text size
-        complete_point_list = self._text.get_complete_points()
+    def _reposition_items(self, complete_points: PointModel, segments: SegmentModel | None = None) -> None:
+        """
+        Set the new available points and place the separators, rects and descriptors on them. The separators keep the
+        words they are anchored to.
+        :param complete_points: The new available points.
+        :param segments: The segments of the rects and descriptors or None to calculate them from the words the
+                         separators are anchored to.
+        """
+        self._complete_points = complete_points
+        self._sep_handler.set_fixed_points(complete_points)
+
+        if segments is None:
+            segments = SegmentModel(
+                complete_points.get_limit_points(), self._sep_handler.get_anchored_separator_points()[1:-1]
+            )
+
+        # The segments are computed once for both handlers
+        self._rects_handler.set_points(segments, False)
+        self._descriptors_handler.set_points(segments, False)
 
-        separator_points = get_repos_sep_points(text_list_previous_size, complete_point_list)
+        self._sep_handler.reposition_separators()
+        self._update_visible_items()
 
-        sep_points_without_limits = separator_points[1:-1]
-        limit_points = obtain_limit_points(complete_point_list)
-        self._rects_handler.set_points(limit_points, sep_points_without_limits, False)
-        self._descriptors_handler.set_points(limit_points, sep_points_without_limits, False)
+    def set_visible_area(self, top: float | None, bottom: float | None) -> None:
+        """
+        Set the vertical area where the separators, rects and descriptors should be in the scene. The elements outside
+        this area are detached from the scene, so a long text doesn't produce a huge number of scene items.
+        :param top: The top y-value of the area or None to keep all the elements in the scene.
+        :param bottom: The bottom y-value of the area or None to keep all the elements in the scene.
+        """
+        area = None if top is None or bottom is None else (top, bottom)
+        self._sep_handler.set_visible_area(area)
+        self._rects_handler.set_visible_area(area)
+        self._descriptors_handler.set_visible_area(area)
 
-        self._sep_handler.set_fixed_points(obtain_separator_points(complete_point_list))
-        self._sep_handler.set_separator_points(separator_points)
+    def _update_visible_items(self) -> None:
+        """
+        Attach to the scene the separators, rects and descriptors inside the visible area and detach the rest. Should
+        be called after the elements have been created or repositioned in bulk.
+        """
+        self._sep_handler.update_visible_items()
+        self._rects_handler.update_visible_items()
+        self._descriptors_handler.update_visible_items()
 
     def set_text_analyzed(self, sep_text_list: list[str], super_sep_text_list: list[str], default_descriptor: [str],
                           colors: list[str], labels: list[str], values: list[list[str]]) -> None:
@@ -554,26 +579,26 @@ class Classifier:
         self.emitter.classifier_has_changed.emit()
 
         self._text.set_text(" ".join(sep_text_list))
-        complete_point_list = self._text.get_complete_points()
-        fixed_points = obtain_separator_points(complete_point_list)
+        complete_points = self._text.get_complete_points()
+        self._complete_points = complete_points
 
         self._sep_handler.delete_all_separators()
-        self._sep_handler.set_fixed_points(fixed_points)
-        self._sep_handler.add_limit_separators(
-            fixed_points[0][1][0][0],
-            fixed_points[0][0],
-            fixed_points[-1][1][-1][0],
-            fixed_points[-1][0],
-        )
+        self._sep_handler.set_fixed_points(complete_points)
+        self._sep_handler.add_limit_separators(*complete_points.first_point(), *complete_points.last_point())
 
-        limit_points = obtain_limit_points(complete_point_list)
+        limit_points = complete_points.get_limit_points()
 
-        self._rects_handler.set_points(limit_points, [], True)
-        self._descriptors_handler.set_points(limit_points, [], True)
+        segments = SegmentModel(limit_points, [])
+        self._rects_handler.set_points(segments, True)
+        self._descriptors_handler.set_points(segments, True)
 
-        separator_points = get_repos_sep_points_with_super_sep(sep_text_list, super_sep_text_list, complete_point_list)
+        separator_points = get_repos_sep_points_with_super_sep(sep_text_list, super_sep_text_list, complete_points)
 
-        self._sep_handler.add_separators_without_checking(separator_points)
+        # The rects and the descriptors are placed once for all the separators instead of once per separator
+        separators = self._sep_handler.add_separators_without_checking(separator_points)
+        segments = SegmentModel(limit_points, self._sep_handler.get_separator_points())
+        self._rects_handler.add_separators(segments, separators)
+        self._descriptors_handler.add_separators(segments, separators)
 
         self._rects_handler.reset_colors()
         self._rects_handler.set_colors(create_colors_dict(
@@ -581,30 +606,55 @@ class Classifier:
         ))
         self._descriptors_handler.set_default_text(default_descriptor, False)
         self._descriptors_handler.set_texts(labels, values)
+        self._update_visible_items()
 
     def set_width(self, width: float) -> None:
         """
         Set the width of the text. All the separators will be repositioned to get an expected result.
         :param width: The text width.
         """
-        # Save text_list from the original text_size to reposition all the separators
-        text_list_previous_size = self.get_text_classified()
-
         # Set text width
         self._text.set_width(width)
 
         # Reposition separators to the new text size
-        complete_point_list = self._text.get_complete_points()
+        self._reposition_items(self._text.get_complete_points())
+
+    def get_layout_snapshot(self, width: float | int | None, text_size: float | int | None) -> ClassifierLayoutSnapshot:
+        """
+        Copy the data needed to calculate the position of all the elements with a new width and/or text size. The
+        snapshot can be used by compute_classifier_layout() in another thread and its result applied with
+        apply_layout().
+        :param width: The new text width or None to keep the current one.
+        :param text_size: The new text size or None to keep the current one.
+        :return: The snapshot.
+        """
+        return ClassifierLayoutSnapshot(
+            self._text.get_layout_snapshot(width, text_size),
+            text_size,
+            self._sep_handler.get_anchor_word_indexes()
+        )
 
-        separator_points = get_repos_sep_points(text_list_previous_size, complete_point_list)
+    def apply_layout(self, layout: ClassifierLayout) -> bool:
+        """
+        Apply the result of compute_classifier_layout(). Only the final positions are set, so it is fast enough for the
+        GUI thread. If the separators have changed since the snapshot was taken, their positions are obtained again from
+        the new available points. The layout is rejected if the text has changed since the snapshot was taken.
+        :param layout: The layout.
+        :return: True if the layout has been applied, False if it has been rejected.
+        """
+        if not self._text.set_layout(layout.text_layout):
+            return False
+
+        if layout.snapshot.text_size is not None:
+            self.emitter.classifier_has_changed.emit()
+            self._set_items_size(layout.snapshot.text_size)
 
-        sep_points_without_limits = separator_points[1:-1]
-        limit_points = obtain_limit_points(complete_point_list)
-        self._rects_handler.set_points(limit_points, sep_points_without_limits, False)
-        self._descriptors_handler.set_points(limit_points, sep_points_without_limits, False)
+        segments = None
+        if layout.snapshot.anchor_word_indexes == self._sep_handler.get_anchor_word_indexes():
+            segments = layout.segments
 
-        self._sep_handler.set_fixed_points(obtain_separator_points(complete_point_list))
-        self._sep_handler.set_separator_points(separator_points)
+        self._reposition_items(layout.text_layout.points, segments)
+        return True
 
     def _separator_is_released(self, separator: Any) -> None:
         """
@@ -5,8 +5,11 @@ from PyQt5.QtCore import QPointF, pyqtSignal, QObject
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QGraphicsTextItem, QGraphicsItem
 
-from ..separator.separator import Separator
+from ..separator.group_boundaries import GroupBoundaries
+from ..separator.separator import SeparatorRecord
+from ..segment_model import SegmentModel
 from .descriptor import Descriptor
+from ..viewport_culler import ViewportCuller
 
 
 def _exponentialSearchDescriptors(exp_list: list[list[Descriptor | float | float | float]], wanted_pos: QPointF) -> int:
@@ -80,40 +83,6 @@ def _exponentialSearchDescriptorsLimitPoints(exp_list: list[list[Descriptor | fl
     return bin_index + int(exp_index / 2)
 
 
-def _exponentialSearchSeparators(exp_list: list[list[Separator | int | QPointF]], wanted_index: int) -> int:
-    """
-    Finds the index in the list of index exp_list that has the same value that wanted_index using an exponential search.
-    :param exp_list: The list to search for. Each element has more data but the only relevant element is the second.
-    :param wanted_index: The desire index to find in exp_list.
-    :return: The index in the list where the desired index is or the next higher value if the index is not in the list.
-    """
-    if exp_list[0][1] + 1 == wanted_index:
-        return 0
-    exp_index = 1
-    while exp_index < len(exp_list) and exp_list[exp_index][1] + 1 <= wanted_index:
-        exp_index = exp_index * 2
-
-    bin_list = exp_list[int(exp_index / 2):min(exp_index, len(exp_list))]
-
-    # Perform binary list
-    first = 0
-    last = len(bin_list) - 1
-    bin_index = -1
-    while (first <= last) and (bin_index == -1):
-        mid = (first + last) // 2
-        if bin_list[mid][1] + 1 == wanted_index:
-            bin_index = mid
-        else:
-            if wanted_index < bin_list[mid][1] + 1:
-                last = mid - 1
-            else:
-                first = mid + 1
-    if first > last:
-        return last + int(exp_index / 2)
-    else:
-        return bin_index + int(exp_index / 2)
-
-
 class DescriptorEmitter(QObject):
     editable_text_changed = pyqtSignal(int, list)
 
@@ -123,9 +92,18 @@ class DescriptorHandler:
     This class handles the position and the content of all the Descriptors and emits a signal when the text of a group
     of descriptors has been changed. All the Descriptors between two Separators are considered a group of Descriptors
     and this class ensures that they have the same text and change when a Descriptor of the group changes.
+
+    The value of each group is stored in this class as the code of its editable parts, so the values are read without
+    reading the Descriptors. When the value of a group changes, only the Descriptors in the scene are updated. The rest
+    of them are marked as outdated and are updated when they are attached to the scene again.
     """
     _descriptors: list[list[Descriptor | float | float | float]]
-    _separators: list[list[Separator | int | QPointF]]
+    _separators: GroupBoundaries
+    _values: list[int]
+    _value_lists: list[list[str]]
+    _value_texts: list[str]
+    _value_codes: dict[tuple[str, ...], int]
+    _outdated: set[Descriptor]
 
     def __init__(self, y_offset: int | float, default_text: str, text_separator: str, allowed_strings: list[str],
                  text_size: float | int, points: list[tuple[float | int, tuple[float | int, float | int]]],
@@ -157,6 +135,14 @@ class DescriptorHandler:
             self._font = font
 
         self._descriptors = []
+        self._culler = ViewportCuller(parent)
+        self._outdated = set()
+
+        # The codes of the values. Each code is the index of the editable parts and the plain text of a value
+        self._value_lists = []
+        self._value_texts = []
+        self._value_codes = {}
+        self._non_editable_text_list = default_text.split(text_separator)
 
         for i in range(len(points)):
             desc = Descriptor(default_text, self._text_separator, self._allowed_strings, parent, font)
@@ -165,7 +151,8 @@ class DescriptorHandler:
             self._set_descriptor_pos(i)
             desc.editable_text_changed.connect(self._text_changed)
 
-        self._separators = []
+        self._separators = GroupBoundaries()
+        self._values = [self._default_value()]
 
         self.set_text_size(text_size)
 
@@ -191,186 +178,192 @@ class DescriptorHandler:
         clicked_on_the_border_fn.connect(self._separator_clicked_on_the_border)
         removed_fn.connect(self._separator_removed)
 
-    def _set_points_for_new_text(self, points: list[tuple[float, tuple[float, float]]],
-                                 descriptor_text: tuple[list[str], list[str], int, bool, str]) -> None:
-        """
-        Set the position and the text for the descriptors when the text is new.
-        :param points: The points for the descriptors. Each element is a tuple of (Y-value, (X-left, X-Right)) where the
-                       x-value of the descriptor will be the one that will set the Descriptor in the middle of X-left
-                       and X-Right.
-        :param descriptor_text: The info to use in paste_text() Descriptor function
-        """
-        if len(points) > len(self._descriptors):  # We need to create more descriptors
-            desc_index = 0
-            for desc_index in range(len(self._descriptors)):
-                self._descriptors[desc_index][1] = points[desc_index][0]
-                self._descriptors[desc_index][2] = points[desc_index][1][0]
-                self._descriptors[desc_index][3] = points[desc_index][1][1]
-                self._descriptors[desc_index][0].paste_text(descriptor_text)
-                self._set_descriptor_pos(desc_index)
-            for e in range(desc_index + 1, len(points)):
-                desc = Descriptor(
-                    self._default_text, self._text_separator, self._allowed_strings, self._parent, self._font
-                )
-                # [Descriptor, Y_Value_Without_Offset, Left_X_Value, Right_X_Value]
-                self._descriptors.append([desc, points[e][0], points[e][1][0], points[e][1][-1]])
-                self._descriptors[e][0].paste_text(descriptor_text)
-                self._set_descriptor_pos(e)
-                desc.editable_text_changed.connect(self._text_changed)
+    def set_visible_area(self, area: tuple[float, float] | None) -> None:
+        """
+        Set the area of the view where the Descriptors should be in the scene. Only the Descriptors inside this area are
+        kept in the scene, the rest of them are detached from it until the area reaches them.
+        :param area: A tuple of (top, bottom) y-values or None to keep all the Descriptors in the scene.
+        """
+        self._culler.set_area(area)
+        self.update_visible_items(False)
+
+    def update_visible_items(self, full: bool = True) -> None:
+        """
+        Attach to the scene the Descriptors inside the visible area and detach the rest. Should be called after the
+        Descriptors have been created, moved or removed in bulk.
+        :param full: If False, only the Descriptors attached in the previous update are checked to be detached.
+        """
+        self._culler.update(
+            self._descriptors, lambda descriptor: descriptor[0], lambda descriptor: descriptor[1], full,
+            attached=self._descriptor_attached
+        )
+
+    def _descriptor_attached(self, index: int) -> None:
+        """
+        Update the text of a Descriptor that has been attached to the scene again if its group has changed while it was
+        detached.
+        :param index: The index of the Descriptor.
+        """
+        descriptor = self._descriptors[index][0]
+        if descriptor in self._outdated:
+            self._outdated.discard(descriptor)
+            descriptor.paste_text(self._group_text(self._separators.group_of(index) + 1))
+            self._set_descriptor_pos(index)
+
+    def _encode_value(self, editable_text_list: list[str]) -> int:
+        """
+        Return the code of a value, creating it if it doesn't exist.
+        :param editable_text_list: The editable parts of the value.
+        :return: The code.
+        """
+        key = tuple(editable_text_list)
+        code = self._value_codes.get(key)
+        if code is None:
+            code = len(self._value_lists)
+            self._value_codes[key] = code
+            self._value_lists.append(list(key))
+            self._value_texts.append(self._join_text(self._value_lists[code]))
+        return code
+
+    def _default_value(self) -> int:
+        """
+        Return the code of the value of the new groups of Descriptors, with all the editable parts with the default
+        value.
+        :return: The code.
+        """
+        return self._encode_value([self._text_separator] * (len(self._default_text.split(self._text_separator)) - 1))
 
-        else:  # We need to delete part of existing descriptors
-            desc_index = 0
-            for desc_index in range(len(points)):
-                self._descriptors[desc_index][1] = points[desc_index][0]
-                self._descriptors[desc_index][2] = points[desc_index][1][0]
-                self._descriptors[desc_index][3] = points[desc_index][1][1]
-                self._descriptors[desc_index][0].paste_text(descriptor_text)
-                self._set_descriptor_pos(desc_index)
-            for _ in range(desc_index + 1, len(self._descriptors)):
-                removed_descriptor = self._descriptors.pop()
-                self._parent.scene().removeItem(removed_descriptor[0])
-
-    def set_points(self, points: list[tuple[float, tuple[float, float]]], separator_points: list[QPointF],
-                   new_text: bool) -> None:
+    def _join_text(self, editable_text_list: list[str]) -> str:
+        """
+        Interleave the non-editable parts of the text with the editable parts of a value.
+        :param editable_text_list: The editable parts of the value.
+        :return: The plain text of the Descriptors with this value.
+        """
+        text = ""
+        for i in range(len(editable_text_list)):
+            text += self._non_editable_text_list[i] + editable_text_list[i]
+        return text + self._non_editable_text_list[-1]
+
+    def _set_non_editable_text_list(self, non_editable_text_list: list[str]) -> None:
+        """
+        Set the non-editable parts of the text of all the Descriptors and update the plain text of the values.
+        :param non_editable_text_list: The non-editable parts of the text.
+        """
+        self._non_editable_text_list = non_editable_text_list
+        self._value_texts = [self._join_text(value) for value in self._value_lists]
+
+    def _group_text(self, group: int) -> tuple[list[str], list[str], int, bool, str]:
+        """
+        Return the info to use in paste_text() Descriptor function for the Descriptors of a group.
+        :param group: The index of the group. The first group is 0.
+        :return: The info.
+        """
+        return self._non_editable_text_list, self._value_lists[self._values[group]], 0, False, ""
+
+    def _paste_group_text(self, index: int, info: tuple[list[str], list[str], int, bool, str]) -> None:
+        """
+        Set the text of a Descriptor whose group has changed. If the Descriptor isn't in the scene, it is marked as
+        outdated instead and its text is set when it is attached again.
+        :param index: The index of the Descriptor.
+        :param info: The info to use in paste_text() Descriptor function.
+        """
+        descriptor = self._descriptors[index][0]
+        if descriptor.parentItem() is None:
+            self._outdated.add(descriptor)
+        else:
+            self._outdated.discard(descriptor)
+            descriptor.paste_text(info)
+
+    def _render_groups(self) -> None:
+        """
+        Set the text of all the Descriptors according to the value of their group.
+        """
+        start = 0
+        for group in range(len(self._values)):
+            if group < len(self._separators):
+                end = self._separators.index(group) + 1
+            else:
+                end = len(self._descriptors)
+            info = self._group_text(group)
+            for i in range(start, end):
+                self._paste_group_text(i, info)
+                self._set_descriptor_pos(i)
+            start = end
+
+    def _remove_descriptor(self, descriptor: list[Descriptor | float | float | float]) -> None:
+        """
+        Remove from the scene a Descriptor that is no longer used.
+        :param descriptor: The element of the removed Descriptor in self._descriptors.
+        """
+        self._outdated.discard(descriptor[0])
+        self._culler.remove_item(descriptor[0])
+
+    def set_points(self, segments: SegmentModel, new_text: bool) -> None:
         """
         Set the position and the text for the descriptors.
-        :param points: The points for the descriptors. Each element is a tuple of (Y-value, (X-left, X-Right)) where the
-                       x-value of the descriptor will be the one that will set the Descriptor in the middle of X-left
-                       and X-Right.
-        :param separator_points: A list with the separator positions. If the text is new, this list should be empty.
+        :param segments: The segments of the text, a Descriptor per segment, placed in the middle of the segment. If the
+                         text is new, the segments should be computed without separators.
         :param new_text: A boolean that indicates if the text is new.
         """
-
-        descriptor_texts_list = []
         if new_text:
             self._separators.clear()
-            descriptor_texts_list.append(
-                Descriptor(
-                    self._default_text, self._text_separator, self._allowed_strings, None, self._font
-                ).copy_text()
-            )
-        else:
-            if len(separator_points) != len(self._separators):
-                raise RuntimeError("There are not the same points as separators in set_points() function")
+            self._set_non_editable_text_list(self._default_text.split(self._text_separator))
+            self._values = [self._default_value()]
+        elif len(segments.separator_points) != len(self._separators):
+            raise RuntimeError("There are not the same points as separators in set_points() function")
 
-            for sep in self._separators:
-                descriptor_texts_list.append(self._descriptors[sep[1]][0].copy_text())
-            descriptor_texts_list.append(self._descriptors[-1][0].copy_text())
+        self._set_segments(segments)
 
-        if len(separator_points) == 0:
-            self._set_points_for_new_text(points, descriptor_texts_list[0])
-        else:
-            self._set_points_with_separators(points, separator_points, descriptor_texts_list)
+    def add_separators(self, segments: SegmentModel, separators: list[SeparatorRecord]) -> None:
+        """
+        Set in bulk all the separators. All the Descriptors are placed in a single pass. The groups of Descriptors that
+        start in a separator that was already added, and the first group, keep their text. The groups of the new
+        separators have the default text.
+        :param segments: The segments of the text with all the separators, a Descriptor per segment.
+        :param separators: All the separators, sorted in reading order.
+        """
+        default_value = self._default_value()
+        old_values = {id(self._separators.separator(i)): self._values[i + 1] for i in range(len(self._separators))}
+        self._values = [self._values[0]] + [old_values.get(id(separator), default_value) for separator in separators]
+
+        # The indexes are set by _set_segments()
+        self._separators.reset(separators, segments.separator_points)
+        self._last_created_descriptor_group = 0
+
+        self._set_segments(segments)
 
-    def _set_points_with_separators(self, points: list[tuple[float, tuple[float, float]]],
-                                    separator_points: list[QPointF],
-                                    descriptor_texts_list: list[tuple[list[str], list[str], int, bool, str]]) -> None:
+    def _set_segments(self, segments: SegmentModel) -> None:
         """
-        Set the position and the text for the descriptors.
-        :param points: The points for the descriptors. Each element is a tuple of (Y-value, (X-left, X-Right)) where the
-                       x-value of the descriptor will be the one that will set the Descriptor in the middle of X-left
-                       and X-Right.
-        :param separator_points: A list with the separator positions.
-        :param descriptor_texts_list: A list with the info to use in paste_text() Descriptor function for each group of
-                                      Descriptors.
-        """
-
-        if len(separator_points) + len(points) > len(self._descriptors):  # We need to create more descriptors
-            desc_index = 0
-            sep_index = 0
-            points_index = 0
-            sep_find = False
-            for desc_index in range(len(self._descriptors)):
-                self._descriptors[desc_index][1] = points[points_index][0]
-                if sep_find:
-                    self._descriptors[desc_index][2] = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    self._descriptors[desc_index][2] = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    self._descriptors[desc_index][3] = separator_points[sep_index].x()
-
-                    # Update separators
-                    self._separators[sep_index][1] = desc_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    self._descriptors[desc_index][3] = points[points_index][1][1]
-                    points_index += 1
-
-                self._descriptors[desc_index][0].paste_text(descriptor_texts_list[sep_index])
-                self._set_descriptor_pos(desc_index)
-            for desc_index in range(desc_index + 1, len(separator_points) + len(points)):
+        Set the position and the text for the descriptors, creating or removing Descriptors so there is one per segment.
+        :param segments: The segments of the text.
+        """
+        descriptor_texts_list = [self._group_text(i) for i in range(len(self._values))]
+
+        for desc_index in range(len(segments)):
+            if desc_index < len(self._descriptors):
+                self._descriptors[desc_index][1] = segments.ys[desc_index]
+                self._descriptors[desc_index][2] = segments.lefts[desc_index]
+                self._descriptors[desc_index][3] = segments.rights[desc_index]
+            else:
                 desc = Descriptor(
                     self._default_text, self._text_separator, self._allowed_strings, self._parent, self._font
                 )
-                y_value = points[points_index][0]
-
-                if sep_find:
-                    left_x = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    left_x = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    right_x = separator_points[sep_index].x()
-
-                    # Update separators
-                    self._separators[sep_index][1] = desc_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    right_x = points[points_index][1][1]
-                    points_index += 1
-
-                desc.paste_text(descriptor_texts_list[sep_index])
-
                 # [Descriptor, Y_Value_Without_Offset, Left_X_Value, Right_X_Value]
-                self._descriptors.append([desc, y_value, left_x, right_x])
-
-                self._set_descriptor_pos(desc_index)
+                self._descriptors.append(
+                    [desc, segments.ys[desc_index], segments.lefts[desc_index], segments.rights[desc_index]]
+                )
                 desc.editable_text_changed.connect(self._text_changed)
-        else:  # We need to delete part of existing descriptors
-            desc_index = 0
-            sep_index = 0
-            points_index = 0
-            sep_find = False
-            for desc_index in range(len(separator_points) + len(points)):
-
-                self._descriptors[desc_index][1] = points[points_index][0]
-                if sep_find:
-                    self._descriptors[desc_index][2] = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    self._descriptors[desc_index][2] = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    self._descriptors[desc_index][3] = separator_points[sep_index].x()
-
-                    # Update separators
-                    self._separators[sep_index][1] = desc_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    self._descriptors[desc_index][3] = points[points_index][1][1]
-                    points_index += 1
-
-                self._descriptors[desc_index][0].paste_text(descriptor_texts_list[sep_index])
-                self._set_descriptor_pos(desc_index)
-
-            for _ in range(desc_index + 1, len(self._descriptors)):
-                removed_descriptor = self._descriptors.pop()
-                self._parent.scene().removeItem(removed_descriptor[0])
+
+            self._paste_group_text(desc_index, descriptor_texts_list[segments.groups[desc_index]])
+            self._set_descriptor_pos(desc_index)
+
+        for _ in range(len(segments), len(self._descriptors)):
+            self._remove_descriptor(self._descriptors.pop())
+
+        # Update separators
+        for i in range(len(segments.separator_indexes)):
+            self._separators.set_index(i, segments.separator_indexes[i])
+            self._separators.set_point(i, segments.separator_points[i])
 
     def _set_descriptor_pos(self, ind: int) -> None:
         """
@@ -397,10 +390,12 @@ class DescriptorHandler:
         """
         self._default_text = default_text
         if update_descriptors_text:
-            for i in range(len(self._descriptors)):
-                self._descriptors[i][0].set_default_text(default_text)
-
-                self._set_descriptor_pos(i)
+            self._set_non_editable_text_list(default_text.split(self._text_separator))
+            default_value = self._default_value()
+            self._values = [default_value] * len(self._values)
+            self._render_groups()
+            for i in range(len(self._values)):
+                self.emitter.editable_text_changed.emit(i - 1, self._value_lists[default_value].copy())
 
     def set_y_offset_and_text_size(self, y_offset: float, text_size: float) -> None:
         """
@@ -449,32 +444,28 @@ class DescriptorHandler:
         for i in range(1, len(labels)):
             labels[i] = ";" + labels[i]
         labels.append("")
-        for i in range(len(self._separators)):
-            self._descriptors[self._separators[i][1]][0].set_text(labels.copy(), values[i])
-        self._descriptors[-1][0].set_text(labels, values[-1])
+        self._set_non_editable_text_list(labels)
+        self._values = [self._encode_value(value) for value in values]
+        self._render_groups()
+        for i in range(len(values)):
+            self.emitter.editable_text_changed.emit(i - 1, values[i].copy())
 
     def get_descriptor_values(self) -> list[str]:
         """
         Obtain the texts descriptors for all the clauses in a list.
         :return: The list of the texts descriptors.
         """
-        text_list = []
-        for sep in self._separators:
-            text_list.append(self._descriptors[sep[1]][0].toPlainText())
-        text_list.append(self._descriptors[-1][0].toPlainText())
-        return text_list
+        return [self._value_texts[value] for value in self._values]
 
-    def _find_separator(self, separator: Separator) -> int:
+    def _find_separator(self, separator: SeparatorRecord) -> int | None:
         """
         Find the index of the given separator in self.separators.
         :param separator: The separator to look for.
-        :return: The index of the separator.
+        :return: The index of the separator or None if it has not been added.
         """
-        for i in range(len(self._separators)):
-            if self._separators[i][0] is separator:
-                return i
+        return self._separators.find(separator)
 
-    def _add_separator(self, separator: Separator, point: QPointF) -> None:
+    def _add_separator(self, separator: SeparatorRecord, point: QPointF) -> None:
         """
         Add a separator to the list of separators and create a new Descriptor to use in the newly created group of
         Descriptors.
@@ -484,35 +475,12 @@ class DescriptorHandler:
         index_before = self._insert_descriptor(point)
         self._last_created_descriptor_group = index_before + 1
 
-        if len(self._separators) == 0:
-            self._separators.append([separator, index_before, point])
+        # The indexes of the separators after this separator are increased by GroupBoundaries
+        position = self._separators.insertion_position(separator)
+        self._separators.insert(position, separator, index_before, point)
 
-            # Update text for the new group of descriptors
-            # self._descriptors[index_before + 1][0].emit_text_changed(False)
-        else:
-            for i in reversed(range(len(self._separators))):
-                if (point.y() > self._separators[i][0].pos().y() or
-                        (point.y() == self._separators[i][0].pos().y() and
-                         point.x() > self._separators[i][0].pos().x())):
-                    # [Separator, Last_index_before, Last_position]
-                    self._separators.insert(i + 1, [separator, index_before, point])
-
-                    # Update "Last_index_before" for the separators after this separator
-                    for e in range(i + 2, len(self._separators)):
-                        self._separators[e][1] += 1
-
-                    # Update text for the new group of descriptors
-                    # self._descriptors[index_before + 1][0].emit_text_changed(False)
-                    return
-
-            # If the separator is inserted after the last separator
-            self._separators.insert(0, [separator, index_before, point])
-            for e in range(1, len(self._separators)):
-                self._separators[e][1] += 1
-
-            # Update text for the new group of descriptors
-            self._last_created_descriptor_group = index_before + 1
-            # self._descriptors[index_before + 1][0].emit_text_changed(False)
+        # The new group of descriptors has the default value
+        self._values.insert(position + 1, self._default_value())
 
     def _insert_descriptor(self, point: QPointF) -> int:
         """
@@ -593,7 +561,7 @@ class DescriptorHandler:
                 return i
         raise RuntimeError("UPWARDS FINISH WITHOUT RETURNING")
 
-    def _separator_created(self, created_separator: QGraphicsItem, point: QPointF) -> None:
+    def _separator_created(self, created_separator: SeparatorRecord, point: QPointF) -> None:
         """
         Updates the positions and number of the Descriptors affected by the creation of the new separator. This function
         should be called every time a Separator has created.
@@ -602,7 +570,7 @@ class DescriptorHandler:
         """
         self._add_separator(created_separator, point)
 
-    def _separator_position_changed(self, moved_separator: QGraphicsItem, point: QPointF) -> None:
+    def _separator_position_changed(self, moved_separator: SeparatorRecord, point: QPointF) -> None:
         """
         Updates the positions of the Descriptors affected by the movement of moved_separator. This function
         should be called every time a Separator has moved.
@@ -611,19 +579,19 @@ class DescriptorHandler:
         """
         sep_index = self._find_separator(moved_separator)
 
-        if (point.y() < self._separators[sep_index][2].y() or
-                (point.y() == self._separators[sep_index][2].y() and
-                 point.x() < self._separators[sep_index][2].x())):  # Separator moved upwards
-            self._separators[sep_index][1] = self._update_upwards(self._separators[sep_index][1], point)
+        if (point.y() < self._separators.point(sep_index).y() or
+                (point.y() == self._separators.point(sep_index).y() and
+                 point.x() < self._separators.point(sep_index).x())):  # Separator moved upwards
+            self._separators.set_index(sep_index, self._update_upwards(self._separators.index(sep_index), point))
 
-        elif (point.y() > self._separators[sep_index][2].y() or
-              (point.y() == self._separators[sep_index][2].y() and
-               point.x() > self._separators[sep_index][2].x())):  # Separator moved downwards
-            self._separators[sep_index][1] = self._update_downwards(self._separators[sep_index][1], point)
+        elif (point.y() > self._separators.point(sep_index).y() or
+              (point.y() == self._separators.point(sep_index).y() and
+               point.x() > self._separators.point(sep_index).x())):  # Separator moved downwards
+            self._separators.set_index(sep_index, self._update_downwards(self._separators.index(sep_index), point))
 
-        self._separators[sep_index][2] = point
+        self._separators.set_point(sep_index, point)
 
-    def _separator_clicked_on_the_border(self, moved_separator: QGraphicsItem, cursor_point: QPointF,
+    def _separator_clicked_on_the_border(self, moved_separator: SeparatorRecord, cursor_point: QPointF,
                                          right_point: QPointF, left_point: QPointF) -> None:
         """
         This function update Descriptor positions when a Separator that is on the border is clicked because when the
@@ -643,38 +611,36 @@ class DescriptorHandler:
         # Nothing is done because of the way function "update_downwards" is designed.
 
         # If the user released the separator in the left border and now the user is clicking in the right border
-        if self._separators[sep_index][2] == left_point and \
+        if self._separators.point(sep_index) == left_point and \
                 (cursor_point - left_point).manhattanLength() > (cursor_point - right_point).manhattanLength():
             # Auxiliary variable to add clarity
-            ind = self._separators[sep_index][1]
+            ind = self._separators.index(sep_index)
 
             self._descriptors[ind][1] = self._descriptors[ind - 1][1]
             self._descriptors[ind][2] = self._descriptors[ind - 1][3]
             self._descriptors[ind][3] = self._descriptors[ind - 1][3]
             self._set_descriptor_pos(ind)
 
-            self._separators[sep_index][1] -= 1
+            self._separators.set_index(sep_index, ind - 1)
 
             # Update text for this group of descriptors
             self._descriptors[ind + 1][0].emit_text_changed(False)
 
-    def _separator_removed(self, separator: Separator) -> None:
+    def _separator_removed(self, separator: SeparatorRecord) -> None:
         """
         Updates the number and position of the Descriptors when a Separator is removed.
         :param separator: The removed Separator.
         """
         # Get indexes
         sep_index = self._find_separator(separator)
-        desc_index = self._separators[sep_index][1]
+        desc_index = self._separators.index(sep_index)
 
-        # Remove separator and descriptor
+        # Remove separator and descriptor. The indexes of the separators after this separator are decreased by
+        # GroupBoundaries
         self._separators.pop(sep_index)
+        self._values.pop(sep_index + 1)
         removed_descriptor = self._descriptors.pop(desc_index + 1)
 
-        # Update "Last_index_before" for the separators after this separator
-        for e in range(sep_index, len(self._separators)):
-            self._separators[e][1] -= 1
-
         # Update remaining descriptors
         self._descriptors[desc_index][3] = removed_descriptor[3]
         self._set_descriptor_pos(desc_index)
@@ -682,7 +648,7 @@ class DescriptorHandler:
         # Update text for the new group of descriptors
         self._descriptors[desc_index][0].emit_text_changed(False)
 
-        self._parent.scene().removeItem(removed_descriptor[0])
+        self._remove_descriptor(removed_descriptor)
 
     def _text_changed(self, changed_descriptor: Descriptor, text_changed: bool) -> None:
         """
@@ -695,28 +661,32 @@ class DescriptorHandler:
         desc_index = _exponentialSearchDescriptors(self._descriptors, changed_descriptor.pos())
 
         # Find separator before the group of descriptors using exponential search
-        sep_index = -1
-        if len(self._separators) != 0:
-            sep_index = _exponentialSearchSeparators(self._separators, desc_index)
+        sep_index = self._separators.group_of(desc_index)
 
         # Adapt bounds
         if sep_index == -1:
             start = 0
         else:
-            start = self._separators[sep_index][1] + 1
+            start = self._separators.index(sep_index) + 1
 
         if sep_index == len(self._separators) - 1:
             end = len(self._descriptors)
         else:
-            end = self._separators[sep_index + 1][1] + 1
+            end = self._separators.index(sep_index + 1) + 1
+
+        descriptor = self._descriptors[desc_index][0]
+        if descriptor in self._outdated:
+            # The text of the Descriptor is outdated, so the group keeps its value
+            info = self._group_text(sep_index + 1)
+        else:
+            info = descriptor.copy_text()
+            self._values[sep_index + 1] = self._encode_value(info[1])
 
-        # Update text for the rest of the descriptors of the same group
+        # Update text for the rest of the descriptors of the same group that are in the scene
         for i in range(start, end):
-            self._descriptors[i][0].paste_text(self._descriptors[desc_index][0].copy_text())
+            self._paste_group_text(i, info)
             self._set_descriptor_pos(i)
 
         # Emit text changed signal
         if text_changed:
-            self.emitter.editable_text_changed.emit(
-                sep_index, self._descriptors[desc_index][0].get_editable_text_list()
-            )
+            self.emitter.editable_text_changed.emit(sep_index, list(info[1]))
@@ -1,7 +1,23 @@
+import typing
+from collections import OrderedDict
+from typing import Callable
+
 from PyQt5 import QtGui
-from PyQt5.QtCore import QTextBoundaryFinder
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QFont, QTextDocument, QTextLine, QTextOption
+
+from PyQt5.QtWidgets import QGraphicsTextItem, QGraphicsItem, QWidget, QStyleOptionGraphicsItem
+
+from .point_model import PointModel, PointModelBuilder
+from .word_metrics import WordMetrics, remove_text_format
 
-from PyQt5.QtWidgets import QGraphicsTextItem, QGraphicsItem
+LINE_SEPARATOR = "\u2028"  # Character used by QTextDocument to represent the "<br>" elements
+
+# The maximum number of stored offset calibrations. When it is reached, the least recently used one is removed
+MAX_CACHED_OFFSETS = 64
+
+# A line of a paragraph: (y-value, is an empty line, is not justified, points as (x-value, word, ignored))
+ParagraphLine = tuple[float, bool, bool, list[tuple[float, str, bool]]]
 
 
 def _apply_text_format(text: str) -> str:
@@ -19,35 +35,487 @@ def _apply_text_format(text: str) -> str:
     return " ".join(text.replace("\n", " <br> ").split())
 
 
-def _remove_text_format(text: str) -> str:
+def _get_html(text: str, line_height: float | int) -> str:
     """
-    This function remove the HTML format from the text to obtain plain text.
-    :param text: The text to be formatted.
-    :return: The formatted text.
+    Obtain the HTML used to represent the formatted text justified and with the given line height.
+    :param text: The text formatted by _apply_text_format().
+    :param line_height: The line height as a percentage.
+    :return: The HTML.
+    """
+    return '<p align="justify" style="line-height: ' + str(line_height) + '%">' + text + '</p>'
+
+
+def _split_paragraphs(text: str) -> list[tuple[str, bool]]:
+    """
+    Split the formatted text in paragraphs. Each paragraph ends with the "<br>" element that separates it from the next
+    one, so joining the paragraphs with spaces results in the original text.
+    :param text: The text formatted by _apply_text_format().
+    :return: A list with a tuple of (paragraph text, is the last paragraph) per paragraph.
+    """
+    paragraphs = []
+    words = []
+    for word in text.split(" "):
+        words.append(word)
+        if word == "<br>":
+            paragraphs.append(" ".join(words))
+            words = []
+    if len(words) != 0 or len(paragraphs) == 0:
+        paragraphs.append(" ".join(words))
+    return [(paragraph, i == len(paragraphs) - 1) for i, paragraph in enumerate(paragraphs)]
+
+
+def _get_paragraph_html(text: str, is_last: bool, line_height: float | int) -> str:
+    """
+    Obtain the HTML used to represent a paragraph. The "<br>" element that ends a paragraph is not represented because
+    the next paragraph already starts in a new line. Only the last paragraph keeps it, so a text that ends with a break
+    line has the same empty line as before.
+    :param text: The text of the paragraph.
+    :param is_last: True if the paragraph is the last one of the text.
+    :param line_height: The line height as a percentage.
+    :return: The HTML.
+    """
+    if not is_last and text.endswith("<br>"):
+        text = text[:-len("<br>")].rstrip(" ")
+    return _get_html(text, line_height)
+
+
+def _create_document(font: QFont, text_width: float, html: str) -> QTextDocument:
+    """
+    Create a QTextDocument with the same configuration that the documents of the paragraphs of MainText.
+    :param font: The font used to represent the text.
+    :param text_width: The width of the document.
+    :param html: The HTML of the document.
+    :return: The document.
+    """
+    document = QTextDocument()
+    document.setDefaultFont(font)
+    text_option = document.defaultTextOption()
+    text_option.setWrapMode(QTextOption.WordWrap)
+    document.setDefaultTextOption(text_option)
+    document.setTextWidth(text_width)
+    document.setHtml(html)
+    return document
+
+
+def _get_line_count(document: QTextDocument) -> int:
+    """
+    Obtain the number of lines of the text of a document with a single paragraph.
+    :param document: The QTextDocument that contains the text.
+    :return: The number of lines.
+    """
+    # Ensures that the whole document is laid out. The size is used instead of the document layout, so no wrapper of
+    # the layout is created, as the documents of the relayout worker are created and deleted in another thread
+    document.size()
+    return document.firstBlock().layout().lineCount()
+
+
+def _get_words_position(document: QTextDocument, words_width: list[tuple[int | float, str, bool]],
+                        plain_words: list[str]) -> list[int]:
     """
-    text = text.replace("&amp;", "&")
-    text = text.replace("&quot;", "\"")
-    text = text.replace("&gt;", ">")
-    text = text.replace("&lt;", "<")
-    return text
+    Obtains the position of each element of the words_width structure in the text of the QTextDocument. The break lines
+    are represented in the document by the QChar.LineSeparator character. The break line that ends a paragraph is not
+    in the document, so its position is the end of the text.
+    :param document: The QTextDocument that contains the text.
+    :param words_width: The structure returned by WordMetrics.get_words_width().
+    :param plain_words: The words of words_width without HTML format.
+    :return: A list with the position of the first character of each element.
+    """
+    document_text = document.firstBlock().text()
+    positions = []
+    pos = 0
+    for i in range(len(words_width)):
+        if words_width[i][0] == -1:
+            pos = document_text.find(LINE_SEPARATOR, pos)
+            if pos == -1:
+                pos = len(document_text)
+            positions.append(pos)
+            pos += 1
+        else:
+            plain_word = plain_words[i]
+            pos = document_text.find(plain_word, pos)
+            positions.append(pos)
+            pos += len(plain_word)
+    return positions
+
+
+def _get_paragraph_lines(document: QTextDocument, words_width: list[tuple[int | float, str, bool]],
+                         plain_words: list[str], words_position: list[int], horizontal_padding: float,
+                         vertical_padding: float, is_last: bool,
+                         is_cancelled: Callable[[], bool] | None = None) -> list[ParagraphLine] | None:
+    """
+    Calculates the points of separation between the different words of a paragraph. The lines and the position of the
+    words are obtained from the QTextLayout of the document, so they are the same that are painted. The coordinates are
+    relative to the QGraphicsTextItem of the paragraph.
+    :param document: The QTextDocument that contains the paragraph.
+    :param words_width: The structure returned by WordMetrics.get_words_width().
+    :param plain_words: The words of words_width without HTML format.
+    :param words_position: The position of each element of words_width in the text of the document.
+    :param horizontal_padding: The horizontal padding introduced by QGraphicsTextItem.
+    :param vertical_padding: The vertical padding introduced by QGraphicsTextItem.
+    :param is_last: True if the paragraph is the last one of the text.
+    :param is_cancelled: Optional function that is checked between lines. If it returns True, the calculation stops.
+    :return: The lines of the paragraph or None if the calculation has been cancelled. The lines without any element of
+             the text are not included.
+    """
+    line_count = _get_line_count(document)
+    layout = document.firstBlock().layout()
+    x_offset = layout.position().x()
+    words_number = len(words_width)
+
+    lines = []
+    word_index = 0
+    for line_number in range(line_count):
+        if is_cancelled is not None and is_cancelled():
+            return None
+
+        line = layout.lineAt(line_number)
+        line_end = line.textStart() + line.textLength()
+        if line_number == line_count - 1:  # The break line that ends the paragraph belongs to the last line
+            line_end += 1
+
+        start_index = word_index
+        while word_index < words_number and words_position[word_index] < line_end:
+            word_index += 1
+        end_index = word_index - 1
+
+        if word_index == start_index:  # There is no element of the text in this line
+            continue
+
+        # A break line that is not the last element of the text ends the paragraph
+        break_line = is_last and end_index == words_number - 1
+        if words_width[end_index][0] == -1 and not break_line:
+            end_index -= 1
+            break_line = True
+
+        points = []
+        _add_x_values(
+            points, line, x_offset, start_index, end_index, break_line, horizontal_padding, words_width, plain_words,
+            words_position
+        )
+        lines.append((vertical_padding + line.y(), end_index < start_index, break_line, points))
+    return lines
+
+
+def _add_x_values(points: list[tuple[float, str, bool]], line: QTextLine, x_offset: float, start_index: int,
+                  end_index: int, break_line: bool, padding: int | float,
+                  words_width: list[tuple[int | float, str, bool]], plain_words: list[str],
+                  words_position: list[int]) -> None:
+    """
+    Calculates the x-points of separation between the different words of a line indicated by start_index and end_index
+    and adds them to the points list. For each point, the word that is immediately after the x-point and a boolean that
+    indicates if this word is part of a word with one or more BREAK_LINE_CHARACTERS are added. In the case of the end of
+    line, and empty string will be stored. The points between two words are placed in the middle of the space between
+    them and the points between two parts of the same word are placed where the second part starts.
+    :param points: The list where the points are added as tuples of (x-value, word, ignored).
+    :param line: The QTextLine of the QTextLayout that contains the words.
+    :param x_offset: The x-position of the QTextLayout.
+    :param start_index: Index of the first word in the line in words_width structure.
+    :param end_index: Index of the last word in the line in words_width structure.
+    :param break_line: True if the line is not justified (because of a "\n" character or because of the end of the
+                       document).
+    :param padding: The padding introduced by QGraphicsTextItem.
+    :param words_width: The structure returned by WordMetrics.get_words_width().
+    :param plain_words: The words of words_width without HTML format.
+    :param words_position: The position of each element of words_width in the text of the document.
+    """
+    x_offset += line.x()
+
+    if start_index > end_index:  # Line without words
+        points.append((x_offset - padding / 2, "\n", False))
+        points.append((x_offset - padding / 2, "", False))
+        return
+
+    word_start = x_offset + line.cursorToX(words_position[start_index])[0]
+    points.append((
+        word_start - padding / 2,
+        plain_words[start_index],
+        (words_width[start_index - 1][2] if (start_index > 0) else False)
+    ))
+    word_end = word_start + words_width[start_index][0]
+
+    for i in range(start_index + 1, end_index + 1):
+        word_start = x_offset + line.cursorToX(words_position[i])[0]
+
+        # If current string is part of a string with BREAK_LINE_CHARACTERS
+        if words_width[i - 1][2]:
+            x_value = word_start
+        else:
+            x_value = (word_end + word_start) / 2
+        points.append((x_value, plain_words[i], words_width[i - 1][2]))
+        word_end = word_start + words_width[i][0]
+
+    if break_line:
+        points.append((word_end + padding, "", False))
+    else:
+        points.append((x_offset + line.width() + padding / 2, "", words_width[end_index][2]))
+
+
+def _build_point_model(paragraphs_lines: list[list[ParagraphLine]], paragraphs_y: list[float], x: float,
+                       y: float) -> PointModel:
+    """
+    Join the lines of all the paragraphs in a PointModel. The empty lines and the ends of the paragraphs are represented
+    by "\n" characters appended to the last word before them.
+    :param paragraphs_lines: The lines of each paragraph, as returned by _get_paragraph_lines().
+    :param paragraphs_y: The y-position of each paragraph relative to the MainText element.
+    :param x: The x-position of the MainText element.
+    :param y: The y-position of the MainText element.
+    :return: The PointModel described in MainText.get_complete_points().
+    """
+    builder = PointModelBuilder()
+    paragraph_end = False
+    for lines, paragraph_y in zip(paragraphs_lines, paragraphs_y):
+        for line_y, empty_line, break_line, points in lines:
+            if empty_line and not builder.is_empty():
+                builder.append_to_last_word("\n ")
+                continue
+
+            if paragraph_end:
+                builder.append_to_last_word("\n")
+
+            builder.add_line(y + paragraph_y + line_y)
+            for point_x, word, ignored in points:
+                builder.add_point(x + point_x, word, ignored)
+            paragraph_end = break_line
+    return builder.build()
+
+
+class TextLayoutSnapshot:
+    """
+    This class stores a copy of the data of a MainText element needed to lay out its text with compute_text_layout(),
+    so the layout can be calculated in a thread other than the GUI thread.
+    """
+
+    def __init__(self, text: str, paragraphs: list[tuple[str, bool]], line_height: float | int, font: QFont,
+                 text_width: float, x: float, y: float, horizontal_padding: float, vertical_padding: float,
+                 line_spacing: float, word_metrics: WordMetrics) -> None:
+        """
+        Create TextLayoutSnapshot object.
+        :param text: The text formatted by _apply_text_format().
+        :param paragraphs: The paragraphs of the text, as returned by _split_paragraphs().
+        :param line_height: The line height as a percentage.
+        :param font: The font used to represent the text.
+        :param text_width: The width of the documents.
+        :param x: The x-position of the MainText element.
+        :param y: The y-position of the MainText element.
+        :param horizontal_padding: The horizontal padding introduced by QGraphicsTextItem with the font.
+        :param vertical_padding: The vertical padding introduced by QGraphicsTextItem with the font.
+        :param line_spacing: The height that occupies a line of text plus the line spacing with the font.
+        :param word_metrics: The WordMetrics object used to calculate the width of the words.
+        """
+        self.text = text
+        self.paragraphs = paragraphs
+        self.line_height = line_height
+        self.font = font
+        self.text_width = text_width
+        self.x = x
+        self.y = y
+        self.horizontal_padding = horizontal_padding
+        self.vertical_padding = vertical_padding
+        self.line_spacing = line_spacing
+        self.word_metrics = word_metrics
+
+
+class ParagraphLayout:
+    """
+    This class stores the layout of a paragraph calculated by compute_text_layout(). It only holds plain Python data,
+    so it can be passed from the relayout worker to the GUI thread.
+    """
+
+    def __init__(self, words_width: list[tuple[int | float, str, bool]], plain_words: list[str],
+                 words_position: list[int], lines: list[ParagraphLine]) -> None:
+        """
+        Create ParagraphLayout object.
+        :param words_width: The structure returned by WordMetrics.get_words_width().
+        :param plain_words: The words of words_width without HTML format.
+        :param words_position: The position of each element of words_width in the text of the document.
+        :param lines: The lines of the paragraph, as returned by _get_paragraph_lines().
+        """
+        self.words_width = words_width
+        self.plain_words = plain_words
+        self.words_position = words_position
+        self.lines = lines
+
+
+class TextLayout:
+    """
+    This class stores the result of compute_text_layout(): the layout of each paragraph and the points of separation
+    between the words of the text.
+    """
+
+    def __init__(self, snapshot: TextLayoutSnapshot, paragraphs: list[ParagraphLayout], points: PointModel) -> None:
+        """
+        Create TextLayout object.
+        :param snapshot: The snapshot used to calculate the layout.
+        :param paragraphs: The layout of each paragraph of the snapshot.
+        :param points: The points of separation between the words.
+        """
+        self.snapshot = snapshot
+        self.paragraphs = paragraphs
+        self.points = points
+
+
+def compute_text_layout(snapshot: TextLayoutSnapshot,
+                        is_cancelled: Callable[[], bool] | None = None) -> TextLayout | None:
+    """
+    Lay out each paragraph of the text of a snapshot in a new QTextDocument and calculate the points of separation
+    between its words. Can be called from any thread. The documents are deleted in the calling thread before returning,
+    because their layout refers to the fonts of that thread, so the result only holds plain Python data.
+    :param snapshot: The snapshot obtained with MainText.get_layout_snapshot().
+    :param is_cancelled: Optional function that is checked during the calculation. If it returns True, the calculation
+                         stops.
+    :return: The layout or None if the calculation has been cancelled.
+    """
+    paragraphs = []
+    paragraphs_y = []
+    paragraph_y = 0
+    for text, is_last in snapshot.paragraphs:
+        document = _create_document(
+            snapshot.font, snapshot.text_width, _get_paragraph_html(text, is_last, snapshot.line_height)
+        )
+        words_width = snapshot.word_metrics.get_words_width(snapshot.font, text.split(" "))
+        plain_words = [remove_text_format(word[1]) for word in words_width]
+        words_position = _get_words_position(document, words_width, plain_words)
+
+        lines = _get_paragraph_lines(
+            document, words_width, plain_words, words_position, snapshot.horizontal_padding,
+            snapshot.vertical_padding, is_last, is_cancelled
+        )
+        if lines is None:
+            return None
+
+        paragraphs.append(ParagraphLayout(words_width, plain_words, words_position, lines))
+        paragraphs_y.append(paragraph_y)
+        paragraph_y += _get_line_count(document) * snapshot.line_spacing
+
+    points = _build_point_model([paragraph.lines for paragraph in paragraphs], paragraphs_y, snapshot.x, snapshot.y)
+    return TextLayout(snapshot, paragraphs, points)
+
+
+class ParagraphText(QGraphicsTextItem):
+    """
+    This class represents a paragraph of the text of MainText, that is, the words until a break line. Each paragraph has
+    its own QTextDocument, so a change in the text only lays out again the paragraphs that have changed. The points of
+    separation between its words are stored until its text, its width or its font change.
+    """
+
+    def __init__(self, text: str, is_last: bool, font: QFont, text_width: float, line_height: float | int,
+                 word_metrics: WordMetrics, parent: QGraphicsItem) -> None:
+        """
+        Create ParagraphText object.
+        :param text: The text of the paragraph in the format of _split_paragraphs().
+        :param is_last: True if the paragraph is the last one of the text.
+        :param font: The font used to represent the text.
+        :param text_width: The maximum width for a line.
+        :param line_height: The line height as a percentage.
+        :param word_metrics: The WordMetrics object used to calculate the width of the words.
+        :param parent: The MainText element.
+        """
+        super().__init__(parent)
+        self._line_height = line_height
+        self._word_metrics = word_metrics
+        self._text = text
+        self._is_last = is_last
+        self._words_width = None
+        self._plain_words = None
+        self._words_position = None
+        self._lines = None
+        self._lines_key = None
+
+        # The words can't be split between lines because the points are only placed between words
+        text_option = self.document().defaultTextOption()
+        text_option.setWrapMode(QTextOption.WordWrap)
+        self.document().setDefaultTextOption(text_option)
+
+        super().setFont(font)
+        self.setTextWidth(text_width)
+        self.set_paragraph(text, is_last)
+
+    def get_key(self) -> tuple[str, bool]:
+        """
+        Return the text of the paragraph and if it is the last one. Two paragraphs with the same key are represented in
+        the same way.
+        :return: A tuple of (paragraph text, is the last paragraph).
+        """
+        return self._text, self._is_last
+
+    def set_paragraph(self, text: str, is_last: bool) -> None:
+        """
+        Set the text of the paragraph.
+        :param text: The text of the paragraph in the format of _split_paragraphs().
+        :param is_last: True if the paragraph is the last one of the text.
+        """
+        self._text = text
+        self._is_last = is_last
+        self.setHtml(_get_paragraph_html(text, is_last, self._line_height))
+        self._update_words()
+
+    def _update_words(self) -> None:
+        """
+        Calculate the width and the position of the words of the paragraph and discard the stored points.
+        """
+        self._words_width = self._word_metrics.get_words_width(self.font(), self._text.split(" "))
+        self._plain_words = [remove_text_format(word[1]) for word in self._words_width]
+        self._words_position = _get_words_position(self.document(), self._words_width, self._plain_words)
+        self._lines = None
+
+    def line_count(self) -> int:
+        """
+        Return the number of lines of the paragraph.
+        :return: The number of lines.
+        """
+        return _get_line_count(self.document())
+
+    def get_lines(self, horizontal_padding: float, vertical_padding: float) -> list[ParagraphLine]:
+        """
+        Obtain the points of separation between the words of the paragraph, relative to this element. The points are
+        only calculated if the text, the width or the font have changed since the last call. The lines are not reused
+        across widths, even if their breaks don't move, because the justified lines are spaced according to the width.
+        :param horizontal_padding: The horizontal padding introduced by QGraphicsTextItem.
+        :param vertical_padding: The vertical padding introduced by QGraphicsTextItem.
+        :return: The lines of the paragraph, as returned by _get_paragraph_lines().
+        """
+        key = (self.textWidth(), self.font().key())
+        if self._lines is None or self._lines_key != key:
+            self._lines = _get_paragraph_lines(
+                self.document(), self._words_width, self._plain_words, self._words_position, horizontal_padding,
+                vertical_padding, self._is_last
+            )
+            self._lines_key = key
+        return self._lines
 
+    def set_layout(self, layout: ParagraphLayout, font: QFont, text_width: float) -> None:
+        """
+        Apply the layout calculated by compute_text_layout() for the given font and width. The document of this element
+        is laid out again with them in the GUI thread, which results in the same lines, so the words and the points of
+        the layout are used instead of calculating them again.
+        :param layout: The layout of the paragraph.
+        :param font: The font of the layout.
+        :param text_width: The width of the layout.
+        """
+        super().setFont(font)
+        self.setTextWidth(text_width)
+        self._words_width = layout.words_width
+        self._plain_words = layout.plain_words
+        self._words_position = layout.words_position
+        self._lines = layout.lines
+        self._lines_key = (self.textWidth(), self.font().key())
 
-def _find_boundaries_word(word: str):
-    finder = QTextBoundaryFinder(QTextBoundaryFinder.Line, word)
-    result = []
-    index = finder.toNextBoundary()
-    while index != -1:
-        result.append(index)
-        index = finder.toNextBoundary()
-    result.pop()
-    return result
+    def setFont(self, font: QtGui.QFont) -> None:
+        """
+        Set text with a given font.
+        :param font: The font object
+        """
+        super().setFont(font)
+        self._update_words()
 
 
-class MainText(QGraphicsTextItem):
+class MainText(QGraphicsItem):
     """
     This class represents a multiline text with an interline spacing introduced in the constructor. Can also calculate
-    the points that represents the spaces in the text.
+    the points that represents the spaces in the text. The text is divided in paragraphs, each one represented by a
+    ParagraphText stacked vertically, so the cost of a change depends on the paragraphs affected by it.
     """
+    _paragraphs: list[ParagraphText]
 
     def __init__(self, text: str, size: float | int, width: float | int, line_height: float | int,
                  parent: QGraphicsItem) -> None:
@@ -61,30 +529,71 @@ class MainText(QGraphicsTextItem):
         :param parent: The QGraphicsItem parent.
         """
         super().__init__(parent)
-        self._words_width = None
-        self.setTextWidth(width - 10)
+        self._paragraphs = []
+        self._bounding_rect = QRectF()
+        self._text_width = width - 10
         self.setFlag(QGraphicsItem.ItemIgnoresParentOpacity)
+        self.setFlag(QGraphicsItem.ItemHasNoContents)
         self.setPos(5, 5)
         self.setZValue(1)
         self._line_height = line_height
         self._text = text
-        self._aux_text_item = QGraphicsTextItem()
+        self._aux_document = QTextDocument()
+        self._word_metrics = WordMetrics()
+
+        # Calibrations of the offsets, kept across font changes. Key: (calibration name, font key, line height)
+        self._offsets_cache = OrderedDict()
+        self._offsets_hits = 0
+        self._offsets_misses = 0
 
         # Add specific format
-        font = self.font()
+        font = QFont()
         font.setFamily('Times')
         font.setBold(True)
-        self.setFont(font)
+        self._font = font
 
         self.set_text_size(size)
         self.set_text(text)
 
+    def boundingRect(self) -> QRectF:
+        """
+        Return the rectangle that contains all the paragraphs.
+        :return: The bounding rectangle.
+        """
+        return self._bounding_rect
+
+    def paint(self, painter: QtGui.QPainter, option: QStyleOptionGraphicsItem,
+              widget: typing.Optional[QWidget] = ...) -> None:
+        """
+        The paragraphs paint the text, so this element paints nothing.
+        :param painter: This parameter will be ignored
+        :param option: This parameter will be ignored
+        :param widget: This parameter will be ignored
+        """
+        pass
+
+    def font(self) -> QFont:
+        """
+        Return the font used to represent the text.
+        :return: The font object
+        """
+        return QFont(self._font)
+
+    def textWidth(self) -> float:
+        """
+        Return the maximum width for a line.
+        :return: The width in pixels.
+        """
+        return self._text_width
+
     def get_text(self) -> str:
         """
         Return the plain text of the element.
         :return: The plain text.
         """
-        text = _remove_text_format(self._text).replace(" <br> ", " \n ").replace(" <br> ", " \n ")
+        text = remove_text_format(self._text).replace(" <br> ", " \n ").replace(" <br> ", " \n ")
+        if text[:4] == "<br>":
+            text = "\n" + text[4:]
         if text[-4:] == "<br>":
             return text[:-4] + "\n"
         return text
@@ -100,19 +609,74 @@ class MainText(QGraphicsTextItem):
 
     def _set_text(self, text: str) -> None:
         """
-        Set the text of the element justified and with the element's line height.
+        Set the text of the element justified and with the element's line height. The paragraphs whose text hasn't
+        changed are reused, so they keep their layout and their points.
         :param text: The text
         """
-        self.setHtml('<p align="justify" style="line-height: ' + str(self._line_height) + '%">' + text + '</p>')
+        keys = _split_paragraphs(text)
+
+        unused = {}
+        for paragraph in self._paragraphs:
+            unused.setdefault(paragraph.get_key(), []).append(paragraph)
 
-        self._words_width = self._get_words_width(self._text.split(" "))
+        paragraphs = [None] * len(keys)
+        missing = []
+        for i in range(len(keys)):
+            if unused.get(keys[i]):
+                paragraphs[i] = unused[keys[i]].pop()
+            else:
+                missing.append(i)
+
+        # The paragraphs that can't be reused get the text of the new ones
+        remaining = [paragraph for paragraph_list in unused.values() for paragraph in paragraph_list]
+        for i in missing:
+            if len(remaining) != 0:
+                paragraphs[i] = remaining.pop()
+                paragraphs[i].set_paragraph(*keys[i])
+            else:
+                paragraphs[i] = ParagraphText(
+                    *keys[i], self._font, self._text_width, self._line_height, self._word_metrics, self
+                )
+
+        for paragraph in remaining:
+            if paragraph.scene() is not None:
+                paragraph.scene().removeItem(paragraph)
+            else:
+                paragraph.setParentItem(None)
+
+        self._paragraphs = paragraphs
+        self._stack_paragraphs()
+
+    def _stack_paragraphs(self) -> None:
+        """
+        Place each paragraph immediately below the previous one and update the bounding rectangle of this element.
+        """
+        line_spacing = self._get_separator_offsets_height(self._font)[1]
+        paragraph_y = 0
+        width = 0
+        for paragraph in self._paragraphs:
+            paragraph.setPos(0, paragraph_y)
+            paragraph_y += paragraph.line_count() * line_spacing
+            width = max(width, paragraph.boundingRect().width())
+
+        self.prepareGeometryChange()
+        if len(self._paragraphs) == 0:
+            self._bounding_rect = QRectF()
+        else:
+            last_paragraph = self._paragraphs[-1]
+            self._bounding_rect = QRectF(
+                0, 0, width, last_paragraph.pos().y() + last_paragraph.boundingRect().height()
+            )
 
     def set_width(self, width: float | int) -> None:
         """
         Set the text width for the item and recalculates the separator points
         :param width: Maximum width in pixels
         """
-        self.setTextWidth(width - 10)
+        self._text_width = width - 10
+        for paragraph in self._paragraphs:
+            paragraph.setTextWidth(self._text_width)
+        self._stack_paragraphs()
 
     def set_text_size(self, size: float | int) -> None:
         """
@@ -123,251 +687,122 @@ class MainText(QGraphicsTextItem):
         font = self.font()
         font.setPointSize(size)
         self.setFont(font)
-        self._aux_text_item.setFont(self.font())
-
-    def _check_jitter_width(self, start_index: int, end_index: int) -> bool:
-        """
-        Checks if the words of the self._words_width structure in the interval [start_index, end_index) have a width
-        greater than the maximum width of the main_text element. This is checked by inserting those words into an
-        auxiliary QGraphicsTextItem and is done with this procedure because of some jitter between calls of the bounding
-        rect function due to internal rounding.
-        :param start_index: Start index of the self._words_width structure. The word of this index is included in the
-                            calculation.
-        :param end_index: End index of the self._words_width structure. The word of this index is not included in the
-                          calculation.
-        :return: True if the width of the resulting string is greater than the width of the element, False otherwise.
-        """
-        aux_text = ""
-        for i in range(start_index, end_index):
-            if self._words_width[i][2]:
-                aux_text += self._words_width[i][1]
-            else:
-                aux_text += (self._words_width[i][1] + " ")
-        if self._words_width[end_index - 1][2]:
-            self._aux_text_item.setHtml(aux_text)
-        else:
-            self._aux_text_item.setHtml(aux_text[:-1])
-
-        return self._aux_text_item.boundingRect().width() > self.boundingRect().width()
 
-    def _get_words_width(self, text_list: list[str]) -> list[tuple[int | float, str, bool]]:
+    def get_complete_points(self) -> PointModel:
         """
-        This function calculates the width of all the words passed as parameter.
-        :param text_list: A list of words.
-        :return: A list. For each element, the first sub-element is the word width, the second, the word and the last, a
-                 boolean that indicates if the word is part of a word with one or more BREAK_LINE_CHARACTERS.
+        Calculates the points of separation between the different words of the text. It returns a PointModel, that
+        stores, for each line, the y-value and, for each point of the line, the x-value, the word that is immediately
+        after the x-point and a boolean that indicates if this word is part of a word with one or more
+        BREAK_LINE_CHARACTERS. In the case of an end of line, and empty string will be stored.
+        The lines and the position of the words are obtained from the QTextLayout of the QTextDocument of each
+        paragraph, so they are the same that are painted. Only the paragraphs that have changed are calculated again.
+        :return: The PointModel described above.
         """
-        # Obtain the offsets to correctly place the separators
-        half_space, padding = self._get_separator_offsets_width()
-
-        # Create an auxiliary QGraphicsTextItem to calculate the points
-        aux_text = QGraphicsTextItem()
-        aux_text.setFont(self.font())
-
-        result = []
-        for word in text_list:
-            if word == "<br>":
-                result.append((-1, "\n", False))  # Break line
-            else:
-                aux_text.setHtml(word)
-                positions = _find_boundaries_word(word)
-                if len(positions) == 0:
-                    result.append((aux_text.boundingRect().width() - 2 * padding, word, False))
-                else:
-                    start_pos = 0
-
-                    for i in range(len(positions)):
-                        sub_word = word[start_pos:positions[i]]
-                        start_pos = positions[i]
-
-                        aux_text.setHtml(sub_word)
-                        result.append((aux_text.boundingRect().width() - 2 * padding, sub_word, True))
-
-                    sub_word = word[start_pos:]
-                    aux_text.setHtml(sub_word)
-                    result.append((aux_text.boundingRect().width() - 2 * padding, sub_word, False))
-
-        return result
+        horizontal_padding = self._get_separator_offsets_width(self._font)[1]
+        vertical_padding = self._get_separator_offsets_height(self._font)[0]
+        return _build_point_model(
+            [paragraph.get_lines(horizontal_padding, vertical_padding) for paragraph in self._paragraphs],
+            [paragraph.pos().y() for paragraph in self._paragraphs],
+            self.pos().x(),
+            self.pos().y()
+        )
 
-    def get_complete_points(self) -> list[tuple[float, list[list[float | str | bool]]]]:
+    def get_layout_snapshot(self, width: float | int | None, size: float | int | None) -> TextLayoutSnapshot:
         """
-        Calculates the points of separation between the different words of the text. It returns a complex structure that
-        is composed by a list of tuples. The first element of the tuple is the y-value for a specific line and the
-        second element is a three-element list. Each of these three-element lists represents an x-value in the specific
-        line, the word that is immediately after the x-point and a boolean that indicates if this word is part of a word
-        with one or more BREAK_LINE_CHARACTERS. In the case of an end of line, and empty string will be stored.
-        :return: The complex structure described above.
+        Copy the data needed to lay out the text of this element with a new width and/or text size. The returned
+        snapshot can be used by compute_text_layout() in another thread and its result applied with set_layout().
+        :param width: The new maximum width in pixels or None to keep the current one.
+        :param size: The new point size of the text or None to keep the current one.
+        :return: The snapshot.
         """
+        font = self.font()
+        if size is not None:
+            font.setPointSize(size)
+        return TextLayoutSnapshot(
+            self._text,
+            [paragraph.get_key() for paragraph in self._paragraphs],
+            self._line_height,
+            font,
+            self._text_width if width is None else width - 10,
+            self.pos().x(),
+            self.pos().y(),
+            self._get_separator_offsets_width(font)[1],
+            self._get_separator_offsets_height(font)[0],
+            self._get_separator_offsets_height(font)[1],
+            self._word_metrics
+        )
 
-        half_space, horizontal_padding = self._get_separator_offsets_width()
-        vertical_padding, line_vertical_offset = self._get_separator_offsets_height()
-
-        space = 2 * half_space
-        points = []
-        line_index = 0
-        words_start_index = 0
-        words_width = 2 * horizontal_padding
-        skip = False
-        i = 0
-
-        for i in range(len(self._words_width) - 1):
-            if skip:
-                if self._words_width[i][0] == -1:  # Another break line
-                    line_index += 1
-                    points[-1][1][-1][1] += "\n "
-                else:
-                    skip = False
-                    words_width += self._words_width[i][0] + space
-                    words_start_index = i
-                    points[-1][1][-1][1] += "\n"
-
-                continue
-            elif self._words_width[i][0] == -1:  # Break line
-
-                # Add line
-                points.append((
-                    vertical_padding + line_vertical_offset * line_index + self.pos().y(),
-                    self._get_x_values(
-                        words_start_index,
-                        i - 1,
-                        True, horizontal_padding,
-                        half_space
-                    )
-                ))
-                line_index += 1
-                words_width = 2 * horizontal_padding
-                skip = True
-            else:
-                if self._words_width[i - 1][2]:  # If current string is part of a string with BREAK_LINE_CHARACTERS
-                    words_width += self._words_width[i][0]
-                else:
-                    words_width += (self._words_width[i][0] + space)
-
-                if words_width - space > self.textWidth():  # This line can be full
-                    if self._check_jitter_width(words_start_index, i + 1):  # This line is definitely full
-                        # Add line
-                        points.append((
-                            vertical_padding + line_vertical_offset * line_index + self.pos().y(),
-                            self._get_x_values(
-                                words_start_index,
-                                i - 1,
-                                False,
-                                horizontal_padding,
-                                half_space
-                            )
-                        ))
-                        line_index += 1
-                        words_width = 2 * horizontal_padding + self._words_width[i][0] + space
-                        words_start_index = i
-        if skip:
-            words_start_index = i + 1
-            points[-1][1][-1][1] += "\n"
-
-        if self._words_width[len(self._words_width) - 2][2]:
-            words_width += self._words_width[len(self._words_width) - 1][0]
-        else:
-            words_width += (self._words_width[len(self._words_width) - 1][0] + 2 * half_space)
-
-        if words_width - space > self.textWidth():  # This line is full
-            # Add line
-            points.append((
-                vertical_padding + line_vertical_offset * line_index + self.pos().y(),
-                self._get_x_values(
-                    words_start_index,
-                    len(self._words_width) - 2,
-                    False,
-                    horizontal_padding,
-                    half_space
-                )
-            ))
-            line_index += 1
-            words_start_index = len(self._words_width) - 1
-
-        points.append((
-            vertical_padding + line_vertical_offset * line_index + self.pos().y(),
-            self._get_x_values(
-                words_start_index,
-                len(self._words_width) - 1,
-                True,
-                horizontal_padding,
-                half_space
-            )
-        ))
-        return points
-
-    def _get_x_values(self, start_index: int, end_index: int, break_line: bool,
-                      padding: int | float, half_space: int | float) -> list[list[float | str | bool]]:
-        """
-        Calculates the x-points of separation between the different words of a line indicated by start_index and
-        end_index. It returns a complex structure. Is composed by a list of three-element lists. Each of these
-        three-element lists represents an x-value in the line, the word that is immediately after the x-point and a
-        boolean that indicates if this word is part of a word with one or more BREAK_LINE_CHARACTERS. In the case of the
-        end of line, and empty string will be stored.
-        :param start_index: Index of the first word in the line in self.words_width structure.
-        :param end_index: Index of the last word in the line in self.words_width structure plus one.
-        :param break_line: True if the line is not justified (because of a "\n" character or because of the end of the
-                           document).
-        :param padding: The padding introduced by QGraphicsTextItem.
-        :param half_space: Half of what the character space occupies with the given font
-        :return: The complex structure described above.
-        """
-        line_width = padding / 2 + self.pos().x()
-        x_values_with_words = [
-            [
-                line_width,
-                _remove_text_format(self._words_width[start_index][1]),
-                (self._words_width[start_index - 1][2] if (start_index > 1) else False)
-            ]
-        ]
-        line_width += padding / 2 - half_space
-
-        sub_str_pos = []
-
-        for i in range(start_index, end_index):
-            # If current string is part of a string with BREAK_LINE_CHARACTERS and is not at the start of the line
-            if self._words_width[i - 1][2] and start_index != i:
-                line_width += self._words_width[i][0]
-
-                x_values_with_words[-1][0] += half_space
-
-                sub_str_pos.append(i - start_index)
-            else:
-                line_width += (self._words_width[i][0] + 2 * half_space)
+    def set_layout(self, layout: TextLayout) -> bool:
+        """
+        Apply to the paragraphs of this element the layout calculated by compute_text_layout(). The layout is rejected
+        if the text of the element has changed since the snapshot was taken. The font and the width of the snapshot are
+        applied too.
+        :param layout: The layout.
+        :return: True if the layout has been applied, False if it has been rejected.
+        """
+        if layout.snapshot.text != self._text:
+            return False
 
-            x_values_with_words.append(
-                [line_width, _remove_text_format(self._words_width[i + 1][1]), self._words_width[i][2]]
-            )
+        self._font = QFont(layout.snapshot.font)
+        self._text_width = layout.snapshot.text_width
+        for paragraph, paragraph_layout in zip(self._paragraphs, layout.paragraphs):
+            paragraph.set_layout(paragraph_layout, self._font, self._text_width)
+        self._stack_paragraphs()
+        return True
 
-        if self._words_width[end_index - 1][2]:
-            line_width += (self._words_width[end_index][0] - half_space + padding)
-            sub_str_pos.append(end_index)
+    def get_cache_info(self) -> dict[str, tuple[int, int, int]]:
+        """
+        Return the statistics of the caches used by this element. Useful to check the hit rates while profiling.
+        :return: A dictionary with the name of the cache as key and a tuple of (hits, misses, current size) as value.
+        """
+        hits, misses, _, size = self._word_metrics.cache_info()
+        return {
+            "word_widths": (hits, misses, size),
+            "offsets": (self._offsets_hits, self._offsets_misses, len(self._offsets_cache))
+        }
+
+    def _get_cached_offsets(self, name: str, calibrate: Callable[[QFont], tuple[float, float]],
+                            font: QFont) -> tuple[float, float]:
+        """
+        Obtain the result of a calibration of the offsets for the given font and the line height of this element. The
+        calibration is only done if there is no stored result.
+        :param name: The name of the calibration.
+        :param calibrate: The function that does the calibration.
+        :param font: The font used to represent the text.
+        :return: The result of the calibration.
+        """
+        key = (name, font.key(), self._line_height)
+        offsets = self._offsets_cache.get(key)
+        if offsets is None:
+            self._offsets_misses += 1
+            offsets = calibrate(font)
+            self._offsets_cache[key] = offsets
+            if len(self._offsets_cache) > MAX_CACHED_OFFSETS:
+                self._offsets_cache.popitem(last=False)
         else:
-            line_width += (self._words_width[end_index][0] + half_space + padding)
-
-        # Adjust offsets to the justify line
-        if not break_line and end_index > start_index + len(sub_str_pos):
+            self._offsets_hits += 1
+            self._offsets_cache.move_to_end(key)
+        return offsets
 
-            # We obtain the remaining pixels that will be distributed among all the spaces to justify text, and we
-            # divide it by the number of spaces to know how much is left for each one
-            space_adjust = ((self.textWidth() - line_width + self.pos().x()) /
-                            (end_index - start_index - len(sub_str_pos)))
-
-            sub_str_offset = 1
-            # Add space_adjust to the x-points
-            for e in range(1, len(x_values_with_words)):
-                if e in sub_str_pos:
-                    sub_str_offset += 1
-                x_values_with_words[e][0] += (space_adjust / 2 + space_adjust * (e - sub_str_offset))
-
-            x_values_with_words.append(
-                [self.textWidth() - padding / 2 + self.pos().x(), "", self._words_width[end_index][2]]
-            )
-        else:
-            x_values_with_words.append([line_width, "", False])
+    def _get_separator_offsets_width(self, font: QFont) -> tuple[float, float]:
+        """
+        Return the result of _calibrate_separator_offsets_width() for the given font.
+        :param font: The font used to represent the text.
+        :return: Half of what the character space occupies with the given font and the padding introduced by
+                 QGraphicsTextItem.
+        """
+        return self._get_cached_offsets("width", self._calibrate_separator_offsets_width, font)
 
-        return x_values_with_words
+    def _get_separator_offsets_height(self, font: QFont) -> tuple[float, float]:
+        """
+        Return the result of _calibrate_separator_offsets_height() for the given font and the line height.
+        :param font: The font used to represent the text.
+        :return: The padding height introduced by QGraphicsTextItem and the height that occupies the text plus the
+                 padding height between line texts.
+        """
+        return self._get_cached_offsets("height", self._calibrate_separator_offsets_height, font)
 
-    def _get_separator_offsets_width(self) -> tuple[float, float]:
+    def _calibrate_separator_offsets_width(self, font: QFont) -> tuple[float, float]:
         """
         This function gets the width in pixels of what would occupy half of what the space character occupies with the
         given font. In addition, it also gets the width in pixels of the padding introduced by the QGraphicsTextItem
@@ -376,13 +811,15 @@ class MainText(QGraphicsTextItem):
             - padding + space + space + padding = len_text2
         Those values will be used to place the text separators
 
+        :param font: The font used to represent the text.
         :return: Half of what the character space occupies with the given font and the padding introduced by
                  QGraphicsTextItem.
         """
-        self._aux_text_item.setPlainText(" ")
-        len_text1 = self._aux_text_item.boundingRect().width()
-        self._aux_text_item.setPlainText("  ")
-        len_text2 = self._aux_text_item.boundingRect().width()
+        self._aux_document.setDefaultFont(font)
+        self._aux_document.setPlainText(" ")
+        len_text1 = self._aux_document.size().width()
+        self._aux_document.setPlainText("  ")
+        len_text2 = self._aux_document.size().width()
 
         # Resolve the system of equations
         space = len_text2 - len_text1
@@ -390,7 +827,7 @@ class MainText(QGraphicsTextItem):
 
         return space / 2, padding
 
-    def _get_separator_offsets_height(self) -> tuple[float, float]:
+    def _calibrate_separator_offsets_height(self, font: QFont) -> tuple[float, float]:
         """
         This function gets the height in pixels of the height of the strip used to represent the text with the given
         font plus the line spacing. In addition, it also gets the height in pixels of the padding introduced by the
@@ -399,17 +836,19 @@ class MainText(QGraphicsTextItem):
             - padding + strip + line_spacing + strip + line_spacing + padding = height_2
         Those values will be used to place the text separators
 
+        :param font: The font used to represent the text.
         :return: The padding height introduced by QGraphicsTextItem and the height that occupies the text plus the
                  padding height between line texts.
         """
+        self._aux_document.setDefaultFont(font)
 
-        self._aux_text_item.setHtml('<p align="justify" style="line-height:' + str(self._line_height) + '%">Test</p>')
-        height_1 = self._aux_text_item.boundingRect().height()
+        self._aux_document.setHtml('<p align="justify" style="line-height:' + str(self._line_height) + '%">Test</p>')
+        height_1 = self._aux_document.size().height()
 
-        self._aux_text_item.setHtml(
+        self._aux_document.setHtml(
             '<p align="justify" style="line-height:' + str(self._line_height) + '%">Test<br>Test</p>'
         )
-        height_2 = self._aux_text_item.boundingRect().height()
+        height_2 = self._aux_document.size().height()
 
         # Resolve the system of equations
         strip_plus_line_spacing = height_2 - height_1
@@ -422,5 +861,7 @@ class MainText(QGraphicsTextItem):
         Set text with a given font.
         :param font: The font object
         """
-        super().setFont(font)
-        self._set_text(self._text)
+        self._font = QFont(font)
+        for paragraph in self._paragraphs:
+            paragraph.setFont(self._font)
+        self._stack_paragraphs()
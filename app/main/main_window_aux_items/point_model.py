@@ -0,0 +1,373 @@
+import numpy as np
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """
+    Mark a NumPy array as non-writeable. The arrays of PointModel are shared between all the consumers, so none of
+    them should be able to modify the data.
+    :param array: The array.
+    :return: The same array.
+    """
+    array.flags.writeable = False
+    return array
+
+
+def _count_chunks(text: str) -> int:
+    """
+    Count the chunks of a text in the same way that MainText splits it in words: the chunks separated by white space
+    characters plus a chunk per break line, even if the break line is not surrounded by spaces.
+    :param text: The text.
+    :return: The number of chunks.
+    """
+    return len(text.split()) + text.count("\n")
+
+
+def _count_edge_breaks(text: str) -> tuple[int, int]:
+    """
+    Count the break lines at the start and at the end of a text. Some tools, like the sentence splitter, remove them.
+    :param text: The text.
+    :return: A tuple of (break lines before the first word, break lines after the last word).
+    """
+    words = text.strip()
+    if words == "":
+        return text.count("\n"), 0
+    start = text.find(words)
+    return text[:start].count("\n"), text[start + len(words):].count("\n")
+
+
+class PointModel:
+    """
+    This class stores the points of separation between the words of the text calculated by MainText. The points are
+    stored in parallel NumPy arrays sorted in reading order (from up to down and from left to right), so a single object
+    can be shared between all the consumers, that will only obtain views of it:
+        - x: The x-value of each point.
+        - ignored: True if the separators can't be released in the point because the word after it is part of a word
+          with one or more BREAK_LINE_CHARACTERS.
+        - words: The text that is immediately after the point. In the case of an end of line, the text will be an empty
+          string followed by one "\n" per break line.
+        - word_indexes: The index of the first non-empty text at or after the point. The sequence of non-empty texts
+          (the words of the model) doesn't depend on the line breaks, so this index can be used to anchor an element to
+          a position of the text that survives a re-layout.
+        - word_points: The index of the point of each word plus the index of the last point.
+        - y: The y-value of each line.
+        - line_starts: The index of the first point of each line. The last element is the number of points.
+    All the arrays are read-only.
+    """
+    x: np.ndarray
+    ignored: np.ndarray
+    words: np.ndarray
+    word_indexes: np.ndarray
+    word_points: np.ndarray
+    y: np.ndarray
+    line_starts: np.ndarray
+
+    def __init__(self, x: np.ndarray, ignored: np.ndarray, words: np.ndarray, word_indexes: np.ndarray,
+                 word_points: np.ndarray, y: np.ndarray, line_starts: np.ndarray) -> None:
+        """
+        Create PointModel object. The arrays won't be copied, so they shouldn't be modified after calling this function.
+        :param x: The x-value of each point.
+        :param ignored: The sub-word flag of each point.
+        :param words: The text after each point.
+        :param word_indexes: The index of the first word at or after each point.
+        :param word_points: The index of the point of each word plus the index of the last point.
+        :param y: The y-value of each line.
+        :param line_starts: The index of the first point of each line plus the number of points.
+        """
+        self.x = _read_only(x)
+        self.ignored = _read_only(ignored)
+        self.words = _read_only(words)
+        self.word_indexes = _read_only(word_indexes)
+        self.word_points = _read_only(word_points)
+        self.y = _read_only(y)
+        self.line_starts = _read_only(line_starts)
+        self._word_texts = None
+
+    def __len__(self) -> int:
+        """
+        Return the number of points.
+        :return: The number of points.
+        """
+        return len(self.x)
+
+    def word_count(self) -> int:
+        """
+        Return the number of words (non-empty texts) of the model.
+        :return: The number of words.
+        """
+        return len(self.word_points) - 1
+
+    def line_count(self) -> int:
+        """
+        Return the number of lines.
+        :return: The number of lines.
+        """
+        return len(self.y)
+
+    def line_x(self, line: int) -> np.ndarray:
+        """
+        Obtain the x-values of a line.
+        :param line: The index of the line.
+        :return: A read-only view with the x-values.
+        """
+        return self.x[self.line_starts[line]:self.line_starts[line + 1]]
+
+    def line_ignored(self, line: int) -> np.ndarray:
+        """
+        Obtain the sub-word flags of a line.
+        :param line: The index of the line.
+        :return: A read-only view with the flags.
+        """
+        return self.ignored[self.line_starts[line]:self.line_starts[line + 1]]
+
+    def line_of(self, y: float) -> int:
+        """
+        Find the line whose y-value is exactly the given one.
+        :param y: The y-value.
+        :return: The index of the line or -1 if there is no line with this y-value.
+        """
+        line = int(np.searchsorted(self.y, y))
+        if line < len(self.y) and self.y[line] == y:
+            return line
+        return -1
+
+    def line_of_point(self, index: int) -> int:
+        """
+        Find the line that contains a point.
+        :param index: The index of the point.
+        :return: The index of the line.
+        """
+        return int(np.searchsorted(self.line_starts, index, side="right")) - 1
+
+    def first_point(self) -> tuple[float, float]:
+        """
+        Return the first point of the text.
+        :return: The x and y values of the point.
+        """
+        return float(self.x[0]), float(self.y[0])
+
+    def last_point(self) -> tuple[float, float]:
+        """
+        Return the last point of the text.
+        :return: The x and y values of the point.
+        """
+        return float(self.x[-1]), float(self.y[-1])
+
+    def get_point(self, index: int) -> tuple[float, float]:
+        """
+        Return a point of the text.
+        :param index: The index of the point.
+        :return: The x and y values of the point.
+        """
+        return float(self.x[index]), float(self.y[self.line_of_point(index)])
+
+    def is_line_end(self, index: int) -> bool:
+        """
+        Check if a point is the last point of a line that is not the last line.
+        :param index: The index of the point.
+        :return: True if the point is the end of a line followed by another line.
+        """
+        line = self.line_of_point(index)
+        return line < len(self.y) - 1 and index == self.line_starts[line + 1] - 1
+
+    def get_limit_points(self) -> list[tuple[float, tuple[float, float]]]:
+        """
+        Obtain the limit x-values of each line with its y-value.
+        :return: The limit points.
+        """
+        return list(zip(
+            self.y.tolist(),
+            zip(self.x[self.line_starts[:-1]].tolist(), self.x[self.line_starts[1:] - 1].tolist())
+        ))
+
+    def get_word_points(self, word_indexes: list[int]) -> list[tuple[float, float]]:
+        """
+        Obtain the coordinates of the points placed immediately before the given words. The index word_count() is
+        allowed and represents the last point of the text.
+        :param word_indexes: The indexes of the words.
+        :return: The x and y values of each point.
+        """
+        points = self.word_points[np.asarray(word_indexes, dtype=np.intp)]
+        lines = np.searchsorted(self.line_starts, points, side="right") - 1
+        return list(zip(self.x[points].tolist(), self.y[lines].tolist()))
+
+    def get_word_point_spans(self, word_indexes: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Obtain the first and the last points occupied by an element placed immediately before each one of the given
+        words. They are the same point unless the point is on the border of a line: the beginning of a line also
+        occupies the end of the previous one and the end of a line also occupies the beginning of the next one.
+        :param word_indexes: The indexes of the words.
+        :return: An array with the index of the first point and another one with the index of the last point.
+        """
+        points = self.word_points[np.asarray(word_indexes, dtype=np.intp)]
+        lines = np.searchsorted(self.line_starts, points, side="right") - 1
+        left_border = (lines > 0) & (points == self.line_starts[lines])
+        right_border = ~left_border & (lines < len(self.y) - 1) & (points == self.line_starts[lines + 1] - 1)
+        return points - left_border, points + right_border
+
+    def _get_word_texts(self) -> np.ndarray:
+        """
+        Obtain the words of the model in the format used to join them: the words that are part of a word with one or
+        more BREAK_LINE_CHARACTERS are joined directly and the rest of them are preceded by a space character.
+        :return: An array with the text of each word.
+        """
+        if self._word_texts is None:
+            points = self.word_points[:-1]
+            texts = np.empty(len(points), dtype=object)
+            texts[:] = [word if ignored else " " + word for word, ignored in
+                        zip(self.words[points].tolist(), self.ignored[points].tolist())]
+            self._word_texts = _read_only(texts)
+        return self._word_texts
+
+    def get_texts(self, word_indexes: list[int]) -> list[str]:
+        """
+        Obtain the groups of words formed by dividing the text in the given words.
+        :param word_indexes: The sorted indexes of the words where each group of words starts. The first group, that
+                             starts in the first word, is not included.
+        :return: A list with a group of words per element.
+        """
+        word_texts = self._get_word_texts()
+        limits = [0] + list(word_indexes) + [self.word_count()]
+        result = []
+        for i in range(len(limits) - 1):
+            text = "".join(word_texts[limits[i]:limits[i + 1]])
+            result.append(text[1:] if text[:1] == " " else text)
+        return result
+
+    def get_word_indexes_of_texts(self, texts: list[str]) -> list[int]:
+        """
+        Find the words where each one of the given groups of words starts. The groups of words must form the text of
+        this model when they are joined with spaces. Only the number of chunks of each group, as counted by
+        _count_chunks(), is considered, so the groups can have different spacing than the text of the model. If the
+        groups don't form the text of the model, a RuntimeError is raised. Only the number of break lines at the start
+        and at the end of the text can be different.
+        :param texts: A list with a group of words per element.
+        :return: The index of the word where each group starts, without the first group.
+        """
+        word_texts = self._get_word_texts()
+        ignored = self.ignored[self.word_points[:-1]]
+
+        # Index of the first chunk of each word. The words that are part of a word with one or more
+        # BREAK_LINE_CHARACTERS continue the chunk of the previous word, so they can't start a group
+        new_chunks = np.array([_count_chunks(text) for text in word_texts.tolist()], dtype=np.intp) - ignored
+        first_chunks = np.cumsum(new_chunks) - new_chunks
+        starts = np.flatnonzero(~ignored)
+
+        leading, trailing = _count_edge_breaks("".join(word_texts.tolist()))
+        group_leading = _count_edge_breaks(texts[0])[0]
+        group_trailing = _count_edge_breaks(texts[-1])[1]
+
+        group_chunks = [_count_chunks(text) for text in texts]
+        text_chunks = int(np.sum(new_chunks)) - leading - trailing
+        if sum(group_chunks) - group_leading - group_trailing != text_chunks:
+            raise RuntimeError(
+                "The groups of words have " + str(sum(group_chunks) - group_leading - group_trailing) +
+                " chunks but the text has " + str(text_chunks)
+            )
+
+        # Each group must start in the first chunk of a word
+        start_chunks = first_chunks[starts]
+        group_first_chunks = np.cumsum(group_chunks[:-1], dtype=np.intp) + (leading - group_leading)
+        positions = np.searchsorted(start_chunks, group_first_chunks)
+        if np.any(positions == len(starts)) or \
+                np.any(start_chunks[np.minimum(positions, len(starts) - 1)] != group_first_chunks):
+            raise RuntimeError("A group of words doesn't start in a word of the text")
+        return starts[positions].tolist()
+
+    def _point_index(self, x: float, y: float, after: bool) -> int:
+        """
+        Find the position that a point would occupy in the arrays of this model.
+        :param x: The x coordinate of the point.
+        :param y: The y coordinate of the point.
+        :param after: If True, the returned index will be the index of the first point after the given one. If False,
+                      the returned index will be the index of the first point that is not before the given one.
+        :return: The index.
+        """
+        line = int(np.searchsorted(self.y, y))
+        if line == len(self.y):
+            return len(self.x)
+        if self.y[line] != y:
+            return int(self.line_starts[line])
+        return int(self.line_starts[line] + np.searchsorted(self.line_x(line), x, side="right" if after else "left"))
+
+    def index_of(self, x: float, y: float) -> int:
+        """
+        Find the index of a point of this model from its coordinates. The coordinates should be the exact ones of the
+        point, as they are obtained from the arrays of the model.
+        :param x: The x coordinate of the point.
+        :param y: The y coordinate of the point.
+        :return: The index of the point.
+        """
+        return self._point_index(x, y, False)
+
+
+class PointModelBuilder:
+    """
+    This class is used to create a PointModel line by line. The points are stored in flat lists and converted to NumPy
+    arrays only once, when build() is called.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create PointModelBuilder object.
+        """
+        self._x = []
+        self._ignored = []
+        self._words = []
+        self._y = []
+        self._line_starts = []
+
+    def is_empty(self) -> bool:
+        """
+        Check if there is any line added.
+        :return: True if there are no lines.
+        """
+        return len(self._y) == 0
+
+    def add_line(self, y: float) -> None:
+        """
+        Start a new line. The next added points will belong to it.
+        :param y: The y-value of the line.
+        """
+        self._y.append(y)
+        self._line_starts.append(len(self._x))
+
+    def add_point(self, x: float, word: str, ignored: bool) -> None:
+        """
+        Add a point at the end of the current line.
+        :param x: The x-value of the point.
+        :param word: The text that is immediately after the point.
+        :param ignored: True if the word is part of a word with one or more BREAK_LINE_CHARACTERS.
+        """
+        self._x.append(x)
+        self._words.append(word)
+        self._ignored.append(ignored)
+
+    def append_to_last_word(self, text: str) -> None:
+        """
+        Append text to the word of the last added point. Used to represent the break lines.
+        :param text: The text to append.
+        """
+        self._words[-1] += text
+
+    def build(self) -> PointModel:
+        """
+        Create the PointModel with all the added points.
+        :return: The model.
+        """
+        words = np.empty(len(self._words), dtype=object)
+        words[:] = self._words
+
+        # The last point of the text represents the end of the last word
+        is_word = words != ""
+        word_points = np.append(np.flatnonzero(is_word), len(words) - 1)
+        word_indexes = np.cumsum(is_word) - is_word
+
+        return PointModel(
+            np.array(self._x, dtype=float),
+            np.array(self._ignored, dtype=bool),
+            words,
+            word_indexes,
+            word_points,
+            np.array(self._y, dtype=float),
+            np.array(self._line_starts + [len(self._x)], dtype=np.intp)
+        )
@@ -0,0 +1,62 @@
+from PyQt5.QtCore import QThread
+
+from .classifier import ClassifierLayout, ClassifierLayoutSnapshot, compute_classifier_layout
+
+
+class RelayoutWorker(QThread):
+    """
+    This class calculates in a thread other than the GUI thread the layout of a Classifier from a snapshot. When the
+    calculation ends, the finished signal is emitted and the result can be obtained with get_layout(), so it can be
+    applied in the GUI thread with Classifier.apply_layout(). If the worker is cancelled, the calculation stops as soon
+    as possible and there is no result. The worker has no parent, so its owner must keep a reference to it and wait for
+    it before releasing it.
+    """
+
+    def __init__(self, snapshot: ClassifierLayoutSnapshot) -> None:
+        """
+        Create RelayoutWorker object. The calculation starts when start() is called.
+        :param snapshot: The snapshot obtained with Classifier.get_layout_snapshot().
+        """
+        super().__init__()
+        self._snapshot = snapshot
+        self._cancelled = False
+        self._layout = None
+
+    def cancel(self) -> None:
+        """
+        Request the calculation to stop. get_layout() will return None after this call.
+        """
+        self._cancelled = True
+        self.requestInterruption()
+
+    def stop(self) -> None:
+        """
+        Cancel the calculation and wait for the thread to end, so the worker can be released. The calculation checks
+        the cancellation between lines, so the wait is short.
+        """
+        self.cancel()
+        self.wait()
+
+    def is_cancelled(self) -> bool:
+        """
+        Check if the worker has been cancelled.
+        :return: True if cancel() has been called, False otherwise.
+        """
+        return self._cancelled
+
+    def get_layout(self) -> ClassifierLayout | None:
+        """
+        Return the result of the calculation. Should be called after the finished signal has been emitted.
+        :return: The layout or None if the worker has been cancelled or the calculation hasn't finished.
+        """
+        if self._cancelled:
+            return None
+        return self._layout
+
+    def run(self) -> None:
+        """
+        Calculate the layout and store it if the worker has not been cancelled.
+        """
+        layout = compute_classifier_layout(self._snapshot, self.is_cancelled)
+        if not self._cancelled:
+            self._layout = layout
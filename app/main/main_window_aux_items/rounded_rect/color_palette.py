@@ -0,0 +1,53 @@
+from PyQt5.QtGui import QBrush, QColor
+
+
+class ColorPalette:
+    """
+    This class turns the colors of the RoundedRects into an indexed list of brushes. The brushes are created once per
+    configuration and shared by all the RoundedRects, that only store the index of their color, so changing the colors
+    doesn't create any object per RoundedRect.
+    """
+    _brushes: list[QBrush]
+    _indexes: dict[str, int]
+
+    def __init__(self, colors: dict[str, str]) -> None:
+        """
+        Create ColorPalette object.
+        :param colors: The colors, as a dictionary with the specific value of associated Descriptor as the key, and the
+                       color itself as the value. The first color is the default one.
+        """
+        self._brushes = []
+        self._indexes = {}
+        self.set_colors(colors)
+
+    def set_colors(self, colors: dict[str, str]) -> None:
+        """
+        Create again the brushes from a new dictionary of colors.
+        :param colors: The colors, as a dictionary with the specific value of associated Descriptor as the key, and the
+                       color itself as the value. The first color is the default one.
+        """
+        self._brushes = [QBrush(QColor(color)) for color in colors.values()]
+        self._indexes = {key: index for index, key in enumerate(colors.keys())}
+
+    def __len__(self) -> int:
+        """
+        Return the number of colors.
+        :return: The number of colors.
+        """
+        return len(self._brushes)
+
+    def brush(self, index: int) -> QBrush:
+        """
+        Return the shared brush of a color.
+        :param index: The index of the color.
+        :return: The brush.
+        """
+        return self._brushes[index]
+
+    def index_of(self, key: str) -> int:
+        """
+        Return the index of the color associated with a value of the Descriptor.
+        :param key: The value of the Descriptor.
+        :return: The index of the color or 0, the default color, if there is no color for this value.
+        """
+        return self._indexes.get(key, 0)
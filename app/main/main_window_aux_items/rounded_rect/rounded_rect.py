@@ -1,18 +1,20 @@
 import typing
 
 from PyQt5 import QtGui
-from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QWidget, QGraphicsItem, QGraphicsRectItem, QStyleOptionGraphicsItem
 
+from .color_palette import ColorPalette
+
 
 class RoundedRect(QGraphicsRectItem):
     """
     This class represents a QGraphicsRectItem with rounded corners. This class also has methods to set and obtain the
-    background color. When the width is 0, the class paints nothing.
+    background color, that is stored as an index of a ColorPalette shared by all the RoundedRects. When the width is 0,
+    the class paints nothing.
     """
 
     def __init__(self, x: float | int, y: float | int, width: float | int, height: float | int, radius: float | int,
-                 parent: QGraphicsItem) -> None:
+                 parent: QGraphicsItem, palette: ColorPalette, color_index: int = 0) -> None:
         """
         Create RoundedRect object.
         :param x: The x-position of the rectangle
@@ -21,26 +23,31 @@ class RoundedRect(QGraphicsRectItem):
         :param height: The height of the rectangle.
         :param radius: The radius of the rounded corners.
         :param parent: The QGraphicsItem parent of this Separator. Can't be None
+        :param palette: The palette with the background colors.
+        :param color_index: The index of the background color in the palette.
         """
         super().__init__(0, 0, width, height, parent)
         self.setPos(x, y)
         self._radius = radius
+        self._palette = palette
+        self._color_index = color_index
         self.setFlag(QGraphicsItem.ItemIgnoresParentOpacity)
 
-    def set_background_color(self, color: str) -> None:
+    def set_background_color(self, color_index: int) -> None:
         """
         Set the rectangle background color.
-        :param color: The color as string. Should be a valid HTML color.
+        :param color_index: The index of the color in the palette.
         """
-        self.setBrush(QColor(color))
-        self.update()
+        if color_index != self._color_index:
+            self._color_index = color_index
+            self.update()
 
-    def get_background_color(self) -> str:
+    def get_background_color(self) -> int:
         """
         Return the rectangle background color.
-        :return: The color as string. Is a valid HTML color.
+        :return: The index of the color in the palette.
         """
-        return self.brush().color()
+        return self._color_index
 
     def set_radius(self, radius: float) -> None:
         """
@@ -71,5 +78,5 @@ class RoundedRect(QGraphicsRectItem):
         :param widget: This parameter will be ignored
         """
         if self.rect().width() != 0:
-            painter.setBrush(self.brush())
+            painter.setBrush(self._palette.brush(self._color_index))
             painter.drawRoundedRect(self.boundingRect(), self._radius, self._radius)
@@ -0,0 +1,229 @@
+import bisect
+import typing
+
+from PyQt5 import QtGui
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QPainterPath
+from PyQt5.QtWidgets import QWidget, QGraphicsItem, QStyleOptionGraphicsItem
+
+from .color_palette import ColorPalette
+
+# The maximum number of cached paths. When it is reached, the cache is emptied
+_MAX_CACHED_PATHS = 1024
+
+# The RoundedRects are painted over their bounding rect, which includes half of the width of the default pen
+_PEN_MARGIN = 0.5
+
+
+class BatchedRoundedRect:
+    """
+    This class stores the geometry and the background color of a rounded rect painted by a RoundedRectBatch. It has the
+    same interface as RoundedRect, so RoundedRectHandler can use both, but it isn't a QGraphicsItem, so the scene
+    doesn't index it. When it changes, it asks the RoundedRectBatch to repaint and to widen its bounds if it is outside
+    them.
+    """
+    __slots__ = ("_pos", "_rect", "_color_index", "_batch")
+
+    def __init__(self, x: float | int, y: float | int, width: float | int, height: float | int,
+                 batch: "RoundedRectBatch", color_index: int = 0) -> None:
+        """
+        Create BatchedRoundedRect object.
+        :param x: The x-position of the rectangle
+        :param y: The y-position of the rectangle
+        :param width: The width of this element.
+        :param height: The height of the rectangle.
+        :param batch: The RoundedRectBatch that paints this rectangle.
+        :param color_index: The index of the background color in the palette.
+        """
+        self._pos = QPointF(x, y)
+        self._rect = QRectF(0, 0, width, height)
+        self._color_index = color_index
+        self._batch = batch
+        self._batch.include(self)
+
+    def pos(self) -> QPointF:
+        """
+        Return the position of the rectangle.
+        :return: The position.
+        """
+        return self._pos
+
+    def rect(self) -> QRectF:
+        """
+        Return the size of the rectangle as a QRectF whose top left corner is (0, 0).
+        :return: The rect.
+        """
+        return self._rect
+
+    def set_background_color(self, color_index: int) -> None:
+        """
+        Set the rectangle background color.
+        :param color_index: The index of the color in the palette.
+        """
+        if color_index != self._color_index:
+            self._color_index = color_index
+            self._batch.update()
+
+    def get_background_color(self) -> int:
+        """
+        Return the rectangle background color.
+        :return: The index of the color in the palette.
+        """
+        return self._color_index
+
+    def set_radius(self, radius: float) -> None:
+        """
+        Does nothing, the radius is the same for all the rectangles of the RoundedRectBatch.
+        :param radius: The radius in pixels
+        """
+        pass
+
+    def set_pos_and_size(self, x: float | int, y: float | int, width: float | int, height: float | int):
+        """
+        Set the position and the size of the rounded rect.
+        :param x: The x-position of the rectangle.
+        :param y: The y-position of the rectangle.
+        :param width: The width of this element.
+        :param height: The height of the rectangle.
+        """
+        self._pos = QPointF(x, y)
+        self._rect = QRectF(0, 0, width, height)
+        self._batch.include(self)
+
+
+def _get_y(rect: BatchedRoundedRect) -> float:
+    """
+    Return the y-position of a rectangle. Used as the key of the binary searches.
+    :param rect: The rectangle.
+    :return: The y-position.
+    """
+    return rect.pos().y()
+
+
+class RoundedRectBatch(QGraphicsItem):
+    """
+    This class paints all the BatchedRoundedRects of a RoundedRectHandler, so the scene holds a single item instead of
+    an item per line of each group of rounded rects. The rectangles are sorted in reading order, so only the ones that
+    intersect the exposed area are painted, and the rounded paths are cached by width, height and radius.
+    """
+    _rects: list[BatchedRoundedRect]
+    _paths: dict[tuple[float, float, float], QPainterPath]
+
+    def __init__(self, rects: list[BatchedRoundedRect], radius: float | int, palette: ColorPalette,
+                 parent: QGraphicsItem) -> None:
+        """
+        Create RoundedRectBatch object.
+        :param rects: The list of rectangles. It is shared with the RoundedRectHandler, that keeps it sorted in reading
+                      order.
+        :param radius: The radius of the rounded corners.
+        :param palette: The palette with the background colors.
+        :param parent: The QGraphicsItem parent of this element. Can't be None
+        """
+        super().__init__(parent)
+        self._rects = rects
+        self._radius = radius
+        self._palette = palette
+        self._paths = {}
+        self._bounds = QRectF()
+        self.setFlag(QGraphicsItem.ItemIgnoresParentOpacity)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+
+    def set_radius(self, radius: float) -> None:
+        """
+        Set the radius of all the rounded rects.
+        :param radius: The radius in pixels
+        """
+        self._radius = radius
+        self._paths.clear()
+        self.update()
+
+    def refresh_bounds(self) -> None:
+        """
+        Compute again the area that contains all the rectangles. Should be called after the rectangles have been
+        created, moved or removed in bulk.
+        """
+        if len(self._rects) == 0:
+            bounds = QRectF()
+        else:
+            left = min(rect.pos().x() for rect in self._rects)
+            right = max(rect.pos().x() + rect.rect().width() for rect in self._rects)
+            top = self._rects[0].pos().y()
+            bottom = self._rects[-1].pos().y() + self._rects[-1].rect().height()
+            bounds = QRectF(left, top, right - left, bottom - top).adjusted(
+                -_PEN_MARGIN, -_PEN_MARGIN, _PEN_MARGIN, _PEN_MARGIN
+            )
+
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+
+    def include(self, rect: BatchedRoundedRect) -> None:
+        """
+        Widen the area that contains all the rectangles, if needed, so it contains a rectangle that has been created or
+        moved, and repaint the batch. The area isn't narrowed until refresh_bounds() is called.
+        :param rect: The rectangle.
+        """
+        area = rect.rect().translated(rect.pos()).adjusted(-_PEN_MARGIN, -_PEN_MARGIN, _PEN_MARGIN, _PEN_MARGIN)
+        if not self._bounds.contains(area):
+            self.prepareGeometryChange()
+            self._bounds = self._bounds.united(area)
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        """
+        Return the area that contains all the rectangles.
+        :return: The area.
+        """
+        return self._bounds
+
+    def _get_path(self, width: float, height: float) -> QPainterPath:
+        """
+        Return the rounded path of a rectangle whose top left corner is (0, 0).
+        :param width: The width of the rectangle.
+        :param height: The height of the rectangle.
+        :return: The path.
+        """
+        key = (width, height, self._radius)
+        path = self._paths.get(key)
+        if path is None:
+            if len(self._paths) >= _MAX_CACHED_PATHS:
+                self._paths.clear()
+            path = QPainterPath()
+            path.addRoundedRect(
+                QRectF(-_PEN_MARGIN, -_PEN_MARGIN, width + 2 * _PEN_MARGIN, height + 2 * _PEN_MARGIN),
+                self._radius,
+                self._radius
+            )
+            self._paths[key] = path
+        return path
+
+    def paint(self,
+              painter: QtGui.QPainter,
+              option: QStyleOptionGraphicsItem,
+              widget: typing.Optional[QWidget] = ...) -> None:
+        """
+        Paints the rectangles that intersect the exposed area.
+        :param painter: The object to paint the rectangles in the _canvas
+        :param option: The exposed area is obtained from this parameter.
+        :param widget: This parameter will be ignored
+        """
+        if len(self._rects) == 0:
+            return
+
+        exposed = option.exposedRect
+        start = bisect.bisect_left(
+            self._rects, exposed.top() - self._rects[0].rect().height() - _PEN_MARGIN, key=_get_y
+        )
+        end = bisect.bisect_right(self._rects, exposed.bottom() + _PEN_MARGIN, lo=start, key=_get_y)
+
+        for i in range(start, end):
+            rect = self._rects[i]
+            size = rect.rect()
+            if size.width() != 0:
+                pos = rect.pos()
+                painter.setBrush(self._palette.brush(rect.get_background_color()))
+                painter.translate(pos)
+                painter.drawPath(self._get_path(size.width(), size.height()))
+                painter.translate(-pos)
@@ -1,13 +1,18 @@
 import typing
 
-from ..separator.separator import Separator
+from ..separator.group_boundaries import GroupBoundaries
+from ..separator.separator import SeparatorRecord
+from ..segment_model import SegmentModel
 
 from PyQt5.QtCore import QPointF
 from PyQt5.QtWidgets import QGraphicsItem
+from .color_palette import ColorPalette
 from .rounded_rect import RoundedRect
+from .rounded_rect_batch import BatchedRoundedRect, RoundedRectBatch
+from ..viewport_culler import ViewportCuller
 
 
-def _exponentialSearchRects(exp_list: list[RoundedRect], wanted_pos: QPointF) -> int:
+def _exponentialSearchRects(exp_list: list[RoundedRect | BatchedRoundedRect], wanted_pos: QPointF) -> int:
     """
     Finds the rect that has the position wanted_pos using an exponential search.
     :param exp_list: The list of all rects to search for.
@@ -49,16 +54,19 @@ class RoundedRectHandler:
     """
     This class handles the position, the size and the background color of all the RoundedRect. All the RoundedRect
     between two Separators are considered a group of RoundedRect and this class ensures that they always have the same
-    background color.
+    background color. The colors are kept in a ColorPalette shared by all the RoundedRects, so they only store the index
+    of their color. In batched mode, the rounded rects aren't QGraphicsItems but BatchedRoundedRects painted by a single
+    RoundedRectBatch.
     """
-    _rects: list[RoundedRect]
-    _separators: list[list[Separator | int | QPointF]]
-    _colors: dict[str, str]
+    _rects: list[RoundedRect | BatchedRoundedRect]
+    _batch: RoundedRectBatch | None
+    _separators: GroupBoundaries
+    _palette: ColorPalette
     _color_indexes: list[int]
 
     def __init__(self, height: float | int, radius: float | int,
                  points: list[tuple[float | int, tuple[float | int, float | int]]], colors: dict[str, str],
-                 parent: QGraphicsItem) -> None:
+                 parent: QGraphicsItem, batched: bool = False) -> None:
         """
         Create RoundedRectHandler object.
         :param height: The height of the rectangles
@@ -69,20 +77,28 @@ class RoundedRectHandler:
         :param colors: The colors, as a dictionary with the specific value of associated Descriptor as the key, and the
                        color itself as the value.
         :param parent: The QGraphicsItem parent of this Separator. Can't be None
+        :param batched: If True, all the rounded rects are painted by a single QGraphicsItem.
         """
         self._height = height
         self._radius = radius
         self._parent = parent
-        self._rects: list[RoundedRect] = []
+        self._rects = []
+        self._culler = ViewportCuller(parent)
         self._last_created_separator_index = 0
+        self._palette = ColorPalette(colors)
+
+        if batched:
+            self._batch = RoundedRectBatch(self._rects, radius, self._palette, parent)
+        else:
+            self._batch = None
 
         for line in points:
-            self._rects.append(RoundedRect(line[1][0], line[0], line[1][1] - line[1][0], height, radius, parent))
+            self._rects.append(self._create_rect(line[1][0], line[0], line[1][1] - line[1][0]))
+        self._refresh_bounds()
 
-        self._separators = []
+        self._separators = GroupBoundaries()
 
         self._color_indexes = [0]
-        self._colors = colors
         self._editable_text_changed_slot(-1, [])
 
     def add_separator_listeners(self, created: typing.Any, pos_changed_fn: typing.Any, clicked_on_the_border_fn: typing.Any,
@@ -115,178 +131,128 @@ class RoundedRectHandler:
         """
         self._height = height
         self._radius = radius
+        if self._batch is not None:
+            self._batch.set_radius(radius)
         for rect in self._rects:
             rect.set_radius(radius)
             rect.set_pos_and_size(rect.pos().x(), rect.pos().y(), rect.rect().width(), self._height)
+        self._refresh_bounds()
 
-    def _set_points_for_new_text(self, points: list[tuple[float, tuple[float, float]]], color: str) -> None:
+    def set_visible_area(self, area: tuple[float, float] | None) -> None:
         """
-        Set the position and the size for the RoundedRect when the text is new.
-        :param points: A list of points to correctly set the position and the size of the rounded rect. Each element is
-                       a tuple of (Y-value, (X-left, X-Right)) where the x-value of the rounded rect is X-left and the
-                       width of the specific rounded rect is X-Right - X-left.
-        :param color: The default color that will have all the RoundedRect.
+        Set the area of the view where the RoundedRects should be in the scene. Only the RoundedRects inside this area
+        are kept in the scene, the rest of them are detached from it until the area reaches them.
+        :param area: A tuple of (top, bottom) y-values or None to keep all the RoundedRects in the scene.
         """
-        if len(points) > len(self._rects):  # We need to create more rects
-            i = 0
-            for i in range(len(self._rects)):
-                self._rects[i].set_pos_and_size(
-                    points[i][1][0],
-                    points[i][0],
-                    points[i][1][1] - points[i][1][0],
-                    self._height
-                )
-                self._rects[i].set_background_color(color)
-            for e in range(i + 1, len(points)):
-                self._rects.append(RoundedRect(
-                    points[e][1][0], points[e][0],
-                    points[e][1][1] - points[e][1][0],
-                    self._height,
-                    self._radius,
-                    self._parent)
-                )
-                self._rects[e].set_background_color(color)
-        else:  # We need to delete part of existing rects
-            i = 0
-            for i in range(len(points)):
-                self._rects[i].set_pos_and_size(
-                    points[i][1][0],
-                    points[i][0],
-                    points[i][1][1] - points[i][1][0],
-                    self._height
-                )
-                self._rects[i].set_background_color(color)
-            for _ in range(i + 1, len(self._rects)):
-                removed_rect = self._rects.pop()
-                self._parent.scene().removeItem(removed_rect)
+        self._culler.set_area(area)
+        self.update_visible_items(False)
+
+    def update_visible_items(self, full: bool = True) -> None:
+        """
+        Attach to the scene the RoundedRects inside the visible area and detach the rest. Should be called after the
+        RoundedRects have been created, moved or removed in bulk.
+        :param full: If False, only the RoundedRects attached in the previous update are checked to be detached.
+        """
+        if self._batch is not None:
+            # The RoundedRectBatch is always in the scene and only paints the exposed rounded rects
+            return
+        self._culler.update(self._rects, lambda rect: rect, lambda rect: rect.pos().y(), full)
+
+    def _create_rect(self, x: float, y: float, width: float) -> RoundedRect | BatchedRoundedRect:
+        """
+        Create a rounded rect with the default color, as a RoundedRect or as a BatchedRoundedRect in batched mode.
+        :param x: The x-position of the rectangle.
+        :param y: The y-position of the rectangle.
+        :param width: The width of the rectangle.
+        :return: The rounded rect.
+        """
+        if self._batch is not None:
+            return BatchedRoundedRect(x, y, width, self._height, self._batch)
+        return RoundedRect(x, y, width, self._height, self._radius, self._parent, self._palette)
+
+    def _remove_rect(self, rect: RoundedRect | BatchedRoundedRect) -> None:
+        """
+        Remove from the scene a rounded rect that is no longer used.
+        :param rect: The removed rounded rect.
+        """
+        if self._batch is not None:
+            self._batch.update()
+        else:
+            self._culler.remove_item(rect)
+
+    def _refresh_bounds(self) -> None:
+        """
+        Update the area painted by the RoundedRectBatch after the rounded rects have been created, moved or removed in
+        bulk. Only relevant in batched mode.
+        """
+        if self._batch is not None:
+            self._batch.refresh_bounds()
 
-    def set_points(self, points: list[tuple[float, tuple[float, float]]], separator_points: list[QPointF],
-                   new_text: bool) -> None:
+    def set_points(self, segments: SegmentModel, new_text: bool) -> None:
         """
         Set the position and the size for the RoundedRect.
-        :param points: A list of points to correctly set the position and the size of the rounded rect. Each element is
-                       a tuple of (Y-value, (X-left, X-Right)) where the x-value of the rounded rect is X-left and the
-                       width of the specific rounded rect is X-Right - X-left.
-        :param separator_points: A list with the separator positions. If the text is new, this list should be empty.
+        :param segments: The segments of the text, a RoundedRect per segment. If the text is new, the segments should be
+                         computed without separators.
         :param new_text: A boolean that indicates if the text is new.
         """
-
-        rects_colors_list = []
         if new_text:
             self._separators.clear()
-            rects_colors_list.append(self._colors[""])
+            rects_colors_list = [0]
         else:
-            if len(separator_points) != len(self._separators):
+            if len(segments.separator_points) != len(self._separators):
                 raise RuntimeError("There are not the same points as separators in set_points() function")
 
-            for sep in self._separators:
-                rects_colors_list.append(self._rects[sep[1]].get_background_color())
+            rects_colors_list = []
+            for i in range(len(self._separators)):
+                rects_colors_list.append(self._rects[self._separators.index(i)].get_background_color())
             rects_colors_list.append(self._rects[-1].get_background_color())
 
-        if len(separator_points) == 0:
-            self._set_points_for_new_text(points, rects_colors_list[0])
-        else:
-            self._set_points_with_separators(points, separator_points, rects_colors_list)
+        self._set_segments(segments, rects_colors_list)
+        self._refresh_bounds()
 
-    def _set_points_with_separators(self, points: list[tuple[float, tuple[float, float]]],
-                                    separator_points: list[QPointF], colors_list: list[str]) -> None:
+    def add_separators(self, segments: SegmentModel, separators: list[SeparatorRecord]) -> None:
         """
-        Set the position and the size for the RoundedRect.
-        :param points: A list of points to correctly set the position and the size of the rounded rect. Each element is
-                       a tuple of (Y-value, (X-left, X-Right)) where the x-value of the rounded rect is X-left and the
-                       width of the specific rounded rect is X-Right - X-left.
-        :param separator_points: A list with the separator positions. If the text is new, this list should be empty.
-        :param colors_list: A list of background color for each group of RoundedRect.
-        """
-
-        if len(separator_points) + len(points) > len(self._rects):  # We need to create more descriptors
-            rect_index = 0
-            sep_index = 0
-            points_index = 0
-            sep_find = False
-            for rect_index in range(len(self._rects)):
-                y_pos = points[points_index][0]
-                if sep_find:
-                    x_pos = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    x_pos = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    width = separator_points[sep_index].x() - x_pos
-
-                    # Update separators
-                    self._separators[sep_index][1] = rect_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    width = points[points_index][1][1] - x_pos
-                    points_index += 1
-
-                self._rects[rect_index].set_pos_and_size(x_pos, y_pos, width, self._height)
-                self._rects[rect_index].set_background_color(colors_list[sep_index])
-
-            for rect_index in range(rect_index + 1, len(separator_points) + len(points)):
-                y_pos = points[points_index][0]
-                if sep_find:
-                    x_pos = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    x_pos = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    width = separator_points[sep_index].x() - x_pos
-
-                    # Update separators
-                    self._separators[sep_index][1] = rect_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    width = points[points_index][1][1] - x_pos
-                    points_index += 1
-
-                self._rects.append(RoundedRect(x_pos, y_pos, width, self._height, self._radius, self._parent))
-                self._rects[-1].set_background_color(colors_list[sep_index])
-
-        else:  # We need to delete part of existing descriptors
-            rect_index = 0
-            sep_index = 0
-            points_index = 0
-            sep_find = False
-            for rect_index in range(len(separator_points) + len(points)):
-                y_pos = points[points_index][0]
-                if sep_find:
-                    x_pos = separator_points[sep_index].x()
-                    sep_find = False
-                    sep_index += 1
-                else:
-                    x_pos = points[points_index][1][0]
-
-                if sep_index < len(separator_points) and (
-                        separator_points[sep_index].y() == points[points_index][0] and
-                        separator_points[sep_index].x() <= points[points_index][1][1]):
-                    width = separator_points[sep_index].x() - x_pos
-
-                    # Update separators
-                    self._separators[sep_index][1] = rect_index
-                    self._separators[sep_index][2] = separator_points[sep_index]
-                    sep_find = True
-                else:
-                    width = points[points_index][1][1] - x_pos
-                    points_index += 1
-
-                self._rects[rect_index].set_pos_and_size(x_pos, y_pos, width, self._height)
-                self._rects[rect_index].set_background_color(colors_list[sep_index])
-
-            for _ in range(rect_index + 1, len(self._rects)):
-                removed_rect = self._rects.pop()
-                self._parent.scene().removeItem(removed_rect)
+        Set in bulk all the separators. All the RoundedRects are placed in a single pass. The groups of RoundedRects
+        that start in a separator that was already added, and the first group, keep their color. The groups of the new
+        separators have the default color.
+        :param segments: The segments of the text with all the separators, a RoundedRect per segment.
+        :param separators: All the separators, sorted in reading order.
+        """
+        old_color_indexes = {
+            id(self._separators.separator(i)): self._color_indexes[i + 1] for i in range(len(self._separators))
+        }
+        self._color_indexes = [self._color_indexes[0]] + [old_color_indexes.get(id(sep), 0) for sep in separators]
+
+        # The indexes are set by _set_segments()
+        self._separators.reset(separators, segments.separator_points)
+        self._last_created_separator_index = 0
+
+        self._set_segments(segments, self._color_indexes)
+        self._refresh_bounds()
+
+    def _set_segments(self, segments: SegmentModel, colors_list: list[int]) -> None:
+        """
+        Set the position, the size and the background color for the RoundedRect, creating or removing RoundedRects so
+        there is one per segment.
+        :param segments: The segments of the text.
+        :param colors_list: A list with the index in the palette of the background color of each group of RoundedRect.
+        """
+        for i in range(len(segments)):
+            x_pos = segments.lefts[i]
+            width = segments.rights[i] - x_pos
+            if i < len(self._rects):
+                self._rects[i].set_pos_and_size(x_pos, segments.ys[i], width, self._height)
+            else:
+                self._rects.append(self._create_rect(x_pos, segments.ys[i], width))
+            self._rects[i].set_background_color(colors_list[segments.groups[i]])
+
+        for _ in range(len(segments), len(self._rects)):
+            self._remove_rect(self._rects.pop())
+
+        # Update separators
+        for i in range(len(segments.separator_indexes)):
+            self._separators.set_index(i, segments.separator_indexes[i])
+            self._separators.set_point(i, segments.separator_points[i])
 
     def reset_colors(self) -> None:
         """
@@ -304,10 +270,21 @@ class RoundedRectHandler:
         one). Also, the colors list should be of any HTML valid color.
         :param colors: Dict of all available colors and the possibilities for the descriptor
         """
-        self._colors = colors
-        self._update_background_color_rects_group(-1, self._color_indexes[0])
+        self._palette.set_colors(colors)
+
+        # A single pass through all the RoundedRects, group by group
+        start = 0
         for i in range(len(self._separators)):
-            self._update_background_color_rects_group(i, self._color_indexes[i + 1])
+            end = self._separators.index(i) + 1
+            for e in range(start, end):
+                self._rects[e].set_background_color(self._color_indexes[i])
+            start = end
+        for e in range(start, len(self._rects)):
+            self._rects[e].set_background_color(self._color_indexes[-1])
+
+        # The brushes have changed even for the RoundedRects whose color index is the same
+        if self._parent.scene() is not None:
+            self._parent.scene().update()
 
     def update_last_created_rects_group(self) -> None:
         """
@@ -321,71 +298,46 @@ class RoundedRectHandler:
         """
         Set the background color for all the rounded rect in a RoundedRect group.
         :param separator_index: The index of the separator before the first RoundedRect of the group
-        :param color_index: The index of the color in the self.colors dictionary.
+        :param color_index: The index of the color in the palette.
         """
         # Adapt bounds
         if separator_index == -1:
             start = 0
         else:
-            start = self._separators[separator_index][1] + 1
+            start = self._separators.index(separator_index) + 1
 
         if separator_index == len(self._separators) - 1:
             end = len(self._rects)
         else:
-            end = self._separators[separator_index + 1][1] + 1
+            end = self._separators.index(separator_index + 1) + 1
 
         # Update background color for the rects of the same group
         for i in range(start, end):
-            self._rects[i].set_background_color(list(self._colors.values())[color_index])
+            self._rects[i].set_background_color(color_index)
 
-    def _find_separator(self, separator: Separator) -> int:
+    def _find_separator(self, separator: SeparatorRecord) -> int | None:
         """
         Find the index of the given separator in self.separators.
         :param separator: The separator to look for.
-        :return: The index of the separator.
+        :return: The index of the separator or None if it has not been added.
         """
-        for i in range(len(self._separators)):
-            if self._separators[i][0] is separator:
-                return i
+        return self._separators.find(separator)
 
-    def _add_separator(self, separator: Separator, point: QPointF) -> None:
+    def _add_separator(self, separator: SeparatorRecord, point: QPointF) -> None:
         """
         Add a separator to the list of separators and create a new RoundedRect to use in the newly created group of
         RoundedRects.
         :param separator: The created separator.
         :param point: The last position of the new created separator.
         """
-        if len(self._separators) == 0:
-            self._separators.append([separator, self._insert_rect(point), point])
+        position = self._separators.insertion_position(separator)
 
-            # Add new color init_index entry for the new rects group
-            self._color_indexes.append(0)
-            self._last_created_separator_index = 0
-        else:
-            for i in reversed(range(len(self._separators))):
-                if (point.y() > self._separators[i][0].pos().y() or
-                        (point.y() == self._separators[i][0].pos().y() and
-                         point.x() > self._separators[i][0].pos().x())):
-                    # [Separator, Last_index_before, Last_position]
-                    self._separators.insert(i + 1, [separator, self._insert_rect(point), point])
-
-                    # Update "Last_index_before" for the separators after this separator
-                    for e in range(i + 2, len(self._separators)):
-                        self._separators[e][1] += 1
-
-                    # Add new color init_index entry for the new rects group
-                    self._color_indexes.insert(i + 2, 0)
-                    self._last_created_separator_index = i + 1
-                    return
-
-            # If the separator is inserted after the last separator
-            self._separators.insert(0, [separator, self._insert_rect(point), point])
-            for e in range(1, len(self._separators)):
-                self._separators[e][1] += 1
-
-            # Add new color init_index entry for the new rects group
-            self._color_indexes.insert(1, 0)
-            self._last_created_separator_index = 0
+        # The indexes of the separators after this separator are increased by GroupBoundaries
+        self._separators.insert(position, separator, self._insert_rect(point), point)
+
+        # Add new color init_index entry for the new rects group
+        self._color_indexes.insert(position + 1, 0)
+        self._last_created_separator_index = position
 
     def _insert_rect(self, point: QPointF) -> int:
         """
@@ -395,13 +347,10 @@ class RoundedRectHandler:
         :return: The index of the separator before the RoundedRect.
         """
         index = _exponentialSearchRects(self._rects, point) + 1
-        self._rects.insert(index, RoundedRect(
+        self._rects.insert(index, self._create_rect(
             point.x(),
             point.y(),
-            self._rects[index - 1].rect().width() + self._rects[index - 1].pos().x() - point.x(),
-            self._height,
-            self._radius,
-            self._parent
+            self._rects[index - 1].rect().width() + self._rects[index - 1].pos().x() - point.x()
         ))
 
         self._rects[index - 1].set_pos_and_size(
@@ -428,9 +377,7 @@ class RoundedRectHandler:
                     self._rects[i].rect().width() + self._rects[i + 1].rect().width(),
                     self._height
                 )
-                self._rects[i + 1].set_background_color(
-                    list(self._colors.values())[self._color_indexes[separator_index]]
-                )
+                self._rects[i + 1].set_background_color(self._color_indexes[separator_index])
                 self._rects[i + 1].set_pos_and_size(self._rects[i + 2].pos().x(), self._rects[i + 2].pos().y(), 0, 0)
             else:
                 self._rects[i + 1].set_pos_and_size(
@@ -464,9 +411,7 @@ class RoundedRectHandler:
                     self._rects[i].rect().width() + self._rects[i + 1].rect().width(),
                     self._height
                 )
-                self._rects[i].set_background_color(
-                    list(self._colors.values())[self._color_indexes[separator_index + 1]]
-                )
+                self._rects[i].set_background_color(self._color_indexes[separator_index + 1])
                 self._rects[i].set_pos_and_size(
                     self._rects[i - 1].pos().x(),
                     self._rects[i - 1].pos().y(),
@@ -490,7 +435,7 @@ class RoundedRectHandler:
                 return i
         raise RuntimeError("UPWARDS FINISH WITHOUT RETURNING")
 
-    def _separator_created(self, created_separator: QGraphicsItem, point: QPointF) -> None:
+    def _separator_created(self, created_separator: SeparatorRecord, point: QPointF) -> None:
         """
         Updates the rectangle positions and size according to the new separator. This function
         should be called every time a Separator has created.
@@ -499,7 +444,7 @@ class RoundedRectHandler:
         """
         self._add_separator(created_separator, point)
 
-    def _separator_position_changed(self, moved_separator: QGraphicsItem, point: QPointF) -> None:
+    def _separator_position_changed(self, moved_separator: SeparatorRecord, point: QPointF) -> None:
         """
         Updates the rectangle positions and size according to the new position of moved_separator. This function
         should be called every time a Separator has moved.
@@ -510,20 +455,22 @@ class RoundedRectHandler:
         if sep_index is None:
             self._add_separator(moved_separator, point)
         else:
-            if (point.y() < self._separators[sep_index][2].y() or
-                    (point.y() == self._separators[sep_index][2].y() and
-                     point.x() < self._separators[sep_index][2].x())):  # Separator moved upwards
-                self._separators[sep_index][1] = self._update_upwards(sep_index, self._separators[sep_index][1], point)
-
-            elif (point.y() > self._separators[sep_index][2].y() or
-                  (point.y() == self._separators[sep_index][2].y() and
-                   point.x() > self._separators[sep_index][2].x())):  # Separator moved downwards
-                self._separators[sep_index][1] = self._update_downwards(
-                    sep_index, self._separators[sep_index][1], point
+            if (point.y() < self._separators.point(sep_index).y() or
+                    (point.y() == self._separators.point(sep_index).y() and
+                     point.x() < self._separators.point(sep_index).x())):  # Separator moved upwards
+                self._separators.set_index(
+                    sep_index, self._update_upwards(sep_index, self._separators.index(sep_index), point)
                 )
-            self._separators[sep_index][2] = point
 
-    def _separator_clicked_on_the_border(self, moved_separator: QGraphicsItem, cursor_point: QPointF,
+            elif (point.y() > self._separators.point(sep_index).y() or
+                  (point.y() == self._separators.point(sep_index).y() and
+                   point.x() > self._separators.point(sep_index).x())):  # Separator moved downwards
+                self._separators.set_index(
+                    sep_index, self._update_downwards(sep_index, self._separators.index(sep_index), point)
+                )
+            self._separators.set_point(sep_index, point)
+
+    def _separator_clicked_on_the_border(self, moved_separator: SeparatorRecord, cursor_point: QPointF,
                                          right_point: QPointF, left_point: QPointF) -> None:
         """
         This function update RoundedRects positions and size when a Separator that is on the border is clicked because
@@ -546,10 +493,10 @@ class RoundedRectHandler:
             # Nothing is done because of the way function "update_downwards" is designed.
 
             # If the user released the separator in the left border and now the user is clicking in the right border
-            if self._separators[sep_index][2] == left_point and \
+            if self._separators.point(sep_index) == left_point and \
                     (cursor_point - left_point).manhattanLength() > (cursor_point - right_point).manhattanLength():
                 # Auxiliary variable to add clarity
-                ind = self._separators[sep_index][1]
+                ind = self._separators.index(sep_index)
 
                 self._rects[ind].set_pos_and_size(
                     self._rects[ind - 1].pos().x() + self._rects[ind - 1].rect().width(),
@@ -558,27 +505,24 @@ class RoundedRectHandler:
                     self._height
                 )
 
-                self._rects[ind].set_background_color(list(self._colors.values())[self._color_indexes[sep_index + 1]])
+                self._rects[ind].set_background_color(self._color_indexes[sep_index + 1])
 
-                self._separators[sep_index][1] -= 1
+                self._separators.set_index(sep_index, ind - 1)
 
-    def _separator_removed(self, separator: Separator) -> None:
+    def _separator_removed(self, separator: SeparatorRecord) -> None:
         """
         Updates the number, position and size of the RoundedRects when a Separator is removed.
         :param separator: The removed Separator.
         """
         # Get indexes
         sep_index = self._find_separator(separator)
-        rect_index = self._separators[sep_index][1]
+        rect_index = self._separators.index(sep_index)
 
-        # Remove separator and descriptor
-        removed_separator = self._separators.pop(sep_index)
+        # Remove separator and rect. The indexes of the separators after this separator are decreased by
+        # GroupBoundaries
+        self._separators.pop(sep_index)
         removed_rect = self._rects.pop(rect_index + 1)
 
-        # Update "Last_index_before" for the separators after this separator
-        for e in range(sep_index, len(self._separators)):
-            self._separators[e][1] -= 1
-
         # Update remaining rects
         self._rects[rect_index].set_pos_and_size(
             self._rects[rect_index].pos().x(),
@@ -592,13 +536,13 @@ class RoundedRectHandler:
         if sep_index == len(self._separators):
             end = len(self._rects)
         else:
-            end = self._separators[sep_index][1] + 1
+            end = self._separators.index(sep_index) + 1
 
         # Update background color for the new group of rects
         for i in range(rect_index + 1, end):
-            self._rects[i].set_background_color(list(self._colors.values())[self._color_indexes[sep_index]])
+            self._rects[i].set_background_color(self._color_indexes[sep_index])
 
-        self._parent.scene().removeItem(removed_rect)
+        self._remove_rect(removed_rect)
 
     def _editable_text_changed_slot(self, separator_index: int, editable_text_list: list[str]) -> None:
         """
@@ -606,14 +550,10 @@ class RoundedRectHandler:
         :param separator_index: The index of the separator before the RoundedRect group.
         :param editable_text_list: A list with the editable descriptor text parts.
         """
-        index = 0
         editable_text_string = ""
         for i in range(len(editable_text_list)):
             editable_text_string += (str(i) + editable_text_list[i])
-        try:
-            index = list(self._colors.keys()).index(editable_text_string)
-        except ValueError:
-            pass
+        index = self._palette.index_of(editable_text_string)
 
         self._color_indexes[separator_index + 1] = index
         self._update_background_color_rects_group(separator_index, index)
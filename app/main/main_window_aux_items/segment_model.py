@@ -0,0 +1,66 @@
+from PyQt5.QtCore import QPointF
+
+
+class SegmentModel:
+    """
+    This class divides the lines of the text in segments: a segment per line of each group of words between two
+    separators. Each segment has its line (y-value), its x-range and the index of its group. It is computed once per
+    layout or separator change and both RoundedRectHandler and DescriptorHandler place their elements on it, a
+    RoundedRect and a Descriptor per segment. While a separator is dragged, each handler updates its own elements
+    instead, so the model only describes the segments of the last layout or separator change.
+    """
+    ys: list[float]
+    lefts: list[float]
+    rights: list[float]
+    groups: list[int]
+    separator_indexes: list[int]
+    separator_points: list[QPointF]
+
+    def __init__(self, points: list[tuple[float, tuple[float, float]]], separator_points: list[QPointF]) -> None:
+        """
+        Create SegmentModel object.
+        :param points: The limit points of each line. Each element is a tuple of (Y-value, (X-left, X-Right)).
+        :param separator_points: A list with the position of each separator, sorted in reading order and without the
+                                 limit separators.
+        """
+        self.ys = []
+        self.lefts = []
+        self.rights = []
+        self.groups = []
+        self.separator_indexes = []
+        self.separator_points = separator_points
+
+        sep_index = 0
+        points_index = 0
+        sep_find = False
+        for index in range(len(separator_points) + len(points)):
+            y = points[points_index][0]
+            if sep_find:
+                left = separator_points[sep_index].x()
+                sep_find = False
+                sep_index += 1
+            else:
+                left = points[points_index][1][0]
+
+            if sep_index < len(separator_points) and (
+                    separator_points[sep_index].y() == y and
+                    separator_points[sep_index].x() <= points[points_index][1][1]):
+                # The segment ends in a separator, so the next one starts in it
+                right = separator_points[sep_index].x()
+                self.separator_indexes.append(index)
+                sep_find = True
+            else:
+                right = points[points_index][1][1]
+                points_index += 1
+
+            self.ys.append(y)
+            self.lefts.append(left)
+            self.rights.append(right)
+            self.groups.append(sep_index)
+
+    def __len__(self) -> int:
+        """
+        Return the number of segments.
+        :return: The number of segments.
+        """
+        return len(self.ys)
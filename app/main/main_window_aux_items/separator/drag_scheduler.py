@@ -0,0 +1,99 @@
+from PyQt5.QtCore import QObject, QPointF, QTimer
+
+from .separator import SeparatorEmitter, SeparatorRecord
+
+# Minimum time between two geometry updates during a drag in milliseconds. It is one frame of a 60 Hz display
+FRAME_INTERVAL = 16
+
+
+class DragScheduler(QObject):
+    """
+    This class coalesces the position changes of the Separators that are being dragged. The Separators emit the dragged
+    signal on every mouse move, but the pos_changed signal, that updates the geometry of the RoundedRects and the
+    Descriptors, is emitted at most once per frame and only with the last position of each Separator. A pos_changed
+    signal emitted outside a drag, for example when a Separator is released, supersedes the pending position of the
+    Separator, and all the pending positions are emitted when a Separator is released, so the listeners are up to date
+    after a drag. Should be created before any other object connects to the signals of the emitter.
+    """
+    _pending: dict[SeparatorRecord, QPointF]
+
+    def __init__(self, emitter: SeparatorEmitter, interval: int = FRAME_INTERVAL) -> None:
+        """
+        Create DragScheduler object.
+        :param emitter: The QObject that handles the signals of the Separators.
+        :param interval: The minimum time between two updates in milliseconds.
+        """
+        super().__init__()
+        self._emitter = emitter
+        self._pending = {}
+        self._received = 0
+        self._emitted = 0
+        self._coalesced = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+        emitter.dragged.connect(self._separator_dragged)
+        emitter.pos_changed.connect(self._discard)
+        emitter.removed.connect(self._discard)
+        emitter.released.connect(self._separator_released)
+
+    def flush(self) -> None:
+        """
+        Emit the pos_changed signal with the last position of each dragged Separator.
+        """
+        self._timer.stop()
+        pending = self._pending
+        self._pending = {}
+        for separator, point in pending.items():
+            self._emitted += 1
+            self._emitter.pos_changed.emit(separator, point)
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        Obtain the number of received position changes, the number of emitted updates and the number of position
+        changes that have been coalesced (dropped because a newer position arrived first) since the statistics were
+        reset.
+        :return: A dictionary with the keys "received", "emitted" and "coalesced".
+        """
+        return {"received": self._received, "emitted": self._emitted, "coalesced": self._coalesced}
+
+    def reset_statistics(self) -> None:
+        """
+        Set to zero all the counters of the statistics.
+        """
+        self._received = 0
+        self._emitted = 0
+        self._coalesced = 0
+
+    def _separator_dragged(self, separator: SeparatorRecord, point: QPointF) -> None:
+        """
+        Store the new position of a dragged Separator and schedule an update if there is no one scheduled.
+        :param separator: The record of the dragged Separator.
+        :param point: The position of the Separator.
+        """
+        self._received += 1
+        if separator in self._pending:
+            self._coalesced += 1
+        self._pending[separator] = point
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _separator_released(self, separator: SeparatorRecord) -> None:
+        """
+        Emit all the pending positions when a Separator is released.
+        :param separator: The record of the released Separator. Non-relevant.
+        """
+        self.flush()
+
+    def _discard(self, separator: SeparatorRecord, *args) -> None:
+        """
+        Discard the pending position of a Separator whose position has been notified by other means or that has been
+        removed.
+        :param separator: The record of the Separator.
+        :param args: The rest of the arguments of the signal. Non-relevant.
+        """
+        if self._pending.pop(separator, None) is not None:
+            self._coalesced += 1
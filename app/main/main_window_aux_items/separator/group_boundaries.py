@@ -0,0 +1,138 @@
+import bisect
+
+from PyQt5.QtCore import QPointF
+
+from .separator import SeparatorRecord, find_separator
+
+
+class GroupBoundaries:
+    """
+    This class stores the separators of a handler that divides a list of items (RoundedRects or Descriptors) in groups,
+    sorted in reading order. For each separator, it stores the index of the last item before it and its last position.
+
+    Adding a separator always adds one item to the list and removing a separator always removes one, so the indexes of
+    all the later separators are shifted by one. To avoid updating all of them, each entry stores its index minus its
+    position in the list: the position of the later entries changes with the same shift, so the indexes are kept
+    without touching the entries.
+    """
+    _entries: list[list[SeparatorRecord | int | QPointF]]
+
+    def __init__(self) -> None:
+        """
+        Create GroupBoundaries object without separators.
+        """
+        # [Separator_record, Last_index_before - Position_in_the_list, Last_position]
+        self._entries = []
+
+    def __len__(self) -> int:
+        """
+        Return the number of separators.
+        :return: The number of separators.
+        """
+        return len(self._entries)
+
+    def reset(self, separators: list[SeparatorRecord], points: list[QPointF]) -> None:
+        """
+        Replace all the separators. The indexes of the items before them must be set afterward with set_index().
+        :param separators: All the separators, sorted in reading order.
+        :param points: A list with the position of each separator.
+        """
+        self._entries = [[separator, -i, point] for i, (separator, point) in enumerate(zip(separators, points))]
+
+    def clear(self) -> None:
+        """
+        Remove all the separators.
+        """
+        self._entries.clear()
+
+    def insert(self, position: int, separator: SeparatorRecord, index: int, point: QPointF) -> None:
+        """
+        Insert a separator after one item has been inserted in the list of items. The indexes of the later separators
+        are increased by one.
+        :param position: The position of the new separator in reading order.
+        :param separator: The new separator.
+        :param index: The index of the last item before the new separator.
+        :param point: The position of the new separator.
+        """
+        self._entries.insert(position, [separator, index - position, point])
+
+    def pop(self, position: int) -> SeparatorRecord:
+        """
+        Remove a separator after one item has been removed from the list of items. The indexes of the later separators
+        are decreased by one.
+        :param position: The position of the separator in reading order.
+        :return: The removed separator.
+        """
+        return self._entries.pop(position)[0]
+
+    def find(self, separator: SeparatorRecord) -> int | None:
+        """
+        Find the position of a separator.
+        :param separator: The separator to look for.
+        :return: The position of the separator or None if it has not been added.
+        """
+        return find_separator(self._entries, separator)
+
+    def insertion_position(self, separator: SeparatorRecord) -> int:
+        """
+        Return the position where a separator that has not been added yet has to be inserted to keep the reading order.
+        :param separator: The new separator.
+        :return: The position.
+        """
+        return bisect.bisect_left(self._entries, separator.word_index, key=lambda entry: entry[0].word_index)
+
+    def group_of(self, item_index: int) -> int:
+        """
+        Return the position of the separator before the group of an item.
+        :param item_index: The index of the item.
+        :return: The position of the separator or -1 if the item is in the first group.
+        """
+        first = 0
+        last = len(self._entries)
+        while first < last:
+            mid = (first + last) // 2
+            if self._entries[mid][1] + mid < item_index:
+                first = mid + 1
+            else:
+                last = mid
+        return first - 1
+
+    def separator(self, position: int) -> SeparatorRecord:
+        """
+        Return a separator.
+        :param position: The position of the separator in reading order.
+        :return: The separator.
+        """
+        return self._entries[position][0]
+
+    def index(self, position: int) -> int:
+        """
+        Return the index of the last item before a separator.
+        :param position: The position of the separator in reading order.
+        :return: The index of the item.
+        """
+        return self._entries[position][1] + position
+
+    def set_index(self, position: int, index: int) -> None:
+        """
+        Set the index of the last item before a separator.
+        :param position: The position of the separator in reading order.
+        :param index: The index of the item.
+        """
+        self._entries[position][1] = index - position
+
+    def point(self, position: int) -> QPointF:
+        """
+        Return the last position of a separator.
+        :param position: The position of the separator in reading order.
+        :return: The last position of the separator.
+        """
+        return self._entries[position][2]
+
+    def set_point(self, position: int, point: QPointF) -> None:
+        """
+        Set the last position of a separator.
+        :param position: The position of the separator in reading order.
+        :param point: The last position of the separator.
+        """
+        self._entries[position][2] = point
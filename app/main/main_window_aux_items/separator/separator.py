@@ -1,3 +1,4 @@
+import bisect
 import typing
 from typing import Any
 
@@ -8,72 +9,138 @@ from PyQt5.QtGui import QCursor, QPainterPath
 from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsItem, QGraphicsSceneMouseEvent, QWidget, \
     QStyleOptionGraphicsItem
 
+from ..point_model import PointModel
 
-def find_nearest_point(candidate_points: list[float] | tuple[float] | list[tuple[float, bool]], point_reference: float,
-                       ) -> float:
+
+def find_nearest_point(candidate_points: np.ndarray, point_reference: float, ignored: np.ndarray | None = None) -> int:
     """
-    Find the nearest float to point_reference from the list candidate_points.
-    :param candidate_points: A list of floats with the possible values. If the list is of type list[tuple[float, bool]],
-                             the boolean indicates if the point has to be ignored in the finding.
+    Find the nearest float to point_reference from the array candidate_points. The array is sorted, so the nearest
+    float is found with a binary search and only its neighbours are compared.
+    :param candidate_points: An array of floats sorted in ascending order with the possible values.
     :param point_reference: The float to compare with
-    :return: The nearest float in the list
+    :param ignored: An optional array of booleans with the same length as candidate_points that indicates if each point
+                    has to be ignored in the finding.
+    :return: The index of the nearest float in the array. If all the points are ignored, 0 is returned.
+    """
+    right = int(np.searchsorted(candidate_points, point_reference))
+    left = right - 1
+
+    # The ignored points are the parts of a word with BREAK_LINE_CHARACTERS, so there are only a few consecutive ones
+    if ignored is not None:
+        while left >= 0 and ignored[left]:
+            left -= 1
+        while right < len(candidate_points) and ignored[right]:
+            right += 1
+
+    if left < 0:
+        return right if right < len(candidate_points) else 0
+    if right >= len(candidate_points):
+        return left
+    if point_reference - candidate_points[left] <= candidate_points[right] - point_reference:
+        return left
+    return right
+
+
+def find_separator(elements: list[list[Any]], separator: "SeparatorRecord") -> int | None:
+    """
+    Find the index of a separator in a list of elements sorted in reading order whose first item is a SeparatorRecord.
+    Each separator is anchored to a different word, so the list is also sorted by the index of the words of the
+    separators and the separator is found with a binary search. The position of a Separator can't be beyond its
+    neighbours, so the order is kept while the Separators are moved.
+    :param elements: The list of elements.
+    :param separator: The SeparatorRecord to look for.
+    :return: The index of the element of the separator or None if it is not in the list.
+    """
+    index = bisect.bisect_left(elements, separator.get_word_index(), key=lambda element: element[0].get_word_index())
+    if index < len(elements) and elements[index][0] is separator:
+        return index
+    return None
+
+
+class SeparatorRecord:
     """
-    if all(isinstance(item, tuple) for item in candidate_points):
-        return min(
-            candidate_points,
-            key=lambda x: 1000000 if x[1] else np.abs(x[0] - point_reference)
-        )[0]
-    else:
-        return min(candidate_points, key=lambda x: np.abs(x - point_reference))
+    This class stores the state of a separator: the index of the word that is immediately after it and its kind. The
+    QGraphicsItem that displays it is only created while the separator has to be shown, so a text with a lot of
+    separators doesn't need a Separator per separator. The records are the objects sent in the signals of the
+    SeparatorEmitter, so the listeners don't depend on the QGraphicsItems.
+    """
+    __slots__ = ("word_index", "is_super", "item")
+
+    word_index: int
+    is_super: bool
+    item: "Separator | None"
+
+    def __init__(self, word_index: int, is_super: bool) -> None:
+        """
+        Create SeparatorRecord object without a QGraphicsItem.
+        :param word_index: The index of the word that is immediately after the separator.
+        :param is_super: True if it is a super separator.
+        """
+        self.word_index = word_index
+        self.is_super = is_super
+        self.item = None
+
+    def get_word_index(self) -> int:
+        """
+        Return the index of the word of the text that is immediately after the separator.
+        :return: The index of the word.
+        """
+        return self.word_index
 
 
 class SeparatorEmitter(QObject):
-    # (Separator_created, Point_of_separator)
-    created = pyqtSignal(QGraphicsLineItem, QPointF)
+    # (Separator_record_created, Point_of_separator)
+    created = pyqtSignal(object, QPointF)
+
+    # (Separator_record_moved, Point_of_separator)
+    pos_changed = pyqtSignal(object, QPointF)
 
-    # (Separator_moved, Point_of_separator)
-    pos_changed = pyqtSignal(QGraphicsLineItem, QPointF)
+    # (Separator_record_dragged, Point_of_separator). Emitted on every mouse move, see DragScheduler
+    dragged = pyqtSignal(object, QPointF)
 
-    # (Separator_released)
-    released = pyqtSignal(QGraphicsLineItem)
+    # (Separator_record_released)
+    released = pyqtSignal(object)
 
-    # (Separator_clicked, Cursor_point, Right_point_of_separator, Left_point_of_separator)
-    clicked_on_the_border = pyqtSignal(QGraphicsLineItem, QPointF, QPointF, QPointF)
+    # (Separator_record_clicked, Cursor_point, Right_point_of_separator, Left_point_of_separator)
+    clicked_on_the_border = pyqtSignal(object, QPointF, QPointF, QPointF)
 
-    # (Separator_removed)
-    removed = pyqtSignal(QGraphicsLineItem)
+    # (Separator_record_removed)
+    removed = pyqtSignal(object)
 
 
 class Separator(QGraphicsLineItem):
     """
-    This class represents a QGraphicsLineItem that can only move between the points contained in the fixed_points
-    structure. If the "Ignored" boolean is True, the separator cannot release in this point. If the separator is
-    released in the border of a line, a copy of it appears at the end of the previous line (if it is on the left border)
-    or at the beginning of the next line (if it is on the right border) and both copies are also selectable.
-    To avoid redundant information this structure must be:
-    [(y_0, [(x_0, Ignored), (x_1, Ignored), ...]), (y_1, [(x_0, Ignored), (x_1, Ignored), ...]), ...]
+    This class represents a QGraphicsLineItem that can only move between the points of the fixed_points PointModel whose
+    indexes are in the range of the Separator. The PointModel is shared between all the Separators, so each one only
+    stores its range of indexes. If the "ignored" flag of a point is True, the separator cannot release in this point.
+    If the separator is released in the border of a line, a copy of it appears at the end of the previous line (if it is
+    on the left border) or at the beginning of the next line (if it is on the right border) and both copies are also
+    selectable. Each time the Separator is placed, it is anchored to the index of the word that is after it, so its
+    position in the text doesn't depend on the coordinates. The word is stored in the SeparatorRecord of the Separator,
+    that is sent in the signals instead of the Separator.
     """
-    _fixed_points: list[tuple[float, list[tuple[float, bool]]]]
+    _fixed_points: PointModel
+    _start: int
+    _end: int
     _border_right_pos: bool
     _border_left_pos: bool
     _size: QRectF
 
-    def __init__(self, x: float, y: float, height: float, fixed_points: list[tuple[float, list[tuple[float, bool]]]],
-                 emitter: SeparatorEmitter, parent: QGraphicsItem) -> None:
+    def __init__(self, x: float, y: float, height: float, fixed_points: PointModel, emitter: SeparatorEmitter,
+                 parent: QGraphicsItem, point_range: tuple[int, int] | None = None,
+                 record: SeparatorRecord | None = None) -> None:
         """
         Create Separator object. The requested position will be adjusted to the nearest position contained in
         fixed_points
         :param x: X coordinate of the Separator
         :param y: Y coordinate of the Separator
         :param height: The height of the Separator
-        :param fixed_points: Available points for the separators. The structure must be
-                            [
-                            (y_0, [(x_0, Ignored), (x_1, Ignored), ...]),
-                            (y_1, [(x_0, Ignored), (x_1, Ignored), ...]),
-                            ...
-                            ]
+        :param fixed_points: Available points for the separators.
         :param emitter: The QObject that will handle the signals that will emit the Separator.
         :param parent: The QGraphicsItem parent of this Separator. Can't be None
+        :param point_range: The start (included) and end (excluded) indexes of the points of fixed_points where the
+                            Separator can be placed. If None, all the points are available.
+        :param record: The SeparatorRecord that this Separator displays. If None, a new one is created.
         """
         self._is_clicked = False
         self._mutex = QMutex()
@@ -97,44 +164,99 @@ class Separator(QGraphicsLineItem):
         # When position is changed via setPos, change itemChange behaviour
         self._pos_set = False
 
-        self._fixed_points = fixed_points
+        # When False, the position changes are not notified
+        self._notify = True
+
+        self._record = record if record is not None else SeparatorRecord(0, False)
+
+        self.set_fixed_points(fixed_points)
+        if point_range is not None:
+            self.set_point_range(*point_range)
 
         self.setPos(x, y)
 
-    def set_fixed_points(self, fixed_points: list[tuple[float, list[tuple[float, bool]]]]) -> None:
+    def set_fixed_points(self, fixed_points: PointModel) -> None:
         """
-        Sets the point structure through which the Separator can be moved.
+        Sets the point structure through which the Separator can be moved. All its points will be available until
+        set_point_range() is called.
         """
         self._fixed_points = fixed_points
+        self._start = 0
+        self._end = len(fixed_points)
 
-    def _get_y_values(self):
+    def set_point_range(self, start: int, end: int) -> None:
+        """
+        Sets the range of points of the point structure through which the Separator can be moved.
+        :param start: The index of the first available point.
+        :param end: The index after the last available point.
+        """
+        self._start = start
+        self._end = end
+
+    def set_emitter(self, emitter: SeparatorEmitter) -> None:
+        """
+        Sets the QObject that will handle the signals of a Separator created without it. The creation of the Separator
+        is never notified, so it should be notified to the listeners by other means.
+        :param emitter: The QObject that will handle the signals that will emit the Separator.
+        """
+        self._emitter = emitter
+        self.first_time = False
+
+    def get_record(self) -> SeparatorRecord:
+        """
+        Return the SeparatorRecord that this Separator displays.
+        :return: The record.
+        """
+        return self._record
+
+    def get_word_index(self) -> int:
+        """
+        Return the index of the word of the text that is immediately after the Separator. Is updated each time the
+        Separator is placed in a point.
+        :return: The index of the word.
+        """
+        return self._record.word_index
+
+    def _get_y_values(self) -> np.ndarray:
         """
         Return y values from self.fixed_points structure
-        :return: the list of available y points
+        :return: the array of y points
+        """
+        return self._fixed_points.y
+
+    def _get_lines(self) -> tuple[int, int]:
+        """
+        Return the first and the last lines with available points.
+        :return: the indexes of both lines
         """
-        return [i[0] for i in self._fixed_points]
+        return self._fixed_points.line_of_point(self._start), self._fixed_points.line_of_point(self._end - 1)
 
-    def _get_x_values(self, y_value: float) -> list[float]:
+    def _get_line_range(self, line: int) -> tuple[int, int]:
         """
-        Find the x values corresponding to the given y value from self.fixed_points
-        :param y_value: the y value to compare with
-        :return: the list of available x points for y point given
+        Return the range of available points of a line.
+        :param line: the index of the line
+        :return: the start (included) and end (excluded) indexes of the points
         """
-        for tuple_point in self._fixed_points:
-            if tuple_point[0] == y_value:
-                return [i[0] for i in tuple_point[1]]
+        return (max(int(self._fixed_points.line_starts[line]), self._start),
+                min(int(self._fixed_points.line_starts[line + 1]), self._end))
 
-    def _get_x_values_with_complete_info(self, y_value: float) -> list[tuple[float, bool]]:
+    def _get_x_values(self, line: int) -> np.ndarray:
         """
-        Find the x values corresponding to the given y value from self.fixed_points and return a tuple array
-        with the x_values and a boolean that indicates if the separator can be released in this position (False) or
-        not (True).
-        :param y_value: the y value to compare with
-        :return: the list of available x points for y point given
+        Return the available x values of a line from self.fixed_points structure
+        :param line: the index of the line
+        :return: the array of available x points for the line given
         """
-        for tuple_point in self._fixed_points:
-            if tuple_point[0] == y_value:
-                return tuple_point[1]
+        start, end = self._get_line_range(line)
+        return self._fixed_points.x[start:end]
+
+    def _find_nearest_line(self, y: float) -> int:
+        """
+        Find the line with available points whose y value is the nearest to the given one.
+        :param y: the y value to compare with
+        :return: the index of the line
+        """
+        first_line, last_line = self._get_lines()
+        return first_line + find_nearest_point(self._get_y_values()[first_line:last_line + 1], y)
 
     def set_height(self, height: float | int) -> None:
         """
@@ -152,9 +274,9 @@ class Separator(QGraphicsLineItem):
         original was at the beginning of the line).
         """
         if self._border_left_pos and not self._border_right_pos:
-            y_values = self._get_y_values()
-            y_value_previous_line = y_values[y_values.index(self.pos().y()) - 1]
-            x_values_previous_line = self._get_x_values(y_value_previous_line)
+            previous_line = self._fixed_points.line_of(self.pos().y()) - 1
+            y_value_previous_line = self._get_y_values()[previous_line]
+            x_values_previous_line = self._get_x_values(previous_line)
             self.prepareGeometryChange()  # Has to be called before bounding rounded_rect updating
             self._size = QRectF(
                 -self.pen().widthF() / 2,
@@ -164,9 +286,9 @@ class Separator(QGraphicsLineItem):
             )
 
         elif not self._border_left_pos and self._border_right_pos:
-            y_values = self._get_y_values()
-            y_value_next_line = y_values[y_values.index(self.pos().y()) + 1]
-            x_values_next_line = self._get_x_values(y_value_next_line)
+            next_line = self._fixed_points.line_of(self.pos().y()) + 1
+            y_value_next_line = self._get_y_values()[next_line]
+            x_values_next_line = self._get_x_values(next_line)
             self.prepareGeometryChange()  # Has to be called before bounding rounded_rect updating
             self._size = QRectF(
                 -self.pen().widthF() / 2 + x_values_next_line[0] - self.pos().x(),
@@ -178,10 +300,14 @@ class Separator(QGraphicsLineItem):
     def _emit_pos_changed(self) -> None:
         """
         This function is used to notify the position of the Separator. It's an internal function. If the use of this
-        function is needed externally, should be called when the Separator is not moving.
+        function is needed externally, should be called when the Separator is not moving. While the Separator is
+        clicked, the position is notified as dragged, so the changes can be coalesced.
         """
         if self._emitter is not None:
-            self._emitter.pos_changed.emit(self, self.pos())
+            if self._is_clicked:
+                self._emitter.dragged.emit(self._record, self.pos())
+            else:
+                self._emitter.pos_changed.emit(self._record, self.pos())
 
     def _emit_created(self) -> None:
         """
@@ -189,7 +315,7 @@ class Separator(QGraphicsLineItem):
         function is needed externally, should be called when the Separator is not moving.
         """
         if self._emitter is not None:
-            self._emitter.created.emit(self, self.pos())
+            self._emitter.created.emit(self._record, self.pos())
 
     def _emit_clicked_on_the_border(self, cursor_pos: QPointF) -> None:
         """
@@ -200,7 +326,7 @@ class Separator(QGraphicsLineItem):
         if self._emitter is not None:
             lock = QMutexLocker(self._mutex)
             self._emitter.clicked_on_the_border.emit(
-                self, cursor_pos, self.complete_pos(False), self.complete_pos(True)
+                self._record, cursor_pos, self.complete_pos(False), self.complete_pos(True)
             )
 
     def is_on_the_border(self) -> bool:
@@ -226,19 +352,17 @@ class Separator(QGraphicsLineItem):
             if left_pos:
                 return self.pos()
             else:
-                y_values = self._get_y_values()
-                y_value_previous_line = y_values[y_values.index(self.pos().y()) - 1]
+                previous_line = self._fixed_points.line_of(self.pos().y()) - 1
                 return QPointF(
-                    self._get_x_values(y_value_previous_line)[-1],
-                    y_value_previous_line
+                    self._get_x_values(previous_line)[-1],
+                    self._get_y_values()[previous_line]
                 )
         elif not self._border_left_pos and self._border_right_pos:
             if left_pos:
-                y_values = self._get_y_values()
-                y_value_next_line = y_values[y_values.index(self.pos().y()) + 1]
+                next_line = self._fixed_points.line_of(self.pos().y()) + 1
                 return QPointF(
-                    self._get_x_values(y_value_next_line)[0],
-                    y_value_next_line
+                    self._get_x_values(next_line)[0],
+                    self._get_y_values()[next_line]
                 )
             else:
                 return self.pos()
@@ -266,21 +390,42 @@ class Separator(QGraphicsLineItem):
             req_x = args[0]
             req_y = args[1]
 
-        y_list_values = self._get_y_values()
-        y_value = find_nearest_point(y_list_values, req_y)
+        start, end = self._get_line_range(self._find_nearest_line(req_y))
+        self._set_point(start + find_nearest_point(
+            self._fixed_points.x[start:end], req_x, self._fixed_points.ignored[start:end]
+        ))
 
-        x_list_values = self._get_x_values_with_complete_info(y_value)
-        x_value = find_nearest_point(x_list_values, req_x)
+    def set_word_pos(self, word_index: int, notify: bool = True) -> None:
+        """
+        Set the position of the Separator immediately before the given word. Unlike setPos(), the position is not
+        adjusted to the nearest allowed position, so the Separator keeps the word it is anchored to. All the points of
+        the fixed_points of the Separator must be available.
+        :param word_index: The index of the word.
+        :param notify: If False, the position change is not notified. Used when all the listeners are placed in bulk.
+        """
+        self._pos_set = True
+        self._notify = notify
+        self._set_point(int(self._fixed_points.word_points[word_index]))
+        self._notify = True
 
-        x_index = [i[0] for i in x_list_values].index(x_value)
-        y_index = y_list_values.index(y_value)
+    def _set_point(self, point: int) -> None:
+        """
+        Place the Separator in a point of self.fixed_points and anchor it to the word after this point. If the point is
+        in the border of a line, the Separator will be represented in both lines.
+        :param point: The index of the point.
+        """
+        y_index = self._fixed_points.line_of_point(point)
+        first_line, last_line = self._get_lines()
+        line_start, line_end = self._get_line_range(y_index)
 
-        super().setPos(x_value, y_value)
-        if not self._is_clicked and x_index == 0 and y_index > 0:
+        # The word is updated first, so the listeners of the position changes can find the Separator by its word
+        self._record.word_index = int(self._fixed_points.word_indexes[point])
+        super().setPos(self._fixed_points.x[point], self._get_y_values()[y_index])
+        if not self._is_clicked and point == line_start and y_index > first_line:
             self._border_left_pos = True
             self._border_right_pos = False
             self._set_bounding_rect()
-        elif not self._is_clicked and x_index == len(x_list_values) - 1 and y_index < len(y_list_values) - 1:
+        elif not self._is_clicked and point == line_end - 1 and y_index < last_line:
             self._border_right_pos = True
             self._border_left_pos = False
             self._set_bounding_rect()
@@ -374,24 +519,24 @@ class Separator(QGraphicsLineItem):
         :return: The position to be placed
         """
         lock = QMutexLocker(self._mutex)
-        if self.scene() is not None:
+        if change == QGraphicsItem.ItemPositionChange and self._pos_set:
+            # The position has been set by setPos() or set_word_pos(), even if the Separator is detached from the scene
+            self._pos_set = False
+        elif self.scene() is not None:
             if change == QGraphicsItem.ItemPositionChange:
-                if self._pos_set is False:
-                    y_value = find_nearest_point(
-                        self._get_y_values(),
-                        self.parentItem().mapFromScene(self.scene().views()[0].mapFromGlobal(QCursor.pos())).y() +
-                        self.scene().views()[0].verticalScrollBar().value()
-                    )
-                    x_value = value.x()
-                    x_list = self._get_x_values(y_value)
-                    if x_value < x_list[0]:
-                        x_value = x_list[0]
-                    elif x_value > x_list[-1]:
-                        x_value = x_list[-1]
-                    return QPointF(x_value, y_value)
-                else:
-                    self._pos_set = False
-            elif change == QGraphicsItem.ItemPositionHasChanged:
+                y_index = self._find_nearest_line(
+                    self.parentItem().mapFromScene(self.scene().views()[0].mapFromGlobal(QCursor.pos())).y() +
+                    self.scene().views()[0].verticalScrollBar().value()
+                )
+                y_value = self._get_y_values()[y_index]
+                x_value = value.x()
+                x_list = self._get_x_values(y_index)
+                if x_value < x_list[0]:
+                    x_value = x_list[0]
+                elif x_value > x_list[-1]:
+                    x_value = x_list[-1]
+                return QPointF(x_value, y_value)
+            elif change == QGraphicsItem.ItemPositionHasChanged and self._notify:
                 if self.first_time:
                     self.first_time = False
                     self._emit_created()
@@ -454,4 +599,4 @@ class Separator(QGraphicsLineItem):
         super().mouseReleaseEvent(event)
 
         if self._emitter is not None:
-            self._emitter.released.emit(self)
+            self._emitter.released.emit(self._record)
@@ -1,32 +1,92 @@
+import bisect
+import heapq
+
 from PyQt5.QtCore import Qt, QPointF
 from PyQt5.QtGui import QPen, QColor
 from PyQt5.QtWidgets import QGraphicsItem
 
-from .separator import Separator, find_nearest_point, SeparatorEmitter
+from .drag_scheduler import DragScheduler
+from .separator import Separator, SeparatorRecord, find_nearest_point, SeparatorEmitter
+from ..point_model import PointModel
+from ..viewport_culler import ViewportCuller
 
 SUPER_SEPARATOR_FACTOR = 1.5
 
 
+class SeparatorHit:
+    """
+    This class stores the result of SeparatorHandler.hit_test(): the nearest point to some coordinates and the Separator
+    that occupies it, if any. It is computed once per context menu and reused by the action chosen in the menu, while
+    the Separators don't change.
+    """
+    point: int
+    x: float
+    y: float
+    is_occupied: bool
+    index: int
+    separator: SeparatorRecord | None
+    is_super: bool
+    is_limit: bool
+    previous_separator: SeparatorRecord | None
+    next_separator: SeparatorRecord | None
+
+    def __init__(self, point: int, x: float, y: float, is_occupied: bool, index: int,
+                 separators: list[SeparatorRecord], revision: int) -> None:
+        """
+        Create SeparatorHit object.
+        :param point: The index in the fixed points of the nearest point.
+        :param x: The x-value of the nearest point.
+        :param y: The y-value of the nearest point.
+        :param is_occupied: True if the point is occupied by a Separator.
+        :param index: The index of the Separator that occupies the point or, if the point is free, the index of the
+                      Separator before. A -1 shows an error.
+        :param separators: The separators of the SeparatorHandler.
+        :param revision: The revision of the SeparatorHandler when the hit has been computed.
+        """
+        self.point = point
+        self.x = x
+        self.y = y
+        self.is_occupied = is_occupied
+        self.index = index
+        self.revision = revision
+
+        valid = is_occupied and index != -1
+        self.separator = separators[index] if valid else None
+        self.is_super = valid and separators[index].is_super
+        self.is_limit = valid and (index == 0 or index == len(separators) - 1)
+
+        previous_index = index - 1 if is_occupied else index
+        next_index = index + 1
+        self.previous_separator = separators[previous_index] if 0 <= previous_index < len(separators) else None
+        self.next_separator = separators[next_index] if 0 <= next_index < len(separators) else None
+
+
 class SeparatorHandler:
     """
     This class controls all the behaviour of the Separators (insertion, deletion, updates, movement, etc.). Also,
-    manges the creation and elimination of the super Separators.
+    manges the creation and elimination of the super Separators. The state of each separator is kept in a
+    SeparatorRecord and its Separator is only created while it is inside the visible area or while it is needed by an
+    operation, so the rest of the separators don't have any Qt object.
     """
     _regular_pen: QPen
     _super_pen: QPen
-    separators: list[list[Separator | bool]]  # Element: [Separator_object, Is_super_separator]
+    separators: list[SeparatorRecord]
+
+    # Sorted keys of the points occupied by each Separator, parallel to self.separators. The key of a point is its index
+    # in the fixed points, that follows the (line, x) order. A Separator on the border occupies two consecutive points
+    _first_points: list[int]
+    _last_points: list[int]
+
+    # Incremented every time the Separators or their points change, so an outdated SeparatorHit can be detected
+    _revision: int
 
-    def __init__(self, line_height: float, fixed_points: list[tuple[float, list[tuple[float, bool]]]],
-                 regular_sep_color: str, super_sep_color: str, parent: QGraphicsItem) -> None:
+    def __init__(self, line_height: float, fixed_points: PointModel, regular_sep_color: str, super_sep_color: str,
+                 parent: QGraphicsItem) -> None:
         """
         Create SeparatorHandler object. Only one object from this class should be created
         :param line_height: The height that the separators will have.
-        :param fixed_points: Available points for the separators. The structure must be
-                            [
-                            (y_0, [(x_0, Ignored), (x_1, Ignored), ...]),
-                            (y_1, [(x_0, Ignored), (x_1, Ignored), ...]),
-                            ...
-                            ]
+        :param fixed_points: Available points for the separators. Is shared with the rest of the elements and with all
+                             the Separators, so it won't be modified.
         :param regular_sep_color: A valid HTML color that will have the regular separators.
         :param super_sep_color: A valid HTML color that will have the super separators.
         :param parent: The QGraphicsItem parent of the Separators. Can't be None
@@ -34,11 +94,14 @@ class SeparatorHandler:
         self._height = line_height
         self._fixed_points = fixed_points
         self._parent = parent
+        self._culler = ViewportCuller(parent)
         self.emitter = SeparatorEmitter()
 
+        # Created before the listeners are connected, so it can discard the dragged positions that are outdated
+        self._drag_scheduler = DragScheduler(self.emitter)
+
         self._regular_pen = Separator(
-            self._fixed_points[0][1][0][0],
-            self._fixed_points[0][0],
+            *self._fixed_points.first_point(),
             self._height,
             self._fixed_points,
             None,
@@ -51,14 +114,18 @@ class SeparatorHandler:
 
         # Set separators
         self.separators = []
+        self._first_points = []
+        self._last_points = []
+        self._revision = 0
 
         self.emitter.released.connect(self._separator_is_released)
 
-    def set_fixed_points(self, fixed_points: list[tuple[float, list[tuple[float, bool]]]]) -> None:
+    def set_fixed_points(self, fixed_points: PointModel) -> None:
         """
         Sets the point structure through which the Separators can be moved.
         """
         self._fixed_points = fixed_points
+        self._revision += 1
 
     def set_separator_colors(self, regular_sep_color: str, super_sep_color: str) -> None:
         """
@@ -69,11 +136,7 @@ class SeparatorHandler:
         self._regular_pen.setColor(QColor(regular_sep_color))
         self._super_pen.setColor(QColor(super_sep_color))
 
-        for separator in self.separators:
-            if separator[1]:
-                separator[0].setPen(self._super_pen)
-            else:
-                separator[0].setPen(self._regular_pen)
+        self._update_pens()
 
     def set_separator_width(self, width: float) -> None:
         """
@@ -83,11 +146,7 @@ class SeparatorHandler:
         """
         self._regular_pen.setWidthF(width)
         self._super_pen.setWidthF(width * SUPER_SEPARATOR_FACTOR)
-        for separator in self.separators:
-            if separator[1]:
-                separator[0].setPen(self._super_pen)
-            else:
-                separator[0].setPen(self._regular_pen)
+        self._update_pens()
 
     def set_separator_height(self, height: float) -> None:
         """
@@ -96,54 +155,263 @@ class SeparatorHandler:
         """
         self._height = height
         for separator in self.separators:
-            separator[0].set_height(height)
+            if separator.item is not None:
+                separator.item.set_height(height)
+
+    def _update_pens(self) -> None:
+        """
+        Apply the current pens to all the Separators that have been created.
+        """
+        for separator in self.separators:
+            if separator.item is not None:
+                separator.item.setPen(self._super_pen if separator.is_super else self._regular_pen)
+
+    def get_drag_statistics(self) -> dict[str, int]:
+        """
+        Obtain the number of position changes received while dragging the Separators, the number of updates notified to
+        the listeners and the number of position changes that have been coalesced.
+        :return: A dictionary with the keys "received", "emitted" and "coalesced".
+        """
+        return self._drag_scheduler.get_statistics()
+
+    def set_visible_area(self, area: tuple[float, float] | None) -> None:
+        """
+        Set the area of the view where the Separators should be in the scene. Only the Separators inside this area are
+        kept in the scene, the rest of them are detached from it until the area reaches them.
+        :param area: A tuple of (top, bottom) y-values or None to keep all the Separators in the scene.
+        """
+        self._culler.set_area(area)
+        self.update_visible_items(False)
+
+    def update_visible_items(self, full: bool = True) -> None:
+        """
+        Attach to the scene the Separators inside the visible area and detach the rest. Should be called after the
+        Separators have been created, moved or removed in bulk.
+        :param full: If False, only the Separators attached in the previous update are checked to be detached.
+        """
+        self._culler.update(
+            self.separators,
+            lambda separator: separator.item,
+            lambda separator: self._get_pos(separator).y(),
+            full,
+            self._create_item,
+            self._release_item
+        )
+
+    def _create_item(self, separator: SeparatorRecord) -> Separator:
+        """
+        Create the Separator of a record that doesn't have it, immediately before the word of the record. The Separator
+        is created detached from the scene and its creation is not notified.
+        :param separator: The record.
+        :return: The Separator.
+        """
+        pos = self._get_pos(separator)
+        item = Separator(pos.x(), pos.y(), self._height, self._fixed_points, None, None, None, separator)
+        item.set_emitter(self.emitter)
+        item.setPen(self._super_pen if separator.is_super else self._regular_pen)
+        separator.item = item
+
+        index = self._find_index(separator)
+        if index == 0 or index == len(self.separators) - 1:
+            item.setFlags(item.flags() & ~QGraphicsItem.ItemIsMovable)
+            item.setCursor(Qt.ArrowCursor)
+        self._update_fixed_points_separator(index)
+        return item
+
+    @staticmethod
+    def _release_item(item: Separator) -> None:
+        """
+        Discard a Separator that has been detached from the scene. Its record keeps the state of the separator.
+        :param item: The Separator.
+        """
+        separator = item.get_record()
+        if separator.item is item:
+            separator.item = None
+
+    def _find_index(self, separator: SeparatorRecord) -> int:
+        """
+        Find the index of a record in self.separators with a binary search on the index of its word.
+        :param separator: The record.
+        :return: The index.
+        """
+        return bisect.bisect_left(self.separators, separator.word_index, key=SeparatorRecord.get_word_index)
+
+    def _get_pos(self, separator: SeparatorRecord) -> QPointF:
+        """
+        Return the position of a separator. If its Separator hasn't been created, the position is the point immediately
+        before its word.
+        :param separator: The record.
+        :return: The position.
+        """
+        if separator.item is not None:
+            return separator.item.pos()
+        return QPointF(*self._fixed_points.get_point(int(self._fixed_points.word_points[separator.word_index])))
+
+    def _find_nearest_fixed_point(self, x: float, y: float) -> tuple[float, float]:
+        """
+        Find the nearest available point to the given coordinates in self.fixed_points.
+        :param x: The x coordinate
+        :param y: The y coordinate
+        :return: The x and y values of the nearest point.
+        """
+        return self._fixed_points.get_point(self._find_nearest_fixed_point_index(x, y))
+
+    def _find_nearest_fixed_point_index(self, x: float, y: float) -> int:
+        """
+        Find the index in self.fixed_points of the nearest available point to the given coordinates.
+        :param x: The x coordinate
+        :param y: The y coordinate
+        :return: The index of the nearest point.
+        """
+        y_index = find_nearest_point(self._fixed_points.y, y)
+        return int(self._fixed_points.line_starts[y_index]) + find_nearest_point(self._fixed_points.line_x(y_index), x)
+
+    def _get_occupied_points(self, record: SeparatorRecord) -> tuple[int, int]:
+        """
+        Obtain the keys of the first and the last points occupied by a separator. They are the same point unless the
+        separator is on the border.
+        :param record: The record of the separator. Its Separator, if any, should be placed in self.fixed_points.
+        :return: The index of the first and the last points.
+        """
+        separator = record.item
+        if separator is None:
+            # Placed as set_word_pos() would do with all the points available
+            first, last = self._fixed_points.get_word_point_spans([record.word_index])
+            return int(first[0]), int(last[0])
+
+        right_pos = separator.complete_pos(False)
+        first = self._fixed_points.index_of(right_pos.x(), right_pos.y())
+        if not separator.is_on_the_border():
+            return first, first
+
+        left_pos = separator.complete_pos(True)
+        return first, self._fixed_points.index_of(left_pos.x(), left_pos.y())
+
+    def _insert_occupied_points(self, index: int) -> None:
+        """
+        Insert the keys of the points occupied by a new Separator.
+        :param index: The index of the Separator in self.separators.
+        """
+        first, last = self._get_occupied_points(self.separators[index])
+        self._first_points.insert(index, first)
+        self._last_points.insert(index, last)
+        self._revision += 1
 
-    def _get_y_values(self):
+    def _update_occupied_points(self, index: int) -> None:
         """
-        Return y values from self.fixed_points structure
-        :return: the list of available y points
+        Update the keys of the points occupied by a Separator that has been moved.
+        :param index: The index of the Separator in self.separators.
         """
-        return [i[0] for i in self._fixed_points]
+        self._first_points[index], self._last_points[index] = self._get_occupied_points(self.separators[index])
+        self._revision += 1
 
-    def _get_x_values(self, y_value: float) -> list[float]:
+    def _update_all_occupied_points(self) -> None:
         """
-        Find the x values corresponding to the given y value from self.fixed_points
-        :param y_value: the y value to compare with
-        :return: the list of available x points for y point given
+        Calculate again the keys of the points occupied by all the Separators. Should be called after the Separators
+        have been added or placed in bulk. The keys of the separators without Separator are calculated at once.
         """
-        for tuple_point in self._fixed_points:
-            if tuple_point[0] == y_value:
-                return [i[0] for i in tuple_point[1]]
+        first_points, last_points = self._fixed_points.get_word_point_spans(self.get_anchor_word_indexes())
+        self._first_points = first_points.tolist()
+        self._last_points = last_points.tolist()
+        for i, separator in enumerate(self.separators):
+            if separator.item is not None:
+                self._first_points[i], self._last_points[i] = self._get_occupied_points(separator)
+        self._revision += 1
 
     def get_separator_points(self) -> list[QPointF]:
         """
         Return a list with the coordinates of all separators.
         :return: The list of coordinates
         """
-        return [self.separators[i][0].pos() for i in range(1, len(self.separators) - 1)]
+        return [self._get_pos(self.separators[i]) for i in range(1, len(self.separators) - 1)]
 
     def get_super_separator_points(self) -> list[QPointF]:
         """
         Return a list with the coordinates of all the super separators.
         :return: The list of coordinates
         """
-        return [self.separators[i][0].pos() for i in range(1, len(self.separators) - 1) if self.separators[i][1]]
+        return [self._get_pos(self.separators[i]) for i in range(1, len(self.separators) - 1)
+                if self.separators[i].is_super]
+
+    def get_separator_word_indexes(self) -> list[int]:
+        """
+        Return a list with the index of the word where the group of words of each separator starts. The limit separators
+        are not included.
+        :return: The list of word indexes
+        """
+        return [self.separators[i].word_index for i in range(1, len(self.separators) - 1)]
+
+    def get_super_separator_word_indexes(self) -> list[int]:
+        """
+        Return a list with the index of the word where the group of words of each super separator starts. The limit
+        separators are not included.
+        :return: The list of word indexes
+        """
+        return [self.separators[i].word_index for i in range(1, len(self.separators) - 1)
+                if self.separators[i].is_super]
 
-    def set_separator_points(self, points: list[QPointF]) -> None:
+    def get_anchor_word_indexes(self) -> list[int]:
         """
-        Set the coordinates of all separators with the given QPointF list.
-        :param points: The points list.
+        Return a list with the index of the word each separator is anchored to. Unlike get_separator_word_indexes(), the
+        limit separators are included.
+        :return: The list of word indexes
         """
-        if len(points) != len(self.separators):
-            raise RuntimeError("There are not the same points as separators in set_separator_points() function")
+        return [separator.word_index for separator in self.separators]
 
-        for i in range(len(points)):
-            self.separators[i][0].set_fixed_points(self._fixed_points)
-            self.separators[i][0].setPos(points[i])
+    def get_anchored_separator_points(self) -> list[QPointF]:
+        """
+        Return a list with the coordinates that all separators should have in the current fixed points according to the
+        word they are anchored to. Used to reposition the separators after the fixed points have changed.
+        :return: The list of coordinates
+        """
+        return [QPointF(x, y) for x, y in self._fixed_points.get_word_points(self.get_anchor_word_indexes())]
+
+    def reposition_separators(self) -> None:
+        """
+        Place all the separators in the current fixed points immediately before the word they are anchored to. Should be
+        called after the fixed points have changed and after the listeners have been placed in bulk, because the new
+        positions are not notified. The separators without Separator are already placed by their word.
+        """
+        items = [i for i, separator in enumerate(self.separators) if separator.item is not None]
+        for i in items:
+            self.separators[i].item.set_fixed_points(self._fixed_points)
+            self.separators[i].item.set_word_pos(self.separators[i].word_index, False)
 
-        for i in range(len(self.separators)):
+        # All the Separators have been placed with all the points available, so their keys are the ones of their words
+        first_points, last_points = self._fixed_points.get_word_point_spans(self.get_anchor_word_indexes())
+        self._first_points = first_points.tolist()
+        self._last_points = last_points.tolist()
+        self._revision += 1
+
+        for i in items:
             self._update_fixed_points_separator(i)
 
+    def hit_test(self, x: float, y: float) -> SeparatorHit:
+        """
+        Find the nearest point to the given coordinates and the Separator that occupies it. The cost only depends on the
+        logarithm of the number of points and Separators. Should be called when no Separator is moved. Should be called
+        when exist at least one Separator.
+        :param x: The x coordinate
+        :param y: The y coordinate
+        :return: The result, that can be passed to the rest of functions while the Separators don't change.
+        """
+        point = self._find_nearest_fixed_point_index(x, y)
+        real_x, real_y = self._fixed_points.get_point(point)
+        is_occupied, index = self._point_is_occupied(point)
+        return SeparatorHit(point, real_x, real_y, is_occupied, index, self.separators, self._revision)
+
+    def _resolve_hit(self, x: float, y: float, hit: SeparatorHit | None) -> SeparatorHit:
+        """
+        Obtain the hit of the given coordinates, reusing the given one if it is still valid.
+        :param x: The x coordinate
+        :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
+        :return: A valid hit.
+        """
+        if hit is None or hit.revision != self._revision:
+            return self.hit_test(x, y)
+        return hit
+
     def point_is_occupied(self, x: float, y: float) -> tuple[bool, int]:
         """
         Check if the given point is occupied by existing separator and return the index of separator. Should be called
@@ -154,64 +422,52 @@ class SeparatorHandler:
         index of the separator if the position is occupied. If the position is not occupied, this second element will
         be the index of the separator before. A -1 will show an error.
         """
-        # Find nearest available point
-        real_y = find_nearest_point(self._get_y_values(), y)
-        real_x = find_nearest_point(self._get_x_values(real_y), x)
-
-        for i in range(len(self.separators)):
-            if self.separators[i][0].is_on_the_border():
-                if ((self.separators[i][0].complete_pos(True).x() == real_x and
-                     self.separators[i][0].complete_pos(True).y() == real_y) or
-                        (self.separators[i][0].complete_pos(False).x() == real_x and
-                         self.separators[i][0].complete_pos(False).y() == real_y)):
-                    return True, i
-            else:
-                if self.separators[i][0].complete_pos(True).x() == real_x and self.separators[i][0].complete_pos(
-                        True).y() == real_y:
-                    return True, i
-            if self.separators[i][0].complete_pos(True).y() > real_y or \
-                    (self.separators[i][0].complete_pos(True).y() == real_y and self.separators[i][0].complete_pos(
-                        True).x() > real_x):
-                return False, i - 1
-        return True, -1
-
-    def _find_free_point(self, x: float, y: float) -> tuple[float, float, int]:
+        return self._point_is_occupied(self._find_nearest_fixed_point_index(x, y))
+
+    def _point_is_occupied(self, point: int) -> tuple[bool, int]:
+        """
+        Check if the given point is occupied by existing separator and return the index of separator.
+        :param point: The index of the point in the fixed points.
+        :return: The same tuple as point_is_occupied().
+        """
+        # First separator that occupies this point or any point after it
+        index = bisect.bisect_left(self._last_points, point)
+        if index == len(self.separators):
+            return True, -1
+        if self._first_points[index] <= point:
+            return True, index
+        return False, index - 1
+
+    def _find_free_point(self, x: float, y: float, hit: SeparatorHit | None = None) -> tuple[float, float, int]:
         """
         Check if the given point is occupied by existing separator and if so, find another free point.
         The search goes from left to right and from up to down.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: The same point if is free or new point if it is busy and the index of the previous separator. If there
                  are no points available, this function will return (None, None, -1)
         """
-        # This auxiliary variable will reduce the search because all the separators with lower
-        # indexes won't affect availability check
-        is_occupied, index = self.point_is_occupied(x, y)
-        if not is_occupied:
-            real_y = find_nearest_point(self._get_y_values(), y)
-            real_x = find_nearest_point(self._get_x_values(real_y), x)
-            return real_x, real_y, index
+        hit = self._resolve_hit(x, y, hit)
+        index = hit.index
+        if not hit.is_occupied:
+            return hit.x, hit.y, index
         elif index != -1:
-            pos = self.separators[index][0].complete_pos(True)
-            real_y = pos.y()
-            real_x = pos.x()
-
-            for line in self._fixed_points:
-                if line[0] >= real_y:
-                    for i in range(len(line[1])):
-                        if (line[0] == real_y and line[1][i][0] >= real_x) or line[0] > real_y:
-                            if self.separators[index][0].is_on_the_border():
-                                if not (i == 0 or i == len(line[1]) - 1):
-                                    return line[1][i][0], line[0], index - 1
-                                if i == 0:
-                                    # If this position is busy, increment by one the ind in separators array
-                                    index += 1
-                            elif self.separators[index][0].complete_pos(True).x() == line[1][i][0] and \
-                                    self.separators[index][0].complete_pos(True).y() == line[0]:
-                                # If this position is busy, increment by one the ind in separators array
-                                index += 1
-                            else:
-                                return line[1][i][0], line[0], index - 1
+            # Jump over the run of consecutive occupied points that starts in the separator found. A point at the end of
+            # a line is also busy if the beginning of the next line is, because a separator placed there would be on
+            # the border and would occupy both points
+            point = self._last_points[index] + 1
+            index += 1
+            while index < len(self.separators) and point < len(self._fixed_points) and (
+                    self._first_points[index] <= point or
+                    (self._first_points[index] == point + 1 and self._fixed_points.is_line_end(point))
+            ):
+                point = self._last_points[index] + 1
+                index += 1
+
+            if point < len(self._fixed_points) and index < len(self.separators):
+                real_x, real_y = self._fixed_points.get_point(point)
+                return real_x, real_y, index - 1
         return None, None, -1
 
     def add_limit_separators(self, first_limit_x: float, first_limit_y: float,
@@ -228,47 +484,70 @@ class SeparatorHandler:
         self.promote_separator(last_limit_x, last_limit_y)
         self.promote_separator(first_limit_x, first_limit_y)
 
-    def add_separators_without_checking(self, points: list[tuple[QPointF, bool]]) -> None:
+    def add_separators_without_checking(self, points: list[tuple[QPointF, bool]]) -> list[SeparatorRecord]:
         """
-        Add all the separators to the canvas without checking the validity of the positions.
-        :param points: The separator points. The first element of each tuple is the position of the separator and the
-                       second is a boolean that indicates if it is a super separator.
+        Add all the separators to the canvas without checking the validity of the positions. Should be called when
+        there are only the limit separators. Only the records of the separators are created, their Separators will be
+        created by update_visible_items(). The creation of the separators is not notified with the created signal, so
+        the returned records should be added in bulk to the listeners.
+        :param points: The separator points, sorted in reading order. The first element of each tuple is the position of
+                       the separator and the second is a boolean that indicates if it is a super separator.
+        :return: The records of the created separators.
         """
+        new_separators = [
+            SeparatorRecord(int(self._fixed_points.word_indexes[self._fixed_points.index_of(point.x(), point.y())]),
+                            is_super)
+            for point, is_super in points
+        ]
 
-        for point in points:
-            # Create needed new elements
-            new_separator = Separator(
-                point[0].x(), point[0].y(), self._height, self._fixed_points, self.emitter, self._parent
-            )
-            self.separators.insert(-1, [new_separator, point[1]])
-            if point[1]:
-                new_separator.setPen(self._super_pen)
-            else:
-                new_separator.setPen(self._regular_pen)
+        # Insert all of them between the limit separators at once
+        self.separators[-1:-1] = new_separators
+
+        self._update_all_ranges()
+
+        return new_separators
+
+    def add_separators_at_words(self, word_indexes: list[int]) -> list[SeparatorRecord]:
+        """
+        Add regular separators immediately before the given words without checking the validity of the positions. The
+        new separators are merged with the existing ones in a single pass. Only the records of the separators are
+        created. The creation of the separators is not notified with the created signal, so all the separators should be
+        set in bulk to the listeners.
+        :param word_indexes: The sorted indexes of the words. There can't be a separator anchored to any of them and
+                             they can't be part of a word with BREAK_LINE_CHARACTERS.
+        :return: The records of all the separators, new and existing ones, without the limit separators.
+        """
+        new_separators = [SeparatorRecord(word_index, False) for word_index in word_indexes]
+        self.separators = list(heapq.merge(self.separators, new_separators, key=SeparatorRecord.get_word_index))
+
+        self._update_all_ranges()
+
+        return self.separators[1:-1]
+
+    def _update_all_ranges(self) -> None:
+        """
+        Calculate again the occupied points and the range of available points of all the separators. Should be called
+        after the separators have been added in bulk.
+        """
+        self._update_all_occupied_points()
 
         for i in range(1, len(self.separators) - 1):
-            self.separators[i][0].set_fixed_points(
-                self._set_fixed_points_subgroup(
-                    self.separators[i - 1][0].complete_pos(True).x(),
-                    self.separators[i - 1][0].complete_pos(True).y(),
-                    self.separators[i + 1][0].complete_pos(False).x(),
-                    self.separators[i + 1][0].complete_pos(False).y()
-                )
-            )
+            self._update_fixed_points_separator(i)
 
-    def add_separator(self, x: float, y: float, is_static: bool) -> bool:
+    def add_separator(self, x: float, y: float, is_static: bool, hit: SeparatorHit | None = None) -> bool:
         """
         Add a separator in the nearest valid position. The two first added separators should be the bottom and upper
         limits for all the rest of the separator.
         :param x: The x coordinate
         :param y: The y coordinate
         :param is_static: True if the separator won't move, False otherwise.
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: The created separator if success, None if error. There can be an error if the coordinates
                  are out of bounds or if there is no more space to place a separator
         """
+        record = SeparatorRecord(0, False)
         if len(self.separators) <= 1:
-            real_y = find_nearest_point(self._get_y_values(), y)
-            real_x = find_nearest_point(self._get_x_values(real_y), x)
+            real_x, real_y = self._find_nearest_fixed_point(x, y)
             index = len(self.separators) - 1
             # Create needed new elements
             new_separator = Separator(
@@ -277,11 +556,12 @@ class SeparatorHandler:
                 self._height,
                 self._fixed_points,
                 None,
-                self._parent
-
+                self._parent,
+                None,
+                record
             )
         else:
-            real_x, real_y, index = self._find_free_point(x, y)
+            real_x, real_y, index = self._find_free_point(x, y, hit)
 
             if (real_x is None and real_y is None) or index == -1:
                 return False
@@ -291,10 +571,11 @@ class SeparatorHandler:
                 real_x,
                 real_y,
                 self._height,
-                self._set_fixed_points_for_new_separator(index),
+                self._fixed_points,
                 self.emitter,
-                self._parent
-
+                self._parent,
+                self._get_free_point_range(index, index + 1),
+                record
             )
 
         new_separator.setPen(self._regular_pen)
@@ -303,33 +584,41 @@ class SeparatorHandler:
             new_separator.setFlags(new_separator.flags() & ~QGraphicsItem.ItemIsMovable)
             new_separator.setCursor(Qt.ArrowCursor)
 
-        self.separators.insert(index + 1, [new_separator, False])
+        record.item = new_separator
+        self.separators.insert(index + 1, record)
+        self._insert_occupied_points(index + 1)
 
         self._update_fixed_points_separator(index)
         self._update_fixed_points_separator(index + 2)
 
         return True
 
-    def delete_separator(self, x: float, y: float) -> bool:
+    def delete_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Remove a separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be an error if the coordinates are out of bounds or if in
                  the given coordinates there is no separator
         """
-        is_occupied, index = self.point_is_occupied(x, y)
-        if not is_occupied:
+        hit = self._resolve_hit(x, y, hit)
+        if not hit.is_occupied:
             return False
 
+        index = hit.index
         removed_separator = self.separators.pop(index)
+        self._first_points.pop(index)
+        self._last_points.pop(index)
+        self._revision += 1
 
         self._update_fixed_points_separator(index - 1)
         self._update_fixed_points_separator(index)
 
-        self._parent.scene().removeItem(removed_separator[0])
+        if removed_separator.item is not None:
+            self._culler.remove_item(removed_separator.item)
 
-        self.emitter.removed.emit(removed_separator[0])
+        self.emitter.removed.emit(removed_separator)
 
         return True
 
@@ -339,127 +628,99 @@ class SeparatorHandler:
         """
         for _ in range(len(self.separators)):
             removed_separator = self.separators.pop()
-            self._parent.scene().removeItem(removed_separator[0])
+            if removed_separator.item is not None:
+                self._culler.remove_item(removed_separator.item)
+        self._first_points.clear()
+        self._last_points.clear()
+        self._revision += 1
 
-    def promote_separator(self, x: float, y: float) -> bool:
+    def promote_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Promote a separator to a super Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be an error if the coordinates are out of bounds or if in
                  the given coordinates there is no separator
         """
-        is_occupied, sep_index = self.point_is_occupied(x, y)
-        if not is_occupied:
+        hit = self._resolve_hit(x, y, hit)
+        if not hit.is_occupied:
             return False
+        sep_index = hit.index
 
-        if self.separators[sep_index][1]:
+        separator = self.separators[sep_index]
+        if separator.is_super:
             return False
 
-        self.separators[sep_index][1] = True
+        separator.is_super = True
 
-        self.separators[sep_index][0].setPen(self._super_pen)
+        if separator.item is not None:
+            separator.item.setPen(self._super_pen)
+        self._revision += 1
 
         return True
 
-    def demote_separator(self, x: float, y: float) -> bool:
+    def demote_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Demote a super Separator to a normal separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be an error if the coordinates are out of bounds or if in
                  the given coordinates there is no separator
         """
-        is_occupied, sep_index = self.point_is_occupied(x, y)
-        if not is_occupied:
+        hit = self._resolve_hit(x, y, hit)
+        if not hit.is_occupied:
             return False
+        sep_index = hit.index
 
-        if not self.separators[sep_index][1]:
+        separator = self.separators[sep_index]
+        if not separator.is_super:
             return False
 
-        self.separators[sep_index][1] = False
+        separator.is_super = False
 
-        self.separators[sep_index][0].setPen(self._regular_pen)
+        if separator.item is not None:
+            separator.item.setPen(self._regular_pen)
+        self._revision += 1
 
         return True
 
-    def is_super_separator(self, x: float, y: float) -> bool:
+    def is_super_separator(self, x: float, y: float, hit: SeparatorHit | None = None) -> bool:
         """
         Check if in the given coordinates there is a super Separator.
         :param x: The x coordinate
         :param y: The y coordinate
+        :param hit: A previous result of hit_test() with the same coordinates or None.
         :return: True if success, False if error. There can be an error if the coordinates are out of bounds or if in
                  the given coordinates there is no separator
         """
-        is_occupied, sep_index = self.point_is_occupied(x, y)
-        if not is_occupied:
-            return False
+        return self._resolve_hit(x, y, hit).is_super
 
-        return self.separators[sep_index][1]
-
-    def _set_fixed_points_for_new_separator(self, index: int) -> list[tuple[float, list[tuple[float, bool]]]]:
-        """
-        Set the fixed points for a new created separator.
-        :param index: Index of the element after which the new separator is to be inserted
-        :return: The fixed_points structure for the new separator
-        """
-        start_x = self.separators[index][0].complete_pos(True).x()
-        start_y = self.separators[index][0].complete_pos(True).y()
-
-        end_x = self.separators[index + 1][0].complete_pos(False).x()
-        end_y = self.separators[index + 1][0].complete_pos(False).y()
-        return self._set_fixed_points_subgroup(start_x, start_y, end_x, end_y)
-
-    def _set_fixed_points_subgroup(self,
-                                   start_x: float, start_y: float,
-                                   end_x: float, end_y: float
-                                   ) -> list[tuple[float, list[tuple[float, bool]]]]:
-        """
-        Obtain, from self.fixed_points the subgroup of points that are between start point and end point.
-        The format of structure returned is the same as self.fixed_points.
-        :param start_x: The x coordinate of the starting point
-        :param start_y: The y coordinate of the starting point
-        :param end_x: The x coordinate of the ending point
-        :param end_y: The y coordinate of the ending point
-        :return: The new fixed_points structure
-        """
-        new_fixed_points = []
-        for line in self._fixed_points:
-            if end_y >= line[0]:
-                if line[0] >= start_y:
-                    start_recording = True
-                    for x_value in line[1]:
-                        if ((line[0] == start_y and x_value[0] > start_x) or line[0] > start_y) and \
-                                ((line[0] == end_y and x_value[0] < end_x) or line[0] < end_y):
-                            if start_recording:
-                                start_recording = False
-                                new_fixed_points.append((line[0], []))
-                            new_fixed_points[-1][1].append(x_value)
-            else:
-                break  # If left values are higher, end loop
-
-        return new_fixed_points
+    def _get_free_point_range(self, previous_index: int, next_index: int) -> tuple[int, int]:
+        """
+        Obtain the range of points of self.fixed_points that are between two separators.
+        :param previous_index: Index of the separator before the range
+        :param next_index: Index of the separator after the range
+        :return: The start (included) and end (excluded) indexes of the points
+        """
+        return self._last_points[previous_index] + 1, self._first_points[next_index]
 
     def _update_fixed_points_separator(self, index: int) -> None:
         """
-        Update the fixed_points of the separator for a given index separator.
+        Update the range of available points of the separator for a given index separator. The separators without
+        Separator don't have a range, it is set when the Separator is created.
         :param index: Index of the separator
         """
-        if (len(self.separators) - 2) >= index >= 1:
-            self.separators[index][0].set_fixed_points(
-                self._set_fixed_points_subgroup(
-                    self.separators[index - 1][0].complete_pos(True).x(),
-                    self.separators[index - 1][0].complete_pos(True).y(),
-                    self.separators[index + 1][0].complete_pos(False).x(),
-                    self.separators[index + 1][0].complete_pos(False).y()
-                )
-            )
+        if (len(self.separators) - 2) >= index >= 1 and self.separators[index].item is not None:
+            self.separators[index].item.set_point_range(*self._get_free_point_range(index - 1, index + 1))
 
-    def _separator_is_released(self, separator: Separator) -> None:
+    def _separator_is_released(self, separator: SeparatorRecord) -> None:
         """
         Updates the fixed-points of the surrounding separators.
-        :param separator: The separator that has been released.
+        :param separator: The record of the separator that has been released.
         """
-        only_separators = [e[0] for e in self.separators]
-        self._update_fixed_points_separator(only_separators.index(separator) - 1)
-        self._update_fixed_points_separator(only_separators.index(separator) + 1)
+        index = self._find_index(separator)
+        self._update_occupied_points(index)
+        self._update_fixed_points_separator(index - 1)
+        self._update_fixed_points_separator(index + 1)
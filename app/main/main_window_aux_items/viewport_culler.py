@@ -0,0 +1,136 @@
+import bisect
+import typing
+
+from PyQt5.QtWidgets import QGraphicsItem
+
+
+class ViewportCuller:
+    """
+    This class keeps attached to the scene only the QGraphicsItems of a handler that are inside the visible area of the
+    view (plus a margin). The rest of the items are detached from the scene, so they are neither indexed nor painted,
+    but they keep all their state, so they can be attached again when the visible area reaches them. When there is no
+    visible area, all the items are attached. A handler can also create the items only when they have to be attached and
+    discard them when they are detached.
+    """
+    _area: tuple[float, float] | None
+    _attached: list[QGraphicsItem]
+
+    def __init__(self, parent: QGraphicsItem) -> None:
+        """
+        Create ViewportCuller object.
+        :param parent: The QGraphicsItem parent of the items. Can't be None
+        """
+        self._parent = parent
+        self._area = None
+        self._attached = []
+        self._culling = False
+
+    def set_area(self, area: tuple[float, float] | None) -> None:
+        """
+        Set the visible area. Call this function won't update automatically the items, update() should be called after.
+        :param area: A tuple of (top, bottom) y-values in the coordinates of the parent or None to attach all the items.
+        """
+        self._area = area
+
+    def update(self, elements: typing.Sequence[typing.Any],
+               get_item: typing.Callable[[typing.Any], QGraphicsItem | None],
+               get_y: typing.Callable[[typing.Any], float], full: bool,
+               create_item: typing.Callable[[typing.Any], QGraphicsItem] | None = None,
+               release_item: typing.Callable[[QGraphicsItem], None] | None = None,
+               attached: typing.Callable[[int], None] | None = None) -> None:
+        """
+        Attach the items inside the visible area and detach the rest.
+        :param elements: The elements of the handler, sorted by their y-value.
+        :param get_item: A function that returns the QGraphicsItem of an element. Can return None if create_item is
+                         given and the item of the element hasn't been created.
+        :param get_y: A function that returns the y-value of an element.
+        :param full: If True, all the elements are checked. Should be True when the elements have been created, moved or
+                     removed in bulk. If False, only the items attached by the previous update are detached.
+        :param create_item: A function that creates the QGraphicsItem of an element without item. Only called for the
+                            elements whose item has to be attached.
+        :param release_item: A function that is called with each item detached by this update, so it can be discarded.
+        :param attached: A function that is called with the index of each element whose item is attached again by this
+                         update, so the handler can bring the item up to date.
+        """
+        if self._area is None:
+            if self._culling or create_item is not None:
+                for i, element in enumerate(elements):
+                    self._attach(self._get_or_create_item(element, get_item, create_item), i, attached)
+                self._attached = []
+                self._culling = False
+            return
+
+        start = bisect.bisect_left(elements, self._area[0], key=get_y)
+        end = bisect.bisect_right(elements, self._area[1], lo=start, key=get_y)
+        visible = [self._get_or_create_item(element, get_item, create_item) for element in elements[start:end]]
+
+        if full or not self._culling:
+            for i in range(start):
+                self._release(get_item(elements[i]), release_item)
+            for i in range(end, len(elements)):
+                self._release(get_item(elements[i]), release_item)
+        else:
+            visible_ids = set(map(id, visible))
+            for item in self._attached:
+                if id(item) not in visible_ids:
+                    self._release(item, release_item)
+
+        for i, item in enumerate(visible, start):
+            self._attach(item, i, attached)
+        self._attached = visible
+        self._culling = True
+
+    @staticmethod
+    def _get_or_create_item(element: typing.Any, get_item: typing.Callable[[typing.Any], QGraphicsItem | None],
+                            create_item: typing.Callable[[typing.Any], QGraphicsItem] | None) -> QGraphicsItem:
+        """
+        Obtain the QGraphicsItem of an element, creating it if it doesn't exist.
+        :param element: The element.
+        :param get_item: A function that returns the QGraphicsItem of an element or None.
+        :param create_item: A function that creates the QGraphicsItem of an element or None.
+        :return: The item.
+        """
+        item = get_item(element)
+        if item is None:
+            item = create_item(element)
+        return item
+
+    def _release(self, item: QGraphicsItem | None, release_item: typing.Callable[[QGraphicsItem], None] | None) -> None:
+        """
+        Detach an item from the scene and let the handler discard it.
+        :param item: The item or None if it hasn't been created.
+        :param release_item: A function that is called with the detached item or None.
+        """
+        if item is None:
+            return
+        self._detach(item)
+        if release_item is not None:
+            release_item(item)
+
+    def remove_item(self, item: QGraphicsItem) -> None:
+        """
+        Remove an item that is no longer used by the handler from the scene. The item can be detached.
+        :param item: The item.
+        """
+        self._detach(item)
+
+    def _attach(self, item: QGraphicsItem, index: int, attached: typing.Callable[[int], None] | None) -> None:
+        """
+        Add a detached item to the scene again as a child of the parent.
+        :param item: The item.
+        :param index: The index of the element of the item.
+        :param attached: A function that is called with the index if the item is attached or None.
+        """
+        if item.parentItem() is None:
+            item.setParentItem(self._parent)
+            if attached is not None:
+                attached(index)
+
+    @staticmethod
+    def _detach(item: QGraphicsItem) -> None:
+        """
+        Remove an attached item from the scene. The position of the item is kept.
+        :param item: The item.
+        """
+        if item.scene() is not None:
+            item.scene().removeItem(item)
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QMutex, QMutexLocker, QTextBoundaryFinder
+from PyQt5.QtGui import QFont, QTextLayout
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+def remove_text_format(text: str) -> str:
+    """
+    This function remove the HTML format from the text to obtain plain text.
+    :param text: The text to be formatted.
+    :return: The formatted text.
+    """
+    text = text.replace("&amp;", "&")
+    text = text.replace("&quot;", "\"")
+    text = text.replace("&gt;", ">")
+    text = text.replace("&lt;", "<")
+    return text
+
+
+def _find_boundaries_word(word: str) -> list[int]:
+    """
+    Find the positions inside a word where a line break is allowed (for example, after a "-" character).
+    :param word: The word.
+    :return: The list of positions. The end of the word is not included.
+    """
+    if word == "":  # An empty word has no boundaries, not even its end
+        return []
+
+    finder = QTextBoundaryFinder(QTextBoundaryFinder.Line, word)
+    result = []
+    index = finder.toNextBoundary()
+    while index != -1:
+        result.append(index)
+        index = finder.toNextBoundary()
+    result.pop()
+    return result
+
+
+def _natural_width(text: str, font: QFont) -> float:
+    """
+    Obtain the width in pixels that the given plain text occupies in a single line with the given font. This is the
+    same value that QTextDocument uses internally to lay out the text.
+    :param text: The plain text.
+    :param font: The font used to represent the text.
+    :return: The width in pixels.
+    """
+    layout = QTextLayout(text, font)
+    layout.beginLayout()
+    line = layout.createLine()
+    layout.endLayout()
+    return line.naturalTextWidth()
+
+
+class WordMetrics:
+    """
+    This class calculates the width of the words represented by MainText. Instead of inserting each word as HTML into
+    an auxiliary QGraphicsTextItem, the width is obtained from the font metrics via QTextLayout. The results are stored
+    in a bounded LRU cache whose key is (font family, point size, bold, word), so a repeated word only costs a
+    dictionary access. The cache is protected by a mutex, so the same object can be used from the relayout worker.
+    """
+    _cache: OrderedDict[tuple[str, int, bool, str], tuple[tuple[float, str, bool], ...]]
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Create WordMetrics object.
+        :param max_size: The maximum number of words stored in the cache.
+        """
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._mutex = QMutex()
+
+    def get_words_width(self, font: QFont, text_list: list[str]) -> list[tuple[int | float, str, bool]]:
+        """
+        This function calculates the width of all the words passed as parameter.
+        :param font: The font used to represent the words.
+        :param text_list: A list of words in HTML format. The "<br>" elements represent break lines.
+        :return: A list. For each element, the first sub-element is the word width, the second, the word and the last, a
+                 boolean that indicates if the word is part of a word with one or more BREAK_LINE_CHARACTERS. The break
+                 lines are represented as (-1, "\n", False).
+        """
+        family = font.family()
+        point_size = font.pointSize()
+        bold = font.bold()
+
+        lock = QMutexLocker(self._mutex)
+        result = []
+        for word in text_list:
+            if word == "<br>":
+                result.append((-1, "\n", False))  # Break line
+            else:
+                result.extend(self._get_word_width(font, (family, point_size, bold, word)))
+        return result
+
+    def _get_word_width(self, font: QFont, key: tuple[str, int, bool, str]) -> tuple[tuple[float, str, bool], ...]:
+        """
+        Obtain the width of a word from the cache. If the word is not in the cache, is measured and stored.
+        :param font: The font used to represent the word.
+        :param key: The cache key. Is a tuple of (font family, point size, bold, word).
+        :return: A tuple with one element per sub-word. The structure of each element is the same as the elements
+                 returned by get_words_width().
+        """
+        value = self._cache.get(key)
+        if value is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+        self._misses += 1
+        word = key[3]
+        positions = _find_boundaries_word(word)
+        if len(positions) == 0:
+            value = ((_natural_width(remove_text_format(word), font), word, False),)
+        else:
+            sub_words = []
+            start_pos = 0
+            for position in positions:
+                sub_word = word[start_pos:position]
+                start_pos = position
+                sub_words.append((_natural_width(remove_text_format(sub_word), font), sub_word, True))
+
+            sub_word = word[start_pos:]
+            sub_words.append((_natural_width(remove_text_format(sub_word), font), sub_word, False))
+            value = tuple(sub_words)
+
+        self._cache[key] = value
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all the stored words from the cache.
+        """
+        lock = QMutexLocker(self._mutex)
+        self._cache.clear()
+
+    def cache_info(self) -> tuple[int, int, int, int]:
+        """
+        Return the statistics of the cache.
+        :return: A tuple of (hits, misses, max size, current size).
+        """
+        return self._hits, self._misses, self._max_size, len(self._cache)
@@ -0,0 +1,84 @@
+import random
+
+from main.main_window import SD_VALUES, SG_VALUES
+
+SYLLABLES = ["ka", "lo", "me", "su", "ri", "ta", "no", "vi", "de", "pa", "ce", "mu", "tor", "gan", "sel", "bri"]
+PUNCTUATION = [",", ".", ";", ":", "?"]
+
+
+def generate_words(word_count: int, rng: random.Random) -> list[str]:
+    """
+    Generate a list of synthetic words. Some words end with a punctuation mark and others are hyphenated, so the words
+    with BREAK_LINE_CHARACTERS are also measured.
+    :param word_count: The number of words.
+    :param rng: The random generator.
+    :return: The list of words.
+    """
+    words = []
+    for _ in range(word_count):
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        draw = rng.random()
+        if draw < 0.05:
+            word += "-" + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 2)))
+        elif draw < 0.15:
+            word += rng.choice(PUNCTUATION)
+        words.append(word)
+    return words
+
+
+def generate_clause_starts(word_count: int, clause_density: float, rng: random.Random) -> list[int]:
+    """
+    Generate the indexes of the words where each clause starts, without the first clause.
+    :param word_count: The number of words.
+    :param clause_density: The expected number of clauses per word, between 0 and 1.
+    :param rng: The random generator.
+    :return: The sorted indexes.
+    """
+    return [i for i in range(1, word_count) if rng.random() < clause_density]
+
+
+def generate_text(words: list[str], clause_starts: list[int], paragraph_size: int) -> tuple[str, list[str]]:
+    """
+    Join the words in a text with a break line every paragraph_size words and split it in clauses. The break lines are
+    written as " \n ", as the application writes them, and they are never placed between two clauses, because the
+    clauses are joined with spaces when they are loaded.
+    :param words: The words.
+    :param clause_starts: The indexes of the words where each clause starts, without the first clause.
+    :param paragraph_size: The number of words of each paragraph.
+    :return: The text and the list of clauses.
+    """
+    starts = set(clause_starts)
+    text = words[0]
+    clauses = []
+    clause = words[0]
+    for i in range(1, len(words)):
+        if i in starts:
+            clauses.append(clause)
+            text += " " + words[i]
+            clause = words[i]
+        else:
+            space = " \n " if i % paragraph_size == 0 else " "
+            text += space + words[i]
+            clause += space + words[i]
+    clauses.append(clause)
+    return text, clauses
+
+
+def generate_analysis(clauses: list[str], super_clause_size: int,
+                      rng: random.Random) -> list[tuple[list[tuple[str, str]], str]]:
+    """
+    Give a random descriptor to each clause and group the clauses in super clauses. The result has the same structure
+    as the one obtained from the Classifier object.
+    :param clauses: The list of clauses.
+    :param super_clause_size: The number of clauses of each super clause.
+    :param rng: The random generator.
+    :return: The analyzed clauses.
+    """
+    result = []
+    for i in range(0, len(clauses), super_clause_size):
+        group = [
+            (clause, rng.choice(SD_VALUES) + ";" + rng.choice(SG_VALUES))
+            for clause in clauses[i:i + super_clause_size]
+        ]
+        result.append((group, rng.choice(SD_VALUES) + ";" + rng.choice(SG_VALUES)))
+    return result
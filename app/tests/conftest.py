@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+
+# The tests don't need a display, so the offscreen platform is used unless another one is requested
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from main.classifier_view import ClassifierView
+from main.main_window import (
+    manage_file, DEFAULT_TEXT_SD_SG, DEFAULT_DESCRIPTOR_VALUE, ALLOWED_DESCRIPTOR_VALUES
+)
+
+VIEW_WIDTH = 500
+VIEW_HEIGHT = 500
+VIEW_PADDING = 10
+
+
+@pytest.fixture(scope="session")
+def app() -> QApplication:
+    """
+    The QApplication shared by all the tests.
+    :return: The application.
+    """
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture(scope="session")
+def conf(app: QApplication) -> dict:
+    """
+    The default configuration of the application.
+    :param app: The application.
+    :return: The configuration.
+    """
+    return json.loads(manage_file(":/main/conf/defconf", "r"))
+
+
+@pytest.fixture(scope="session")
+def xsd(app: QApplication) -> str:
+    """
+    The XSD schema of the .lct files.
+    :param app: The application.
+    :return: The schema.
+    """
+    return manage_file(":/main/xml_schema/xsd_v1_0", "r")
+
+
+@pytest.fixture
+def make_view(app: QApplication, conf: dict):
+    """
+    Create ClassifierViews set up as the main window does. The views are closed at the end of the test.
+    :param app: The application.
+    :param conf: The default configuration of the application.
+    :return: A function that receives the text and if the rounded rects are batched and returns a new view.
+    """
+    views = []
+
+    def make(text: str, batched_rects: bool = False) -> ClassifierView:
+        view = ClassifierView(None)
+        view.setup(
+            VIEW_PADDING,
+            VIEW_PADDING,
+            VIEW_WIDTH,
+            VIEW_HEIGHT,
+            text,
+            conf["textSize"],
+            DEFAULT_TEXT_SD_SG,
+            DEFAULT_DESCRIPTOR_VALUE,
+            ALLOWED_DESCRIPTOR_VALUES,
+            list(conf["rectsColors"]["together"].values()),
+            conf["separatorColors"]["regularSeparator"],
+            conf["separatorColors"]["superSeparator"],
+            batched_rects
+        )
+        views.append(view)
+        return view
+
+    yield make
+    for view in views:
+        view.close()
+        view.deleteLater()
+    app.processEvents()
@@ -0,0 +1,189 @@
+import pytest
+
+from main.lct_handler import LCTHandler
+from main.main_window import SD_VALUES, SG_VALUES, DEFAULT_TEXT_SD_SG, DEFAULT_DESCRIPTOR_VALUE
+from main.main_window_aux_items.classifier import SENTENCE_BOUNDARY, PUNCTUATION_BOUNDARY, LINE_BREAK_BOUNDARY
+
+# Three super clauses. The clauses have hyphenated words, HTML entities, tags and a break line
+ANALYSIS = [
+    ([("A well-known text,", "SD-;SG+"), ("with some &amp; entities", "SD-;SG+"), ("and a tag.", "SD+;SG--")],
+     "SD-;SG+"),
+    ([("It has <tags>, to lay out", "SD++;SG-"), ("Another \n paragraph starts here;", "SD++;SG-")], "SD++;SG-"),
+    ([("state-of-the-art ends it?", "SD--;SG++"), ("last one.", "SD--;SG++")], "SD--;SG++")
+]
+CLAUSES = [clause for group, _ in ANALYSIS for clause, _ in group]
+
+
+@pytest.fixture
+def lct_handler(xsd) -> LCTHandler:
+    """
+    A LCTHandler with ANALYSIS uploaded, as the main window has it after opening a file.
+    :param xsd: The XSD schema of the .lct files.
+    :return: The handler.
+    """
+    handler = LCTHandler("Semantics", [SD_VALUES, SG_VALUES], DEFAULT_DESCRIPTOR_VALUE, xsd)
+    assert handler.upload_from_data(ANALYSIS)[0]
+    return handler
+
+
+@pytest.fixture
+def analyzed_view(make_view, conf, lct_handler):
+    """
+    A ClassifierView with ANALYSIS loaded as the main window loads a file.
+    :param make_view: The factory of ClassifierViews.
+    :param conf: The default configuration of the application.
+    :param lct_handler: The LCTHandler with ANALYSIS.
+    :return: The view.
+    """
+    view = make_view("This is the text shown before the analysis is loaded.")
+    view.classifier.set_text_analyzed(
+        lct_handler.get_clause_texts(),
+        lct_handler.get_super_clause_texts(),
+        DEFAULT_TEXT_SD_SG,
+        list(conf["rectsColors"]["together"].values()),
+        lct_handler.get_raw_labels(),
+        lct_handler.get_clause_tags()
+    )
+    return view
+
+
+def test_set_text_analyzed_round_trip(analyzed_view):
+    assert analyzed_view.classifier.get_text_classified() == CLAUSES
+    assert analyzed_view.classifier.get_text_analyzed() == ANALYSIS
+
+
+def test_lct_round_trip(analyzed_view, lct_handler, xsd):
+    saved = LCTHandler("Semantics", [SD_VALUES, SG_VALUES], DEFAULT_DESCRIPTOR_VALUE, xsd)
+    assert saved.upload_from_data(analyzed_view.classifier.get_text_analyzed())[0]
+    assert saved.to_string() == lct_handler.to_string()
+
+
+@pytest.mark.parametrize("width", [200, 300, 900])
+def test_set_width_keeps_the_analysis(analyzed_view, width):
+    height = analyzed_view.classifier.get_text_item_height()
+    analyzed_view.classifier.set_width(width)
+    assert analyzed_view.classifier.get_text_analyzed() == ANALYSIS
+    assert (analyzed_view.classifier.get_text_item_height() > height) == (width < 480)
+
+
+@pytest.mark.parametrize("text_size", [8, 20, 36])
+def test_set_text_size_keeps_the_analysis(analyzed_view, text_size):
+    analyzed_view.classifier.set_text_size(text_size)
+    assert analyzed_view.classifier.get_text_size() == text_size
+    assert analyzed_view.classifier.get_text_analyzed() == ANALYSIS
+
+
+def line_points(classifier, y: float) -> list[tuple[float, float]]:
+    """
+    Find the points of the line at the given height by scanning it with hit_test(), as the context menu does.
+    :param classifier: The Classifier.
+    :param y: The y coordinate of the line.
+    :return: The coordinates of each point of the line, from left to right.
+    """
+    points = []
+    for x in range(0, 600):
+        hit = classifier.hit_test(x, y)
+        if hit.y == y and (hit.x, hit.y) not in points:
+            points.append((hit.x, hit.y))
+    return points
+
+
+def test_split_promote_and_join_at_coordinates(make_view):
+    classifier = make_view("one two three four five six").classifier
+    first = classifier.hit_test(0, 0)
+    points = line_points(classifier, first.y)
+    assert len(points) == 7
+
+    assert classifier.split(*points[2])
+    assert classifier.get_text_classified() == ["one two", "three four five six"]
+    assert classifier.there_is_a_separator(*points[2])
+    assert not classifier.is_super_separator(*points[2])
+
+    hit = classifier.hit_test(*points[4])
+    assert classifier.split(*points[4], hit)
+    assert classifier.get_text_classified() == ["one two", "three four", "five six"]
+
+    hit = classifier.hit_test(*points[4])
+    assert hit.is_occupied and not hit.is_limit
+    assert classifier.promote_separator(*points[4], hit)
+    assert classifier.is_super_separator(*points[4])
+    analyzed = classifier.get_text_analyzed()
+    assert [[clause for clause, _ in group] for group, _ in analyzed] == [["one two", "three four"], ["five six"]]
+
+    assert classifier.join(*points[2])
+    assert not classifier.there_is_a_separator(*points[2])
+    assert classifier.get_text_classified() == ["one two three four", "five six"]
+    assert classifier.demote_separator(*points[4])
+    assert classifier.join(*points[4])
+    assert classifier.get_text_classified() == ["one two three four five six"]
+
+
+def test_split_on_a_separator_uses_the_next_free_point(make_view):
+    classifier = make_view("one two three four five six").classifier
+    points = line_points(classifier, classifier.hit_test(0, 0).y)
+
+    assert classifier.split(*points[2])
+    assert classifier.split(*points[2])
+    assert classifier.get_text_classified() == ["one two", "three", "four five six"]
+
+
+def test_limit_separators_are_not_offered_to_join(make_view):
+    classifier = make_view("one two three").classifier
+    points = line_points(classifier, classifier.hit_test(0, 0).y)
+
+    # The context menu only enables "Join" when there_is_a_separator() is True
+    for point in (points[0], points[-1]):
+        hit = classifier.hit_test(*point)
+        assert hit.is_occupied and hit.is_limit
+        assert not classifier.there_is_a_separator(*point, hit)
+    assert not classifier.there_is_a_separator(*points[1])
+
+
+def test_stale_hit_is_computed_again(make_view):
+    classifier = make_view("one two three four five six").classifier
+    points = line_points(classifier, classifier.hit_test(0, 0).y)
+
+    hit = classifier.hit_test(*points[3])
+    assert classifier.split(*points[2])
+    # The hit was computed before the split, so the separator added by it isn't in the hit
+    assert classifier.split(*points[3], hit)
+    assert classifier.get_text_classified() == ["one two", "three", "four five six"]
+
+
+@pytest.mark.parametrize("text, pattern, expected", [
+    ("One sentence. Another one! A (question?) no end", SENTENCE_BOUNDARY,
+     ["One sentence.", "Another one!", "A (question?)", "no end"]),
+    ("a, b; c: d. e", PUNCTUATION_BOUNDARY, ["a,", "b;", "c:", "d.", "e"]),
+    ("a, b; c: d. e", SENTENCE_BOUNDARY, ["a, b; c: d.", "e"]),
+    ("first line \n second line \n third", LINE_BREAK_BOUNDARY, ["first line \n", "second line \n", "third"]),
+    ("It ends here.", SENTENCE_BOUNDARY, ["It ends here."])
+])
+def test_split_at_boundaries(make_view, text, pattern, expected):
+    classifier = make_view(text).classifier
+    assert classifier.split_at_boundaries(pattern) == len(expected) - 1
+    assert classifier.get_text_classified() == expected
+    # The words that already have a separator are skipped
+    assert classifier.split_at_boundaries(pattern) == 0
+    assert classifier.get_text_classified() == expected
+
+
+def test_split_at_boundaries_skips_sub_words(make_view):
+    classifier = make_view("a well-known b").classifier
+    assert classifier.split_at_boundaries(r"-$") == 0
+    assert classifier.get_text_classified() == ["a well-known b"]
+
+
+def test_split_at_boundaries_keeps_the_analysis(analyzed_view):
+    classifier = analyzed_view.classifier
+    assert classifier.split_at_boundaries(r",$") == 1
+
+    analyzed = classifier.get_text_analyzed()
+    assert [[clause for clause, _ in group] for group, _ in analyzed] == [
+        ["A well-known text,", "with some &amp; entities", "and a tag."],
+        ["It has <tags>,", "to lay out", "Another \n paragraph starts here;"],
+        ["state-of-the-art ends it?", "last one."]
+    ]
+    # The new groups have the default value and the rest of them keep theirs
+    values = [value for group, _ in analyzed for _, value in group]
+    assert values == ["SD-;SG+", "SD-;SG+", "SD+;SG--", "SD++;SG-", DEFAULT_TEXT_SD_SG, "SD++;SG-", "SD--;SG++",
+                      "SD--;SG++"]
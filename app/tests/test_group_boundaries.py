@@ -0,0 +1,61 @@
+from PyQt5.QtCore import QPointF
+
+from main.main_window_aux_items.separator.group_boundaries import GroupBoundaries
+from main.main_window_aux_items.separator.separator import SeparatorRecord
+
+
+def make_boundaries(word_indexes: list[int], item_indexes: list[int]) -> GroupBoundaries:
+    """
+    Create a GroupBoundaries with a separator before each of the given words.
+    :param word_indexes: The word of each separator, sorted.
+    :param item_indexes: The index of the last item before each separator.
+    :return: The boundaries.
+    """
+    boundaries = GroupBoundaries()
+    separators = [SeparatorRecord(word_index, False) for word_index in word_indexes]
+    boundaries.reset(separators, [QPointF(word_index, 0) for word_index in word_indexes])
+    for position, index in enumerate(item_indexes):
+        boundaries.set_index(position, index)
+    return boundaries
+
+
+def test_reset_and_lookups():
+    boundaries = make_boundaries([2, 5, 9], [1, 3, 6])
+    assert len(boundaries) == 3
+    assert [boundaries.index(i) for i in range(3)] == [1, 3, 6]
+    assert [boundaries.separator(i).word_index for i in range(3)] == [2, 5, 9]
+    assert boundaries.point(1) == QPointF(5, 0)
+    assert boundaries.find(boundaries.separator(2)) == 2
+    assert boundaries.find(SeparatorRecord(5, False)) is None
+
+
+def test_group_of():
+    boundaries = make_boundaries([2, 5, 9], [1, 3, 6])
+    assert [boundaries.group_of(i) for i in range(9)] == [-1, -1, 0, 0, 1, 1, 1, 2, 2]
+
+
+def test_insert_shifts_the_later_indexes():
+    boundaries = make_boundaries([2, 5, 9], [1, 3, 6])
+    separator = SeparatorRecord(7, False)
+    position = boundaries.insertion_position(separator)
+    assert position == 2
+
+    # The item inserted for the new separator is the item 5, so the later items are shifted by one
+    boundaries.insert(position, separator, 4, QPointF(7, 0))
+    assert [boundaries.index(i) for i in range(4)] == [1, 3, 4, 7]
+    assert boundaries.find(separator) == 2
+    assert boundaries.group_of(5) == 2
+
+
+def test_pop_shifts_the_later_indexes():
+    boundaries = make_boundaries([2, 5, 9], [1, 3, 6])
+    removed = boundaries.separator(0)
+    assert boundaries.pop(0) is removed
+    assert [boundaries.index(i) for i in range(2)] == [2, 5]
+
+
+def test_clear():
+    boundaries = make_boundaries([2], [1])
+    boundaries.clear()
+    assert len(boundaries) == 0
+    assert boundaries.group_of(3) == -1
@@ -0,0 +1,15 @@
+from main.main_window_aux_items.main_text import MainText
+
+
+def test_offsets_are_kept_across_text_size_changes(app):
+    text = MainText("Some text.\nAnother paragraph.", 12, 500, 150, None)
+    text.get_complete_points()
+    text.set_text_size(20)
+    text.get_complete_points()
+    misses = text.get_cache_info()["offsets"][1]
+
+    text.set_text_size(12)
+    text.get_complete_points()
+    text.set_text_size(20)
+    text.get_complete_points()
+    assert text.get_cache_info()["offsets"][1] == misses
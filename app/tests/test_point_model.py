@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from main.main_window_aux_items.main_text import MainText
+from main.main_window_aux_items.point_model import PointModel, PointModelBuilder
+
+
+@pytest.fixture
+def points() -> PointModel:
+    """
+    A model of two lines, "one two" and "three well-known", where "known" is a sub-word of "well-known".
+    :return: The model.
+    """
+    builder = PointModelBuilder()
+    builder.add_line(10)
+    builder.add_point(0, "one", False)
+    builder.add_point(30, "two", False)
+    builder.add_point(60, "", False)
+    builder.add_line(40)
+    builder.add_point(0, "three", False)
+    builder.add_point(40, "well-", False)
+    builder.add_point(70, "known", True)
+    builder.add_point(100, "", False)
+    return builder.build()
+
+
+def test_sizes(points):
+    assert len(points) == 7
+    assert points.word_count() == 5
+    assert points.line_count() == 2
+    assert points.word_points.tolist() == [0, 1, 3, 4, 5, 6]
+    assert points.word_indexes.tolist() == [0, 1, 2, 2, 3, 4, 5]
+
+
+def test_arrays_are_read_only(points):
+    with pytest.raises(ValueError):
+        points.x[0] = 1
+
+
+def test_lines(points):
+    assert points.get_limit_points() == [(10, (0, 60)), (40, (0, 100))]
+    assert points.line_x(1).tolist() == [0, 40, 70, 100]
+    assert points.line_of(40) == 1
+    assert points.line_of(20) == -1
+    assert points.line_of_point(3) == 1
+    assert points.is_line_end(2)
+    assert not points.is_line_end(6)
+    assert points.first_point() == (0, 10)
+    assert points.last_point() == (100, 40)
+
+
+def test_index_of(points):
+    assert points.index_of(40, 40) == 4
+    assert points.get_point(4) == (40, 40)
+    assert points.index_of(60, 10) == 2
+
+
+def test_word_points(points):
+    assert points.get_word_points([0, 2, 3, 5]) == [(0, 10), (0, 40), (40, 40), (100, 40)]
+
+    # The first word of a line also occupies the end of the previous line
+    first, last = points.get_word_point_spans([1, 2, 3])
+    assert first.tolist() == [1, 2, 4]
+    assert last.tolist() == [1, 3, 4]
+
+
+def test_get_texts(points):
+    assert points.get_texts([]) == ["one two three well-known"]
+    assert points.get_texts([1, 3]) == ["one", "two three", "well-known"]
+
+
+def test_get_word_indexes_of_texts(points):
+    assert points.get_word_indexes_of_texts(["one two", "three well-known"]) == [2]
+    # Only the number of chunks of each group is considered
+    assert points.get_word_indexes_of_texts(["one  two three", "\twell-known"]) == [3]
+
+
+@pytest.mark.parametrize("texts", [["one two", "three"], ["one two three well-", "known"]])
+def test_get_word_indexes_of_texts_errors(points, texts):
+    with pytest.raises(RuntimeError):
+        points.get_word_indexes_of_texts(texts)
+
+
+def test_words_survive_a_relayout(app):
+    text = MainText("A well-known text, \n with some &amp; entities and <tags>.", 12, 500, 150, None)
+    wide = text.get_complete_points()
+    text.set_width(90)
+    narrow = text.get_complete_points()
+
+    assert narrow.line_count() > wide.line_count()
+    assert narrow.word_count() == wide.word_count()
+    assert np.array_equal(narrow.words[narrow.word_points], wide.words[wide.word_points])
+    assert narrow.get_texts([3, 6]) == wide.get_texts([3, 6])
@@ -0,0 +1,82 @@
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from main.main_window_aux_items.relayout_worker import RelayoutWorker
+
+TEXT = ("A well-known text, with some &amp; entities and <tags>, to lay out. " * 30 + "\n") * 4
+
+
+def run_worker(view, width, text_size) -> RelayoutWorker:
+    """
+    Calculate a layout of the classifier of the view in a RelayoutWorker and wait for its thread to end.
+    :param view: The ClassifierView.
+    :param width: The new text width or None.
+    :param text_size: The new text size or None.
+    :return: The finished worker.
+    """
+    worker = RelayoutWorker(view.classifier.get_layout_snapshot(width, text_size))
+    worker.start()
+    worker.wait()
+    QApplication.processEvents()
+    return worker
+
+
+def wait_relayout(view, timeout: float = 30) -> None:
+    """
+    Process the events until the relayout of the view in progress, if any, has been applied.
+    :param view: The ClassifierView.
+    :param timeout: The maximum time to wait in seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while view._relayout_worker is not None:
+        assert time.monotonic() < deadline, "The relayout hasn't finished"
+        QApplication.processEvents()
+        time.sleep(0.005)
+
+
+def test_paint_after_worker_layout(make_view):
+    view = make_view(TEXT)
+    for i, (width, text_size) in enumerate([(400, None), (600, 20), (450, 14)]):
+        worker = run_worker(view, width, text_size)
+        assert view.classifier.apply_layout(worker.get_layout())
+        assert not view.viewport().grab().isNull()
+
+
+def test_worker_layout_matches_synchronous_layout(make_view):
+    asynchronous = make_view(TEXT)
+    synchronous = make_view(TEXT)
+
+    assert asynchronous.classifier.apply_layout(run_worker(asynchronous, 420, 18).get_layout())
+    synchronous.classifier.set_text_size(18)
+    synchronous.classifier.set_width(420)
+
+    assert asynchronous.classifier.get_text_item_height() == synchronous.classifier.get_text_item_height()
+    assert asynchronous.classifier.get_text_classified() == synchronous.classifier.get_text_classified()
+
+
+def test_cancelled_worker_has_no_layout(make_view):
+    view = make_view(TEXT)
+    worker = RelayoutWorker(view.classifier.get_layout_snapshot(300, None))
+    worker.cancel()
+    worker.start()
+    worker.wait()
+    assert worker.get_layout() is None
+
+
+def test_consecutive_text_size_changes(make_view):
+    view = make_view(TEXT)
+    view.show()
+    view.set_text_size(20)
+    view.set_text_size(22)
+    wait_relayout(view)
+    assert view.get_text_size() == 22
+    assert not view.viewport().grab().isNull()
+
+
+def test_close_stops_relayout(make_view):
+    view = make_view(TEXT * 4)
+    view.set_text_size(24)
+    view.close()
+    assert view._relayout_worker is None
+    assert QApplication.overrideCursor() is None
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QGraphicsRectItem
+
+from main.main_window_aux_items.rounded_rect.color_palette import ColorPalette
+from main.main_window_aux_items.rounded_rect.rounded_rect_batch import BatchedRoundedRect, RoundedRectBatch
+
+TEXT = ("A well-known text, with some &amp; entities and <tags>, to lay out. " * 10 + "\n") * 3
+
+
+def to_array(image: QImage) -> np.ndarray:
+    """
+    Copy the pixels of an image to a NumPy array.
+    :param image: The image.
+    :return: An array with a row per line of the image and 4 bytes per pixel.
+    """
+    image = image.convertToFormat(QImage.Format_ARGB32)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine()).astype(int)
+
+
+@pytest.fixture
+def batch_and_rects(app):
+    """
+    An empty RoundedRectBatch with two colors and the list of its rectangles, shared as RoundedRectHandler does.
+    :param app: The application.
+    :return: A tuple of (batch, rects).
+    """
+    parent = QGraphicsRectItem()
+    rects = []
+    yield RoundedRectBatch(rects, 4, ColorPalette({"default": "#ffffff", "other": "#000000"}), parent), rects
+
+
+def test_include_widens_the_bounds(batch_and_rects):
+    batch, rects = batch_and_rects
+    rects.append(BatchedRoundedRect(10, 10, 100, 20, batch))
+    assert batch.boundingRect().contains(QRectF(10, 10, 100, 20))
+
+    rects.append(BatchedRoundedRect(0, 40, 200, 20, batch))
+    assert batch.boundingRect().contains(QRectF(0, 40, 200, 20))
+
+    # A rect that moves outside the bounds widens them, and they are narrowed only by refresh_bounds()
+    rects[1].set_pos_and_size(0, 300, 50, 20)
+    assert batch.boundingRect().contains(QRectF(0, 300, 50, 20))
+    assert batch.boundingRect().contains(QRectF(0, 40, 200, 20))
+    batch.refresh_bounds()
+    assert not batch.boundingRect().contains(QRectF(0, 40, 200, 20))
+    assert batch.boundingRect().contains(QRectF(0, 300, 50, 20))
+
+
+def test_refresh_bounds_without_rects(batch_and_rects):
+    batch, _ = batch_and_rects
+    batch.refresh_bounds()
+    assert batch.boundingRect().isEmpty()
+
+
+@pytest.mark.parametrize("width", [None, 250])
+def test_batched_rects_are_painted_as_the_items(make_view, width):
+    views = [make_view(TEXT, batched) for batched in (False, True)]
+    for view in views:
+        assert view.classifier.split_at_boundaries(r",$") > 0
+        if width is not None:
+            view.classifier.set_width(width)
+    images = [to_array(view.viewport().grab().toImage()) for view in views]
+    # The antialiasing of the corners can differ in one unit, because the batch translates the painter instead
+    assert np.abs(images[0] - images[1]).max() <= 1
@@ -0,0 +1,38 @@
+from PyQt5.QtCore import QPointF
+
+from main.main_window_aux_items.segment_model import SegmentModel
+
+# Three lines of text, each one as (Y-value, (X-left, X-Right))
+LINES = [(10, (0, 100)), (40, (0, 80)), (70, (0, 50))]
+
+
+def test_without_separators():
+    segments = SegmentModel(LINES, [])
+    assert len(segments) == 3
+    assert segments.ys == [10, 40, 70]
+    assert segments.lefts == [0, 0, 0]
+    assert segments.rights == [100, 80, 50]
+    assert segments.groups == [0, 0, 0]
+    assert segments.separator_indexes == []
+
+
+def test_separators_inside_the_lines():
+    separator_points = [QPointF(30, 10), QPointF(60, 10), QPointF(20, 70)]
+    segments = SegmentModel(LINES, separator_points)
+    assert len(segments) == 6
+    assert segments.ys == [10, 10, 10, 40, 70, 70]
+    assert segments.lefts == [0, 30, 60, 0, 0, 20]
+    assert segments.rights == [30, 60, 100, 80, 20, 50]
+    assert segments.groups == [0, 1, 2, 2, 2, 3]
+    # The index of the last segment before each separator
+    assert segments.separator_indexes == [0, 1, 4]
+    assert segments.separator_points is separator_points
+
+
+def test_separator_at_the_end_of_a_line():
+    segments = SegmentModel(LINES, [QPointF(80, 40)])
+    assert segments.ys == [10, 40, 40, 70]
+    assert segments.lefts == [0, 0, 80, 0]
+    assert segments.rights == [100, 80, 80, 50]
+    assert segments.groups == [0, 0, 1, 1]
+    assert segments.separator_indexes == [1]
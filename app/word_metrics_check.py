@@ -0,0 +1,147 @@
+import argparse
+import os
+import random
+import sys
+
+# The check doesn't need a display, so the offscreen platform is used unless another one is requested
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication, QGraphicsTextItem
+
+from synthetic_text import generate_words
+from main.main_window_aux_items.main_text import MainText
+from main.main_window_aux_items.word_metrics import WordMetrics, _find_boundaries_word
+
+DEFAULT_SIZES = [8, 12, 16, 24, 36]
+DEFAULT_WORD_COUNT = 5000
+DEFAULT_SEED = 0
+DEFAULT_TOLERANCE = 1e-6
+LINE_HEIGHT = 150
+TEXT_WIDTH = 500
+
+# Words, in HTML format, that are measured in a special way: hyphenated words, words with special HTML characters,
+# ligatures, break lines and the empty word
+EDGE_CASE_WORDS = [
+    "", "<br>", "-", "--", "a-", "-a", "well-known", "a-b-c", "state-of-the-art", "x", "fi", "ffl", "W", "ka.",
+    "¿qué?", "naïve", "&amp;", "&quot;a&quot;", "&lt;b&gt;", "a&amp;b-c", "1/2", "(ka)", "ka—lo", "www.example.com"
+]
+
+
+def _old_separator_offsets_width(font: QFont) -> tuple[float, float]:
+    """
+    Half of the width of the space character and the padding of QGraphicsTextItem, measured as MainText did before
+    WordMetrics: with an auxiliary QGraphicsTextItem.
+    :param font: The font used to represent the text.
+    :return: Half of what the character space occupies with the given font and the padding introduced by
+             QGraphicsTextItem.
+    """
+    aux_text_item = QGraphicsTextItem()
+    aux_text_item.setFont(font)
+    aux_text_item.setPlainText(" ")
+    len_text1 = aux_text_item.boundingRect().width()
+    aux_text_item.setPlainText("  ")
+    len_text2 = aux_text_item.boundingRect().width()
+
+    space = len_text2 - len_text1
+    padding = len_text1 - len_text2 / 2
+    return space / 2, padding
+
+
+def _old_words_width(font: QFont, text_list: list[str]) -> list[tuple[int | float, str, bool]]:
+    """
+    The width of the words, measured as MainText did before WordMetrics: inserting each word as HTML into an auxiliary
+    QGraphicsTextItem and subtracting its padding.
+    :param font: The font used to represent the words.
+    :param text_list: A list of words in HTML format. The "<br>" elements represent break lines.
+    :return: The same structure as WordMetrics.get_words_width().
+    """
+    padding = _old_separator_offsets_width(font)[1]
+
+    aux_text = QGraphicsTextItem()
+    aux_text.setFont(font)
+
+    result = []
+    for word in text_list:
+        if word == "<br>":
+            result.append((-1, "\n", False))  # Break line
+        else:
+            aux_text.setHtml(word)
+            positions = _find_boundaries_word(word)
+            if len(positions) == 0:
+                result.append((aux_text.boundingRect().width() - 2 * padding, word, False))
+            else:
+                start_pos = 0
+                for position in positions:
+                    sub_word = word[start_pos:position]
+                    start_pos = position
+
+                    aux_text.setHtml(sub_word)
+                    result.append((aux_text.boundingRect().width() - 2 * padding, sub_word, True))
+
+                sub_word = word[start_pos:]
+                aux_text.setHtml(sub_word)
+                result.append((aux_text.boundingRect().width() - 2 * padding, sub_word, False))
+    return result
+
+
+def check_size(size: int, words: list[str], tolerance: float) -> list[str]:
+    """
+    Compare the widths and the padding of WordMetrics and MainText with the old measurement for a point size.
+    :param size: The point size of the text.
+    :param words: The corpus, in HTML format.
+    :param tolerance: The maximum allowed difference in pixels.
+    :return: A description of each difference greater than the tolerance.
+    """
+    main_text = MainText("", size, TEXT_WIDTH, LINE_HEIGHT, None)
+    font = main_text.font()
+    errors = []
+
+    old_padding = _old_separator_offsets_width(font)[1]
+    new_padding = main_text.get_layout_snapshot(None, None).horizontal_padding
+    if abs(old_padding - new_padding) > tolerance:
+        errors.append("size " + str(size) + ": padding " + str(new_padding) + " != " + str(old_padding))
+
+    old_widths = _old_words_width(font, words)
+    word_metrics = WordMetrics()
+    new_widths = word_metrics.get_words_width(font, words)
+    if len(old_widths) != len(new_widths):
+        errors.append(
+            "size " + str(size) + ": " + str(len(new_widths)) + " sub-words instead of " + str(len(old_widths))
+        )
+        return errors
+
+    for old, new in zip(old_widths, new_widths):
+        if old[1:] != new[1:] or abs(old[0] - new[0]) > tolerance:
+            errors.append("size " + str(size) + ": " + repr(new) + " != " + repr(old))
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that the word widths and the padding of MainText are the same as the ones measured with an "
+                    "auxiliary QGraphicsTextItem."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Point sizes of the text.")
+    parser.add_argument("--words", type=int, default=DEFAULT_WORD_COUNT, help="Number of synthetic words.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic words.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Maximum allowed difference in pixels.")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    words = EDGE_CASE_WORDS + generate_words(args.words, random.Random(args.seed))
+
+    errors = []
+    for size in args.sizes:
+        errors += check_size(size, words, args.tolerance)
+
+    for error in errors:
+        print(error)
+    print(str(len(words)) + " words, " + str(len(args.sizes)) + " sizes, " + str(len(errors)) + " differences")
+    sys.exit(1 if len(errors) != 0 else 0)
+
+
+if __name__ == '__main__':
+    main()